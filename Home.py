@@ -0,0 +1,70 @@
+# Home.py
+# Run with: streamlit run Home.py
+
+import streamlit as st
+
+from app.services.page_data import client_id, current_user, lazy_panel, load
+from app.services.session_store import get_session_store
+from app.services.user_service import login_user, register_user
+
+st.set_page_config(page_title="Multi-Domain Intelligence Platform", page_icon="🛡", layout="wide")
+st.title("🛡 Multi-Domain Intelligence Platform")
+
+# -------------------------------
+# LOGIN / REGISTER
+# -------------------------------
+username = current_user()
+
+if username is None:
+    login_tab, register_tab = st.tabs(["Login", "Register"])
+
+    with login_tab:
+        with st.form("login"):
+            name = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            submitted = st.form_submit_button("Log in")
+        if submitted:
+            # Per-client limit too, so one client can't spread guesses over many usernames
+            success, msg = login_user(name, password, source=client_id())
+            if success:
+                st.session_state["session_token"] = get_session_store().create(name)
+                st.rerun()
+            else:
+                st.error(f"❌ {msg}")
+
+    with register_tab:
+        with st.form("register"):
+            name = st.text_input("Username", key="register_username")
+            password = st.text_input("Password", type="password", key="register_password")
+            submitted = st.form_submit_button("Register")
+        if submitted:
+            success, msg = register_user(name, password)
+            if success:
+                st.success(f"✅ {msg} You can log in now.")
+            else:
+                st.error(f"❌ {msg}")
+    st.stop()
+
+# -------------------------------
+# OVERVIEW
+# -------------------------------
+st.write(f"Logged in as **{username}**. Use the sidebar to open the Dashboard, Analytics or Settings.")
+
+# Totals come from the summary tables, so this is a handful of rows whatever the data size
+incidents = load("incident_types")
+tickets = load("ticket_status")
+datasets = load("dataset_categories")
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Incidents", int(incidents["count"].sum()) if not incidents.empty else 0)
+col2.metric("Tickets", int(tickets["count"].sum()) if not tickets.empty else 0)
+col3.metric("Datasets", int(datasets["count"].sum()) if not datasets.empty else 0)
+
+
+def _recent_incidents():
+    page, _ = load("incidents_page", None, 10,
+                   columns=["date", "incident_type", "severity", "status"])
+    st.dataframe(page, hide_index=True)
+
+
+lazy_panel("Latest incidents", _recent_incidents)
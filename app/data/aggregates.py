@@ -0,0 +1,207 @@
+# app/data/aggregates.py
+
+from app.data.db import connect_database
+
+# NOTE: each summary table holds one row per group of its source table, kept current by
+# AFTER INSERT/UPDATE/DELETE triggers. Dashboard counters then read O(groups) rows
+# instead of re-running GROUP BY over every incident/ticket/dataset.
+#
+# A summary is described by:
+#   source   - the table it summarises
+#   keys     - [(summary column, expression)] the rows are grouped by
+#   measures - [(summary column, expression)] summed per group, besides `count`
+#   when     - optional condition a source row must meet to be counted
+# Expressions use {row} for the row being counted (NEW/OLD in triggers), e.g. "{row}.status".
+# Keys are matched with IS, so NULL groups are counted like any other.
+
+
+def _col(name):
+    return (name, "{row}." + name)
+
+
+SUMMARIES = {
+    "incident_type_counts": {
+        "source": "cyber_incidents",
+        "keys": [_col("incident_type")],
+    },
+    "incident_severity_status_counts": {
+        "source": "cyber_incidents",
+        "keys": [_col("severity"), _col("status")],
+    },
+    "ticket_status_counts": {
+        "source": "it_tickets",
+        "keys": [_col("status")],
+    },
+    "dataset_category_counts": {
+        "source": "datasets_metadata",
+        "keys": [_col("category")],
+    },
+}
+
+
+# -------------------------------
+# SQL GENERATION
+# -------------------------------
+def _expr(template, row):
+    return template.format(row=row)
+
+
+def _match(spec, row):
+    return " AND ".join([f"{col} IS {_expr(expr, row)}" for col, expr in spec["keys"]])
+
+
+def _source_columns(spec):
+    """Source columns referenced by a summary (for UPDATE OF ... triggers)."""
+    columns = []
+    templates = [e for _, e in spec["keys"] + spec.get("measures", [])] + [spec.get("when") or ""]
+    for template in templates:
+        for part in template.replace("(", " ").replace(")", " ").replace(",", " ").split():
+            if part.startswith("{row}."):
+                name = part[len("{row}."):]
+                if name not in columns:
+                    columns.append(name)
+    return columns
+
+
+def summary_table_sql(name, spec):
+    """DDL for a summary table and its key index."""
+    measures = spec.get("measures", [])
+    cols = [f"{col}" for col, _ in spec["keys"]] + ["count INTEGER NOT NULL DEFAULT 0"]
+    cols += [f"{col} REAL NOT NULL DEFAULT 0" for col, _ in measures]
+    key_cols = ", ".join([col for col, _ in spec["keys"]])
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(cols)})",
+        f"CREATE INDEX IF NOT EXISTS idx_{name}_keys ON {name} ({key_cols})",
+    ]
+
+
+def _add_statements(name, spec, row):
+    measures = spec.get("measures", [])
+    sets = ["count = count + 1"] + [f"{col} = {col} + IFNULL({_expr(e, row)}, 0)" for col, e in measures]
+    cols = [col for col, _ in spec["keys"]] + ["count"] + [col for col, _ in measures]
+    values = [_expr(e, row) for _, e in spec["keys"]] + ["1"] + [f"IFNULL({_expr(e, row)}, 0)" for _, e in measures]
+    match = _match(spec, row)
+    return (
+        f"UPDATE {name} SET {', '.join(sets)} WHERE {match};\n"
+        f"INSERT INTO {name} ({', '.join(cols)}) SELECT {', '.join(values)} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {name} WHERE {match});"
+    )
+
+
+def _sub_statements(name, spec, row):
+    measures = spec.get("measures", [])
+    sets = ["count = count - 1"] + [f"{col} = {col} - IFNULL({_expr(e, row)}, 0)" for col, e in measures]
+    match = _match(spec, row)
+    return (
+        f"UPDATE {name} SET {', '.join(sets)} WHERE {match};\n"
+        f"DELETE FROM {name} WHERE {match} AND count <= 0;"
+    )
+
+
+def summary_trigger_sql(name, spec):
+    """CREATE TRIGGER statements that keep a summary table in step with its source."""
+    source = spec["source"]
+    when = spec.get("when")
+
+    def cond(row):
+        return _expr(when, row) if when else "1"
+
+    # On UPDATE, only rows whose group, measures or condition actually changed matter
+    exprs = [e for _, e in spec["keys"] + spec.get("measures", [])]
+    unchanged = " AND ".join([f"({_expr(e, 'OLD')}) IS ({_expr(e, 'NEW')})" for e in exprs])
+    changed = f"NOT ({unchanged} AND ({cond('OLD')}) IS ({cond('NEW')}))"
+    update_of = ", ".join(_source_columns(spec))
+
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source}
+            WHEN {cond('NEW')}
+            BEGIN {_add_statements(name, spec, 'NEW')} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source}
+            WHEN {cond('OLD')}
+            BEGIN {_sub_statements(name, spec, 'OLD')} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_au_old AFTER UPDATE OF {update_of} ON {source}
+            WHEN {cond('OLD')} AND {changed}
+            BEGIN {_sub_statements(name, spec, 'OLD')} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_au_new AFTER UPDATE OF {update_of} ON {source}
+            WHEN {cond('NEW')} AND {changed}
+            BEGIN {_add_statements(name, spec, 'NEW')} END""",
+    ]
+
+
+def _group_by_sql(spec):
+    """The GROUP BY over the source table that the summary should equal."""
+    measures = spec.get("measures", [])
+    keys = [_expr(e, "src") for _, e in spec["keys"]]
+    selects = [f"{k} AS {col}" for k, (col, _) in zip(keys, spec["keys"])] + ["COUNT(*) AS count"]
+    selects += [f"SUM(IFNULL({_expr(e, 'src')}, 0)) AS {col}" for col, e in measures]
+    where = f"WHERE {_expr(spec['when'], 'src')}" if spec.get("when") else ""
+    return f"SELECT {', '.join(selects)} FROM {spec['source']} AS src {where} GROUP BY {', '.join(keys)}"
+
+
+# -------------------------------
+# INSTALL / REBUILD / VERIFY
+# -------------------------------
+def install_summaries(conn, summaries=None):
+    """
+    Create summary tables and triggers, then fill them from the source tables.
+    Does not commit (runs inside a schema migration step).
+    """
+    for name, spec in (summaries or SUMMARIES).items():
+        for sql in summary_table_sql(name, spec) + summary_trigger_sql(name, spec):
+            conn.execute(sql)
+        _rebuild(conn, name, spec)
+
+
+def _rebuild(conn, name, spec):
+    cols = [col for col, _ in spec["keys"]] + ["count"] + [col for col, _ in spec.get("measures", [])]
+    conn.execute(f"DELETE FROM {name}")
+    conn.execute(f"INSERT INTO {name} ({', '.join(cols)}) {_group_by_sql(spec)}")
+
+
+def rebuild_summaries(conn, summaries=None):
+    """
+    Recompute summary tables from scratch (e.g. after drift or a bulk load with triggers off).
+    """
+    for name, spec in (summaries or SUMMARIES).items():
+        _rebuild(conn, name, spec)
+    conn.commit()
+    print("✔ Summary tables rebuilt.")
+
+
+def verify_summaries(conn, summaries=None):
+    """
+    Compare each summary table with a fresh GROUP BY over its source.
+
+    Returns:
+        dict: summary name -> list of differing rows (empty list means in sync)
+    """
+    drift = {}
+    for name, spec in (summaries or SUMMARIES).items():
+        cols = [col for col, _ in spec["keys"]] + ["count"] + [col for col, _ in spec.get("measures", [])]
+        stored = f"SELECT {', '.join(cols)} FROM {name}"
+        expected = f"SELECT {', '.join(cols)} FROM ({_group_by_sql(spec)})"
+        rows = conn.execute(
+            f"SELECT 'missing_or_wrong', * FROM ({expected} EXCEPT {stored}) "
+            f"UNION ALL SELECT 'unexpected', * FROM ({stored} EXCEPT {expected})"
+        ).fetchall()
+        drift[name] = rows
+    return drift
+
+
+if __name__ == "__main__":
+    # python -m app.data.aggregates [verify|rebuild]
+    import sys
+
+    conn = connect_database()
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild":
+        rebuild_summaries(conn)
+    else:
+        drifted = {name: rows for name, rows in verify_summaries(conn).items() if rows}
+        for name, rows in drifted.items():
+            print(f"⚠ {name} has drifted:")
+            for row in rows:
+                print(f"    {row}")
+        if not drifted:
+            print("✔ All summary tables match their source tables.")
+        sys.exit(1 if drifted else 0)
+    conn.close()
@@ -0,0 +1,186 @@
+# app/data/cache.py
+
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from app.data.db import database_file
+from app.data.versions import get_table_version
+
+# NOTE: read functions in incidents.py / tickets.py / datasets.py go through
+# `cached_query`, and every function that writes to a table calls `invalidate_table`
+# after committing. Entries are keyed by (database file, table, sql, params, table
+# version), so a write to cyber_incidents only drops cyber_incidents results.
+#
+# The table version (app/data/versions.py) is bumped by triggers, so writes made
+# outside these functions (another process, raw SQL) are seen too: they change the
+# version, the key misses, and the stale entry ages out of the LRU. Checking it costs
+# one primary-key lookup per cached read.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _estimate_size(value):
+    # Anything cached as a DataFrame means pandas is already loaded
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def _database_key(conn):
+    # In-memory databases are private to their connection
+    return database_file(conn) or f":memory:{id(conn)}"
+
+
+class QueryCache:
+    """
+    LRU cache of query results, bounded by total (estimated) size in bytes.
+
+    - Optional TTL: entries older than `ttl` seconds are reloaded.
+    - `invalidate(db, table)` drops every entry that read that table.
+    - Each (db, table) has a generation number bumped on invalidation, which callers
+      can fold into their own cache keys.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._by_table = {}  # (db, table) -> set of keys
+        self._generations = {}  # (db, table) -> int
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _drop(self, key):
+        value, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        self._by_table.get(key[:2], set()).discard(key)
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._drop(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[0]
+
+    def put(self, key, value, generation=None):
+        """
+        Store a result. Pass the table generation read before loading it: if the
+        table was invalidated in the meantime the (possibly stale) value is dropped.
+        """
+        size = _estimate_size(value)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key[:2], 0):
+                return
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return  # never cache something bigger than the whole cache
+            self._entries[key] = (value, size, time.monotonic())
+            self._by_table.setdefault(key[:2], set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, db, table):
+        """Drop all cached results that read `table` in database `db`."""
+        with self._lock:
+            for key in list(self._by_table.pop((db, table), ())):
+                self._drop(key)
+            self._generations[(db, table)] = self._generations.get((db, table), 0) + 1
+            self._stats["invalidations"] += 1
+
+    def generation(self, db, table):
+        """Number of times (db, table) has been invalidated in this process."""
+        with self._lock:
+            return self._generations.get((db, table), 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: hits, misses, evictions, expirations, invalidations, entries, bytes, max_bytes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+            return stats
+
+
+# -------------------------------
+# SHARED CACHE
+# -------------------------------
+_cache = QueryCache()
+
+
+def get_query_cache():
+    """Return the process-wide QueryCache."""
+    return _cache
+
+
+def configure_query_cache(max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+    """Replace the process-wide cache (drops everything cached so far)."""
+    global _cache
+    _cache = QueryCache(max_bytes=max_bytes, ttl=ttl)
+    return _cache
+
+
+# -------------------------------
+# DATA-LAYER HELPERS
+# -------------------------------
+def cached_query(conn, table, sql, params=()):
+    """
+    Return pd.read_sql_query(sql, conn, params) through the cache.
+    `table` is the table whose writes invalidate this result.
+    A copy is returned, so callers may modify it freely.
+    """
+    params = tuple(params)
+    db = _database_key(conn)
+    key = (db, table, sql, params, _table_version(conn, table))
+    cache = _cache
+    hit, df = cache.get(key)
+    if not hit:
+        # imported here: pandas is only loaded once a DataFrame is actually needed
+        import pandas as pd
+        generation = cache.generation(db, table)
+        df = pd.read_sql_query(sql, conn, params=params or None)
+        cache.put(key, df, generation)
+    return df.copy()
+
+
+def _table_version(conn, table):
+    try:
+        return get_table_version(conn, table)
+    except sqlite3.OperationalError:
+        return None  # database from before versioning (not migrated yet)
+
+
+def invalidate_table(conn, table):
+    """Drop cached results for a table after it has been written to."""
+    _cache.invalidate(_database_key(conn), table)
+
+
+def table_generation(conn, table):
+    """In-process invalidation counter for a table (see QueryCache.generation)."""
+    return _cache.generation(_database_key(conn), table)
@@ -1,5 +1,14 @@
-import pandas as pd
+from app.data.cache import cached_query
 from app.data.db import connect_database
+from app.data.paging import DEFAULT_PAGE_SIZE, fetch_page, table_columns
+from app.data.records import (
+    DEFAULT_BATCH_SIZE, Dataset, count_records, fetch_record_page, get_record, iter_records
+)
+from app.data.unit_of_work import as_id_rows, as_rows, commit_write, unit_of_work
+
+# Analytics query, module level so the index advisor (app/data/indexes.py) can EXPLAIN it.
+# Reads the trigger-maintained summary table (app/data/aggregates.py).
+DATASETS_BY_CATEGORY_SQL = "SELECT category, count FROM dataset_category_counts ORDER BY count DESC"
 
 # -------------------------------
 # INSERT NEW DATASET METADATA
@@ -26,7 +35,7 @@ def insert_dataset(conn, dataset_name, category=None, source=None, last_updated=
             dataset_name, category, source, last_updated, record_count, file_size_mb
         ) VALUES (?, ?, ?, ?, ?, ?)
     """, (dataset_name, category, source, last_updated, record_count, file_size_mb))
-    conn.commit()
+    commit_write(conn, "datasets_metadata")
     return cur.lastrowid
 
 # -------------------------------
@@ -37,12 +46,89 @@ def get_all_datasets(conn):
     Retrieve all dataset metadata as a pandas DataFrame.
     """
     try:
-        df = pd.read_sql_query("SELECT * FROM datasets_metadata ORDER BY id DESC", conn)
+        df = cached_query(conn, "datasets_metadata", "SELECT * FROM datasets_metadata ORDER BY id DESC")
         return df
     except Exception as e:
         print(f"Error retrieving datasets: {e}")
+        import pandas as pd
         return pd.DataFrame()
 
+# -------------------------------
+# LIST DATASETS (PAGINATED)
+# -------------------------------
+def list_datasets(conn, cursor=None, limit=DEFAULT_PAGE_SIZE, category=None, source=None,
+                  date_from=None, date_to=None, columns=None):
+    """
+    Retrieve one page of dataset metadata, newest first.
+
+    Args:
+        cursor (int, optional): next_cursor returned by the previous page
+        category, source (str or list, optional): filters
+        date_from, date_to (str, optional): inclusive 'YYYY-MM-DD' range on last_updated
+        columns (list, optional): columns to return (id is always included)
+
+    Returns:
+        tuple: (pd.DataFrame, next_cursor or None)
+    """
+    filters = {"category": category, "source": source, "date_from": date_from, "date_to": date_to}
+    return fetch_page(conn, "datasets_metadata", filters, columns, cursor, limit)
+
+# -------------------------------
+# LIGHTWEIGHT ROWS (NO PANDAS)
+# -------------------------------
+def get_dataset(conn, dataset_id):
+    """
+    Fetch one dataset by id as a Dataset record (attribute access, e.g. .category).
+
+    Returns:
+        Dataset or None
+    """
+    return get_record(conn, Dataset, dataset_id)
+
+
+def iter_datasets(conn, category=None, source=None, date_from=None, date_to=None,
+                  batch_size=DEFAULT_BATCH_SIZE, as_tuples=False):
+    """
+    Iterate over matching datasets in id order without building a DataFrame.
+    Memory stays at one batch of rows however many match.
+
+    Args:
+        conn: sqlite3.Connection
+        category, source, date_from, date_to: as list_datasets
+        batch_size (int): rows fetched per round trip
+        as_tuples (bool): yield plain tuples instead of Dataset records
+
+    Usage:
+        for dataset in iter_datasets(conn, category="Security"):
+            print(dataset.dataset_name, dataset.record_count)
+    """
+    filters = {"category": category, "source": source, "date_from": date_from, "date_to": date_to}
+    return iter_records(conn, Dataset, filters, batch_size, as_tuples)
+
+
+def list_dataset_records(conn, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                         category=None, source=None, date_from=None, date_to=None,
+                         as_tuples=False):
+    """
+    Record version of list_datasets: one keyset page, newest first.
+
+    Returns:
+        tuple: (list of Dataset records or tuples, next_cursor or None)
+    """
+    filters = {"category": category, "source": source, "date_from": date_from, "date_to": date_to}
+    return fetch_record_page(conn, Dataset, filters, cursor, limit, as_tuples)
+
+
+def count_datasets(conn, category=None, source=None, date_from=None, date_to=None):
+    """
+    Count matching datasets (served from the summary tables where the filters allow).
+
+    Returns:
+        int
+    """
+    filters = {"category": category, "source": source, "date_from": date_from, "date_to": date_to}
+    return count_records(conn, "datasets_metadata", filters)
+
 # -------------------------------
 # UPDATE DATASET METADATA
 # -------------------------------
@@ -60,7 +146,7 @@ def update_dataset(conn, dataset_id, **kwargs):
     cur = conn.cursor()
     sql = f"UPDATE datasets_metadata SET {fields} WHERE id = ?"
     cur.execute(sql, values)
-    conn.commit()
+    commit_write(conn, "datasets_metadata")
     return cur.rowcount
 
 # -------------------------------
@@ -72,7 +158,67 @@ def delete_dataset(conn, dataset_id):
     """
     cur = conn.cursor()
     cur.execute("DELETE FROM datasets_metadata WHERE id = ?", (dataset_id,))
-    conn.commit()
+    commit_write(conn, "datasets_metadata")
+    return cur.rowcount
+
+# -------------------------------
+# BATCH WRITES
+# -------------------------------
+# Each batch is one executemany inside a unit_of_work: one commit, and a failure part-way
+# rolls the whole batch back (inside an enclosing unit_of_work, it joins that one).
+DATASET_COLUMNS = ("dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb")
+
+def insert_datasets(conn, records):
+    """
+    Insert many dataset records in one transaction.
+
+    Args:
+        conn: sqlite3 connection
+        records: iterable of dicts keyed by DATASET_COLUMNS, or tuples in
+                 insert_dataset's argument order (trailing fields optional)
+
+    Returns:
+        int: number of rows inserted
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(f"""
+            INSERT INTO datasets_metadata ({", ".join(DATASET_COLUMNS)})
+            VALUES ({", ".join(["?"] * len(DATASET_COLUMNS))})
+        """, as_rows(records, DATASET_COLUMNS))
+        commit_write(conn, "datasets_metadata")
+    return cur.rowcount
+
+def update_datasets(conn, dataset_ids, **kwargs):
+    """
+    Apply the same field updates to many datasets in one transaction.
+
+    Usage:
+        update_datasets(conn, [1, 2, 3], category="Archived")
+    """
+    unknown = [k for k in kwargs if k not in table_columns(conn, "datasets_metadata")]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for datasets_metadata: {unknown}")
+    fields = ', '.join([f"{k} = ?" for k in kwargs.keys()])
+    values = tuple(kwargs.values())
+
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(
+            f"UPDATE datasets_metadata SET {fields} WHERE id = ?",
+            (values + (dataset_id,) for dataset_id in dataset_ids)
+        )
+        commit_write(conn, "datasets_metadata")
+    return cur.rowcount
+
+def delete_datasets(conn, dataset_ids):
+    """
+    Delete many dataset records in one transaction.
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany("DELETE FROM datasets_metadata WHERE id = ?", as_id_rows(dataset_ids))
+        commit_write(conn, "datasets_metadata")
     return cur.rowcount
 
 # -------------------------------
@@ -82,6 +228,5 @@ def count_datasets_by_category(conn):
     """
     Count datasets grouped by category.
     """
-    query = "SELECT category, COUNT(*) as count FROM datasets_metadata GROUP BY category ORDER BY count DESC"
-    df = pd.read_sql_query(query, conn)
+    df = cached_query(conn, "datasets_metadata", DATASETS_BY_CATEGORY_SQL)
     return df
\ No newline at end of file
@@ -1,10 +1,10 @@
 # app/data/db.py
 
-import sqlite3
-from pathlib import Path
-import pandas as pd
+import csv
 import os
 import sqlite3
+import time
+from pathlib import Path
 
 # Path to the database (project root -> DATA/intelligence_platform.db)
 DB_PATH = Path(__file__).parent.parent / "DATA" / "intelligence_platform.db"
@@ -36,13 +36,239 @@ def connect_database(db_path: Path = DB_PATH):
     return conn
 
 
+def connect_read_only(db_path: Path = DB_PATH):
+    """
+    Open a read-only connection (URI mode=ro plus PRAGMA query_only).
+    - The database must already exist; with WAL enabled, readers never block the writer.
+    - Any write attempted through this connection fails with sqlite3.OperationalError.
+    Returns sqlite3.Connection or raises exception.
+    """
+    db_path = Path(db_path).resolve()
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA query_only = ON;")
+        conn.execute("PRAGMA busy_timeout = 5000;")
+    except Exception:
+        pass
+
+    return conn
+
+
+DEFAULT_CSV_CHUNK_SIZE = 5000
+
+_CONFLICT_VERBS = {
+    "ignore": "INSERT OR IGNORE",
+    "replace": "INSERT",  # plus ON CONFLICT(<unique key>) DO UPDATE, see _insert_sql
+    "reject": "INSERT",
+}
+
+
+def _iter_decoded_lines(f, position):
+    """Yield decoded lines from a binary file, keeping position[0] at the byte offset read so far."""
+    for raw in f:
+        position[0] += len(raw)
+        yield raw.decode("utf-8", errors="replace")
+
+
+class _RejectWriter:
+    """Lazily-opened CSV side file for rows that could not be loaded."""
+
+    def __init__(self, path, columns):
+        self.path = Path(path)
+        self.columns = columns
+        self._file = None
+        self._writer = None
+        self.count = 0
+
+    def write(self, offset, reason, values):
+        self.count += 1
+        if self._writer is None:
+            self._file = open(self.path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            if self._file.tell() == 0:
+                self._writer.writerow(["byte_offset", "reason"] + self.columns)
+        self._writer.writerow([offset, reason] + ["" if v is None else v for v in values])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _unique_keys(conn, table_name):
+    """Column lists of a table's primary key and (non-partial) unique indexes."""
+    schema, _, table = table_name.rpartition(".")
+    prefix = f"{schema}." if schema else ""
+    keys = []
+    pk = [row[1] for row in sorted(conn.execute(f"PRAGMA {prefix}table_info({table})"), key=lambda r: r[5])
+          if row[5]]
+    if pk:
+        keys.append(pk)
+    for _, name, unique, origin, partial in conn.execute(f"PRAGMA {prefix}index_list({table})"):
+        if unique and not partial and origin != "pk":
+            keys.append([row[2] for row in conn.execute(f"PRAGMA {prefix}index_info({name})")])
+    return keys
+
+
+def _insert_sql(conn, table_name, columns, on_conflict):
+    """
+    The per-row INSERT for stream_csv_to_table.
+
+    "replace" is an UPSERT on the first unique key the CSV provides rather than
+    INSERT OR REPLACE: REPLACE deletes the old row without firing DELETE triggers, which
+    left the summaries, search index, rollups and change log out of step. An UPSERT
+    updates the row in place, so the UPDATE triggers see the old and new values.
+    """
+    col_names = ", ".join([f'"{c}"' for c in columns])
+    placeholders = ", ".join(["?"] * len(columns))
+    sql = f"{_CONFLICT_VERBS[on_conflict]} INTO {table_name} ({col_names}) VALUES ({placeholders})"
+    if on_conflict == "replace":
+        key = next((k for k in _unique_keys(conn, table_name) if all(c in columns for c in k)), None)
+        values = [c for c in columns if key and c not in key]
+        if key and values:
+            updates = ", ".join([f'"{c}" = excluded."{c}"' for c in values])
+            sql += f' ON CONFLICT({", ".join(key)}) DO UPDATE SET {updates}'
+        elif key:
+            sql += f' ON CONFLICT({", ".join(key)}) DO NOTHING'
+    return sql
+
+
+def stream_csv_to_table(conn, csv_path, table_name, chunk_size=DEFAULT_CSV_CHUNK_SIZE,
+                        on_conflict="ignore", reject_path=None, start_offset=0):
+    """
+    Stream a CSV file into a table in chunks, without loading it into memory.
+    - Each chunk is inserted with one executemany and committed.
+    - on_conflict: "ignore" (INSERT OR IGNORE: rows conflicting with an existing row are
+      skipped), "replace" (update the existing row with the same primary/unique key), or
+      "reject" (plain INSERT: rows that hit a constraint are refused).
+    - A chunk where any row was skipped or refused is redone row by row, so each of those
+      rows is recorded individually.
+    - Malformed rows (wrong number of fields), skipped and refused rows are appended to
+      reject_path (default: <csv name>.rejects.csv next to the CSV), not printed.
+    - start_offset lets callers resume from a byte offset (the header is always read
+      from the top of the file).
+    Returns dict: rows_read, inserted, rejected, elapsed_sec, end_offset, reject_path.
+    """
+    if on_conflict not in _CONFLICT_VERBS:
+        raise ValueError(f"on_conflict must be one of {sorted(_CONFLICT_VERBS)}")
+
+    csv_path = Path(csv_path)
+    start = time.perf_counter()
+    stats = {
+        "rows_read": 0,
+        "inserted": 0,
+        "rejected": 0,
+        "elapsed_sec": 0.0,
+        "end_offset": 0,
+        "reject_path": None,
+    }
+
+    with open(csv_path, "rb") as f:
+        header_line = f.readline()
+        if not header_line.strip():
+            stats["end_offset"] = len(header_line)
+            return stats
+        columns = next(csv.reader([header_line.decode("utf-8-sig")]))
+        position = [max(start_offset, len(header_line))]
+        f.seek(position[0])
+
+        insert_sql = _insert_sql(conn, table_name, columns, on_conflict)
+
+        rejects = _RejectWriter(reject_path or csv_path.with_suffix(".rejects.csv"), columns)
+        cursor = conn.cursor()
+
+        def reject(offset, reason, values):
+            stats["rejected"] += 1
+            rejects.write(offset, reason, values)
+
+        def flush(chunk):
+            rows = [values for _, values in chunk]
+            # Fast path: the whole chunk in one go. If any row was skipped (OR IGNORE) or
+            # hit a constraint, redo the chunk row by row so each of them is recorded.
+            conn.execute("SAVEPOINT csv_chunk")
+            try:
+                cursor.executemany(insert_sql, rows)
+                clean = cursor.rowcount == len(rows)
+            except sqlite3.IntegrityError:
+                clean = False
+            if clean:
+                stats["inserted"] += len(rows)
+            else:
+                conn.execute("ROLLBACK TO csv_chunk")
+                for offset, values in chunk:
+                    try:
+                        cursor.execute(insert_sql, values)
+                    except sqlite3.IntegrityError as ie:
+                        reject(offset, f"IntegrityError: {ie}", values)
+                        continue
+                    if cursor.rowcount:
+                        stats["inserted"] += 1
+                    else:
+                        reject(offset, "ignored: conflicts with an existing row", values)
+            conn.execute("RELEASE csv_chunk")
+            conn.commit()
+
+        # end_offset only advances past rows that were actually committed
+        stats["end_offset"] = position[0]
+        try:
+            reader = csv.reader(_iter_decoded_lines(f, position))
+            chunk = []
+            record_start = position[0]
+            for record in reader:
+                offset, record_start = record_start, position[0]
+                if not record:
+                    continue
+                stats["rows_read"] += 1
+                if len(record) != len(columns):
+                    reject(offset, f"expected {len(columns)} fields, got {len(record)}", record)
+                    continue
+                chunk.append((offset, [None if v == "" else v for v in record]))
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+                    stats["end_offset"] = record_start
+            if chunk:
+                flush(chunk)
+            stats["end_offset"] = position[0]
+        except sqlite3.OperationalError as oe:
+            # table might not exist or other operational error
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"❌ OperationalError loading '{csv_path.name}' into '{table_name}': {oe}")
+        finally:
+            rejects.close()
+            if rejects.count:
+                stats["reject_path"] = str(rejects.path)
+
+    if stats["inserted"]:
+        # imported here: the cache builds on this module
+        from app.data.cache import invalidate_table
+        invalidate_table(conn, table_name)
+
+    stats["elapsed_sec"] = round(time.perf_counter() - start, 4)
+    return stats
+
+
+def database_file(conn):
+    """
+    Return the file path of a connection's main database ('' for in-memory databases).
+    Used to key per-database state (schema checks, caches) without holding the connection.
+    """
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or ""
+    return ""
+
+
 def load_csv_to_table(conn, csv_path, table_name):
     """
-    Load a CSV file into a database table using pandas.
-    - Skips rows that cause IntegrityError (e.g., unique constraint) and reports them.
-    - Uses pandas to read CSV, then inserts using to_sql where possible, falling back to row-by-row inserts
-      with error handling when necessary.
-    Returns number of rows inserted (approx).
+    Load a CSV file into a database table.
+    - Streams the file in chunks via stream_csv_to_table (on_conflict="ignore"), so
+      memory use doesn't grow with the file size.
+    - Rows that are malformed, conflict with an existing row (e.g. a duplicate
+      ticket_id) or hit another constraint are skipped. A chunk with skipped rows is
+      redone row by row, and every skipped row is written, with the reason, to a
+      .rejects.csv side file next to the CSV.
+    Returns number of rows inserted.
     """
     csv_path = Path(csv_path)
 
@@ -50,76 +276,33 @@ def load_csv_to_table(conn, csv_path, table_name):
         print(f"❌ CSV file not found: {csv_path}")
         return 0
 
-    # Read CSV into DataFrame (let pandas do the heavy lifting)
     try:
-        df = pd.read_csv(csv_path)
+        stats = stream_csv_to_table(conn, csv_path, table_name)
     except Exception as e:
-        print(f"❌ Error reading CSV '{csv_path}': {e}")
+        print(f"❌ Error loading CSV '{csv_path}': {e}")
         return 0
 
-    if df.empty:
+    if stats["rows_read"] == 0:
         print(f"⚠ CSV '{csv_path.name}' is empty.")
         return 0
 
-    # Try bulk insert via to_sql first; if it fails because of integrity constraints, fallback to row-by-row
-    try:
-        df.to_sql(name=table_name, con=conn, if_exists="append", index=False)
-        row_count = len(df)
-        print(f"✔ Loaded {row_count} rows into '{table_name}'")
-        return row_count
-    except Exception as e_bulk:
-        # Bulk insert failed (often because of constraint). Fallback to row-by-row to skip bad rows.
-        print(f"⚠ Bulk load failed for '{csv_path.name}': {e_bulk}. Falling back to row-by-row insertion.")
-
-    # Row-by-row insertion with basic safety: build a simple INSERT that matches columns available in the DataFrame.
-    inserted = 0
-    cursor = conn.cursor()
-
-    # Build insert query dynamically
-    cols = list(df.columns)
-    placeholders = ", ".join(["?"] * len(cols))
-    col_names = ", ".join([f'"{c}"' for c in cols])  # quoted to be safe
-    insert_sql = f"INSERT INTO {table_name} ({col_names}) VALUES ({placeholders})"
-
-    for idx, row in df.iterrows():
-        values = [None if pd.isna(x) else x for x in row.tolist()]
-        try:
-            cursor.execute(insert_sql, values)
-            inserted += 1
-        except sqlite3.IntegrityError as ie:
-            # likely duplicate or constraint failure - skip and warn
-            print(f"⚠ Skipped row {idx} in '{csv_path.name}' due to IntegrityError: {ie}")
-            continue
-        except sqlite3.OperationalError as oe:
-            # table might not exist or other operational error
-            print(f"❌ OperationalError inserting row {idx} into '{table_name}': {oe}")
-            break
-        except Exception as ex:
-            print(f"❌ Unexpected error inserting row {idx} into '{table_name}': {ex}")
-            continue
-
-    conn.commit()
-    print(f"✔ Inserted {inserted} rows into '{table_name}' (row-by-row fallback)")
-    return inserted
+    print(f"✔ Loaded {stats['inserted']} rows into '{table_name}' "
+          f"({stats['rejected']} rejected, {stats['elapsed_sec']}s)")
+    if stats["reject_path"]:
+        print(f"⚠ Rejected rows written to '{stats['reject_path']}'")
+    return stats["inserted"]
 
 
 def load_all_csv_data(conn):
     """
     Load all recognized CSV files in the project's DATA folder into their tables.
+    Goes through the load manifest, so files already loaded are not appended again.
     Returns total rows loaded across files.
     """
-    data_dir = Path(__file__).parent.parent / "DATA"
-    total = 0
-    csv_table_map = {
-        "cyber_incidents.csv": "cyber_incidents",
-        "it_tickets.csv": "it_tickets",
-        "datasets_metadata.csv": "datasets_metadata",
-    }
+    # imported here: manifest builds on this module
+    from app.data.manifest import sync_csv_sources
 
-    for csv_file, table in csv_table_map.items():
-        csv_path = data_dir / csv_file
-        rows = load_csv_to_table(conn, csv_path, table)
-        total += rows
+    total = sync_csv_sources(conn)
 
     print(f"✔ Total rows loaded from CSVs: {total}")
     return total
@@ -0,0 +1,180 @@
+# app/data/export.py
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+
+from app.data.paging import build_where, select_columns
+
+# NOTE: exports stream straight from the cursor with fetchmany, so memory stays at one
+# batch of rows regardless of table size. Output is written to "<path>.part" and
+# renamed when complete, so a crashed export never leaves a truncated file behind.
+# Parquet needs pyarrow (optional: pip install pyarrow).
+
+DEFAULT_BATCH_SIZE = 5000
+
+FORMATS = ("csv", "jsonl", "parquet")
+_SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+
+# -------------------------------
+# WRITERS
+# -------------------------------
+class _CsvWriter:
+    def __init__(self, path, columns, declared_types):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path, columns, declared_types):
+        self._file = open(path, "w", encoding="utf-8")
+        self._columns = columns
+
+    def write(self, rows):
+        self._file.writelines(
+            json.dumps(dict(zip(self._columns, row)), default=str) + "\n" for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path, columns, declared_types):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+        self._pa = pa
+        # Schema from the declared column types, so every batch agrees even when one
+        # batch happens to be all NULLs
+        fields = []
+        for column in columns:
+            declared = (declared_types.get(column) or "").upper()
+            if "INT" in declared:
+                fields.append(pa.field(column, pa.int64()))
+            elif "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+                fields.append(pa.field(column, pa.float64()))
+            else:
+                fields.append(pa.field(column, pa.string()))
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def write(self, rows):
+        arrays = []
+        for i, field in enumerate(self._schema):
+            values = [row[i] for row in rows]
+            if self._pa.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(self._pa.array(values, type=field.type))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+_WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+
+# -------------------------------
+# EXPORT
+# -------------------------------
+def export_table(conn, table, path, fmt=None, filters=None, columns=None,
+                 batch_size=DEFAULT_BATCH_SIZE, progress_every=None):
+    """
+    Stream rows of a table to a CSV, JSON Lines or Parquet file.
+
+    Args:
+        conn: sqlite3.Connection
+        table (str): table to export (cyber_incidents, it_tickets, datasets_metadata)
+        path (str or Path): output file
+        fmt (str, optional): 'csv', 'jsonl' or 'parquet'; inferred from the suffix if omitted
+        filters (dict, optional): same filter spec as the paginated listings (paging.FILTER_SPECS)
+        columns (list, optional): columns to export (id is always included)
+        batch_size (int): rows per fetchmany
+        progress_every (int, optional): print progress every N rows
+
+    Returns:
+        dict: path, format, rows, elapsed_sec, rows_per_sec
+    """
+    path = Path(path)
+    fmt = fmt or _SUFFIX_FORMATS.get(path.suffix.lower())
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format for '{path.name}'. Use one of {FORMATS}.")
+
+    where, params = build_where(table, filters)
+    sql = f"SELECT {select_columns(conn, table, columns)} FROM {table}"
+    if where:
+        sql += f" WHERE {where}"
+    sql += " ORDER BY id"
+
+    declared_types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+    start = time.perf_counter()
+    rows_written = 0
+    next_report = progress_every
+    part_path = path.with_name(path.name + ".part")
+
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    out_columns = [d[0] for d in cursor.description]
+    writer = _WRITERS[fmt](part_path, out_columns, declared_types)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.write(rows)
+            rows_written += len(rows)
+            if progress_every and rows_written >= next_report:
+                elapsed = time.perf_counter() - start
+                print(f"… {rows_written} rows exported ({rows_written / elapsed:.0f} rows/s)")
+                next_report += progress_every
+    except BaseException:
+        writer.close()
+        part_path.unlink(missing_ok=True)
+        raise
+    writer.close()
+    os.replace(part_path, path)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "path": str(path),
+        "format": fmt,
+        "rows": rows_written,
+        "elapsed_sec": round(elapsed, 4),
+        "rows_per_sec": round(rows_written / elapsed, 1) if elapsed else 0.0,
+    }
+    print(f"✔ Exported {rows_written} rows from '{table}' to '{path}' ({stats['rows_per_sec']} rows/s)")
+    return stats
+
+
+def export_incidents(conn, path, fmt=None, columns=None, **filters):
+    """
+    Export incidents, e.g. export_incidents(conn, "high.jsonl", severity="High").
+    """
+    return export_table(conn, "cyber_incidents", path, fmt, filters, columns)
+
+
+def export_tickets(conn, path, fmt=None, columns=None, **filters):
+    """
+    Export tickets, e.g. export_tickets(conn, "open.csv", status="Open").
+    """
+    return export_table(conn, "it_tickets", path, fmt, filters, columns)
+
+
+def export_datasets(conn, path, fmt=None, columns=None, **filters):
+    """
+    Export dataset metadata, e.g. export_datasets(conn, "datasets.parquet").
+    """
+    return export_table(conn, "datasets_metadata", path, fmt, filters, columns)
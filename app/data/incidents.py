@@ -1,5 +1,38 @@
-import pandas as pd
+from app.data.cache import cached_query
 from app.data.db import connect_database
+from app.data.paging import DEFAULT_PAGE_SIZE, fetch_page
+from app.data.records import (
+    DEFAULT_BATCH_SIZE, Incident, count_records, fetch_record_page, get_record, iter_records
+)
+from app.data.rollups import rollup_query
+from app.data.search import DEFAULT_SEARCH_LIMIT, search_table
+from app.data.unit_of_work import as_id_rows, as_rows, commit_write, unit_of_work
+
+# -------------------------------
+# ANALYTICS QUERIES
+# -------------------------------
+# Kept at module level so the index advisor (app/data/indexes.py) can EXPLAIN them.
+# They read the trigger-maintained summary tables (app/data/aggregates.py), so they
+# cost O(number of groups) rather than a GROUP BY over every incident.
+INCIDENTS_BY_TYPE_SQL = """
+    SELECT incident_type, count
+    FROM incident_type_counts
+    ORDER BY count DESC
+"""
+
+HIGH_SEVERITY_BY_STATUS_SQL = """
+    SELECT status, count
+    FROM incident_severity_status_counts
+    WHERE severity = 'High'
+    ORDER BY count DESC
+"""
+
+INCIDENT_TYPES_WITH_MANY_CASES_SQL = """
+    SELECT incident_type, count
+    FROM incident_type_counts
+    WHERE count > ?
+    ORDER BY count DESC
+"""
 
 # -------------------------------
 # INSERT NEW INCIDENT
@@ -27,7 +60,7 @@ def insert_incident(conn, date, incident_type, severity, status, description, re
     ) VALUES (?, ?, ?, ?, ?, ?)
     """
     cur.execute(sql, (date, incident_type, severity, status, description, reported_by))
-    conn.commit()
+    commit_write(conn, "cyber_incidents")
     return cur.lastrowid
 
 # -------------------------------
@@ -40,12 +73,121 @@ def get_all_incidents(conn):
         pd.DataFrame: All incidents ordered by ID descending
     """
     try:
-        df = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY id DESC", conn)
+        df = cached_query(conn, "cyber_incidents", "SELECT * FROM cyber_incidents ORDER BY id DESC")
         return df
     except Exception as e:
         print(f"Error retrieving incidents: {e}")
+        import pandas as pd
         return pd.DataFrame()
 
+# -------------------------------
+# LIST INCIDENTS (PAGINATED)
+# -------------------------------
+def list_incidents(conn, cursor=None, limit=DEFAULT_PAGE_SIZE, status=None, severity=None,
+                   incident_type=None, reported_by=None, date_from=None, date_to=None, columns=None):
+    """
+    Retrieve one page of incidents, newest first.
+
+    Args:
+        conn: sqlite3.Connection
+        cursor (int, optional): next_cursor returned by the previous page
+        limit (int): page size
+        status, severity, incident_type, reported_by (str or list, optional): filters
+        date_from, date_to (str, optional): inclusive 'YYYY-MM-DD' range on date
+        columns (list, optional): columns to return (id is always included)
+
+    Returns:
+        tuple: (pd.DataFrame, next_cursor or None)
+
+    Usage:
+        page, cursor = list_incidents(conn, severity="High")
+        while cursor is not None:
+            page, cursor = list_incidents(conn, cursor=cursor, severity="High")
+    """
+    filters = {"status": status, "severity": severity, "incident_type": incident_type,
+               "reported_by": reported_by, "date_from": date_from, "date_to": date_to}
+    return fetch_page(conn, "cyber_incidents", filters, columns, cursor, limit)
+
+# -------------------------------
+# LIGHTWEIGHT ROWS (NO PANDAS)
+# -------------------------------
+def get_incident(conn, incident_id):
+    """
+    Fetch one incident by id as an Incident record (attribute access, e.g. .status).
+
+    Returns:
+        Incident or None
+    """
+    return get_record(conn, Incident, incident_id)
+
+
+def iter_incidents(conn, status=None, severity=None, incident_type=None,
+                   reported_by=None, date_from=None, date_to=None,
+                   batch_size=DEFAULT_BATCH_SIZE, as_tuples=False):
+    """
+    Iterate over matching incidents in id order without building a DataFrame.
+    Memory stays at one batch of rows however many match.
+
+    Args:
+        conn: sqlite3.Connection
+        status, severity, incident_type, reported_by, date_from, date_to: as list_incidents
+        batch_size (int): rows fetched per round trip
+        as_tuples (bool): yield plain tuples instead of Incident records
+
+    Usage:
+        for incident in iter_incidents(conn, severity="High"):
+            print(incident.id, incident.status)
+    """
+    filters = {"status": status, "severity": severity, "incident_type": incident_type,
+               "reported_by": reported_by, "date_from": date_from, "date_to": date_to}
+    return iter_records(conn, Incident, filters, batch_size, as_tuples)
+
+
+def list_incident_records(conn, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                          status=None, severity=None, incident_type=None, reported_by=None,
+                          date_from=None, date_to=None, as_tuples=False):
+    """
+    Record version of list_incidents: one keyset page, newest first.
+
+    Returns:
+        tuple: (list of Incident records or tuples, next_cursor or None)
+    """
+    filters = {"status": status, "severity": severity, "incident_type": incident_type,
+               "reported_by": reported_by, "date_from": date_from, "date_to": date_to}
+    return fetch_record_page(conn, Incident, filters, cursor, limit, as_tuples)
+
+
+def count_incidents(conn, status=None, severity=None, incident_type=None,
+                    reported_by=None, date_from=None, date_to=None):
+    """
+    Count matching incidents (served from the summary tables where the filters allow).
+
+    Returns:
+        int
+    """
+    filters = {"status": status, "severity": severity, "incident_type": incident_type,
+               "reported_by": reported_by, "date_from": date_from, "date_to": date_to}
+    return count_records(conn, "cyber_incidents", filters)
+
+# -------------------------------
+# SEARCH INCIDENTS
+# -------------------------------
+def search_incidents(conn, query, limit=DEFAULT_SEARCH_LIMIT, offset=0):
+    """
+    Full-text search over incident descriptions, best matches first.
+
+    Args:
+        conn: sqlite3.Connection
+        query (str): words to look for; all must match, the last one as a prefix
+        limit (int): page size
+        offset (int): next_offset returned by the previous page
+
+    Returns:
+        tuple: (pd.DataFrame with the incident columns plus snippet and rank,
+                next_offset or None)
+    """
+    return search_table(conn, "cyber_incidents_fts", query, limit, offset)
+
 # -------------------------------
 # UPDATE INCIDENT STATUS
 # -------------------------------
@@ -63,7 +205,7 @@ def update_incident_status(conn, incident_id, new_status):
     """
     cur = conn.cursor()
     cur.execute("UPDATE cyber_incidents SET status = ? WHERE id = ?", (new_status, incident_id))
-    conn.commit()
+    commit_write(conn, "cyber_incidents")
     return cur.rowcount
 
 # -------------------------------
@@ -82,7 +224,64 @@ def delete_incident(conn, incident_id):
     """
     cur = conn.cursor()
     cur.execute("DELETE FROM cyber_incidents WHERE id = ?", (incident_id,))
-    conn.commit()
+    commit_write(conn, "cyber_incidents")
+    return cur.rowcount
+
+# -------------------------------
+# BATCH WRITES
+# -------------------------------
+# Each batch is one executemany inside a unit_of_work: one commit, and a failure part-way
+# rolls the whole batch back (inside an enclosing unit_of_work, it joins that one).
+INCIDENT_COLUMNS = ("date", "incident_type", "severity", "status", "description", "reported_by")
+
+def insert_incidents(conn, records):
+    """
+    Insert many incidents in one transaction.
+
+    Args:
+        conn: sqlite3.Connection
+        records: iterable of dicts keyed by INCIDENT_COLUMNS, or tuples in
+                 insert_incident's argument order (reported_by may be left out)
+
+    Returns:
+        int: number of rows inserted
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(f"""
+        INSERT INTO cyber_incidents ({", ".join(INCIDENT_COLUMNS)})
+        VALUES ({", ".join(["?"] * len(INCIDENT_COLUMNS))})
+        """, as_rows(records, INCIDENT_COLUMNS))
+        commit_write(conn, "cyber_incidents")
+    return cur.rowcount
+
+def update_incidents_status(conn, incident_ids, new_status):
+    """
+    Set the same status on many incidents in one transaction.
+
+    Returns:
+        int: number of rows updated
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(
+            "UPDATE cyber_incidents SET status = ? WHERE id = ?",
+            ((new_status, incident_id) for incident_id in incident_ids)
+        )
+        commit_write(conn, "cyber_incidents")
+    return cur.rowcount
+
+def delete_incidents(conn, incident_ids):
+    """
+    Delete many incidents in one transaction.
+
+    Returns:
+        int: number of rows deleted
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany("DELETE FROM cyber_incidents WHERE id = ?", as_id_rows(incident_ids))
+        commit_write(conn, "cyber_incidents")
     return cur.rowcount
 
 # -------------------------------
@@ -93,27 +292,14 @@ def get_incidents_by_type_count(conn):
     Count incidents by type.
     Returns a DataFrame with columns: incident_type, count
     """
-    query = """
-    SELECT incident_type, COUNT(*) as count
-    FROM cyber_incidents
-    GROUP BY incident_type
-    ORDER BY count DESC
-    """
-    return pd.read_sql_query(query, conn)
+    return cached_query(conn, "cyber_incidents", INCIDENTS_BY_TYPE_SQL)
 
 def get_high_severity_by_status(conn):
     """
     Count high severity incidents by status.
     Returns a DataFrame with columns: status, count
     """
-    query = """
-    SELECT status, COUNT(*) as count
-    FROM cyber_incidents
-    WHERE severity = 'High'
-    GROUP BY status
-    ORDER BY count DESC
-    """
-    return pd.read_sql_query(query, conn)
+    return cached_query(conn, "cyber_incidents", HIGH_SEVERITY_BY_STATUS_SQL)
 
 def get_incident_types_with_many_cases(conn, min_count=5):
     """
@@ -126,11 +312,28 @@ def get_incident_types_with_many_cases(conn, min_count=5):
     Returns:
         pd.DataFrame
     """
-    query = """
-    SELECT incident_type, COUNT(*) as count
-    FROM cyber_incidents
-    GROUP BY incident_type
-    HAVING COUNT(*) > ?
-    ORDER BY count DESC
+    return cached_query(conn, "cyber_incidents", INCIDENT_TYPES_WITH_MANY_CASES_SQL, (min_count,))
+
+# -------------------------------
+# TRENDS
+# -------------------------------
+def get_incident_trend(conn, bucket="day", start=None, end=None, group_by=None,
+                       incident_type=None, severity=None, status=None):
+    """
+    Incident counts over time, from the daily rollup.
+
+    Args:
+        conn: sqlite3.Connection
+        bucket (str): 'day', 'week' or 'month'
+        start, end (str, optional): inclusive 'YYYY-MM-DD' range on the incident date
+        group_by (str or list, optional): 'incident_type', 'severity' and/or 'status'
+        incident_type, severity, status (str or list, optional): filters
+
+    Returns:
+        pd.DataFrame: period, [group_by columns], count
+
+    Usage:
+        get_incident_trend(conn, "month", group_by="severity", start="2024-01-01")
     """
-    return pd.read_sql_query(query, conn, params=(min_count,))
\ No newline at end of file
+    filters = {"incident_type": incident_type, "severity": severity, "status": status}
+    return rollup_query(conn, "incident_daily_counts", bucket, start, end, group_by, filters)
@@ -0,0 +1,187 @@
+# app/data/indexes.py
+
+import re
+
+from app.data.aggregates import SUMMARIES
+from app.data.datasets import DATASETS_BY_CATEGORY_SQL
+from app.data.db import connect_database
+from app.data.incidents import (
+    HIGH_SEVERITY_BY_STATUS_SQL,
+    INCIDENT_TYPES_WITH_MANY_CASES_SQL,
+    INCIDENTS_BY_TYPE_SQL,
+)
+from app.data.paging import FILTER_SPECS, page_query
+from app.data.search import SEARCH_INDEXES, match_expression, search_query_sql
+from app.data.tickets import TICKETS_BY_STATUS_SQL
+
+# -------------------------------
+# INDEX SETS
+# -------------------------------
+# Each version lists the indexes it adds: (index name, table, columns).
+# Never edit a released set; add a new version instead.
+INDEX_SETS = {
+    1: [
+        # GROUP BY incident_type -> covering index scan, no table access
+        ("idx_incidents_type", "cyber_incidents", ["incident_type"]),
+        # WHERE severity = 'High' GROUP BY status -> range lookup already grouped by status
+        ("idx_incidents_severity_status", "cyber_incidents", ["severity", "status"]),
+        ("idx_tickets_status", "it_tickets", ["status"]),
+        ("idx_tickets_priority", "it_tickets", ["priority"]),
+        ("idx_datasets_category", "datasets_metadata", ["category"]),
+    ],
+    2: [
+        # Filters used by the keyset-paginated listings (app/data/paging.py).
+        # Each index ends in rowid, so "col = ? AND id < ? ORDER BY id DESC" is a range scan.
+        ("idx_incidents_status", "cyber_incidents", ["status"]),
+        ("idx_incidents_reported_by", "cyber_incidents", ["reported_by"]),
+        ("idx_incidents_date", "cyber_incidents", ["date"]),
+        ("idx_tickets_assigned_to", "it_tickets", ["assigned_to"]),
+        ("idx_tickets_category", "it_tickets", ["category"]),
+        ("idx_tickets_created_date", "it_tickets", ["created_date"]),
+        ("idx_datasets_source", "datasets_metadata", ["source"]),
+        ("idx_datasets_last_updated", "datasets_metadata", ["last_updated"]),
+    ],
+    3: [
+        # Set 2 missed severity: (severity, status) from set 1 only ends in rowid within
+        # one status, so severity-filtered pages sorted every matching row for ORDER BY id.
+        ("idx_incidents_severity", "cyber_incidents", ["severity"]),
+    ],
+}
+
+LATEST_INDEX_VERSION = max(INDEX_SETS)
+
+
+def create_index_set(conn, version):
+    """
+    Create the indexes of a single index set (idempotent).
+    """
+    cursor = conn.cursor()
+    for name, table, columns in INDEX_SETS[version]:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+
+def create_indexes(conn, version=LATEST_INDEX_VERSION):
+    """
+    Create every index set up to and including `version`.
+    """
+    for v in sorted(INDEX_SETS):
+        if v <= version:
+            create_index_set(conn, v)
+    conn.commit()
+    print(f"✅ Indexes up to set v{version} created successfully.")
+
+
+def applied_index_version(conn):
+    """
+    Return the highest index set version whose indexes (and all earlier ones) exist.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    applied = 0
+    for v in sorted(INDEX_SETS):
+        if not all(name in existing for name, _, _ in INDEX_SETS[v]):
+            break
+        applied = v
+    return applied
+
+
+# -------------------------------
+# INDEX ADVISOR
+# -------------------------------
+# Every analytics, listing and search query the data layer runs, with sample parameters
+# for EXPLAIN.
+REGISTERED_QUERIES = {
+    "incidents.get_incidents_by_type_count": (INCIDENTS_BY_TYPE_SQL, ()),
+    "incidents.get_high_severity_by_status": (HIGH_SEVERITY_BY_STATUS_SQL, ()),
+    "incidents.get_incident_types_with_many_cases": (INCIDENT_TYPES_WITH_MANY_CASES_SQL, (5,)),
+    "tickets.count_tickets_by_status": (TICKETS_BY_STATUS_SQL, ()),
+    "datasets.count_datasets_by_category": (DATASETS_BY_CATEGORY_SQL, ()),
+}
+
+
+def _register_listing_queries():
+    """
+    The analytics queries above read summary tables, so the listings and searches are
+    what actually touch the source tables. For each listing: the next page of the
+    unfiltered listing and of every filter (the keyset "id < ?" form), plus the first
+    page of every "=" filter, which scans the table if its index is missing.
+    First pages without an "=" filter are left out: they walk ids downwards until the
+    LIMIT is filled (see app/data/paging.py), which EXPLAIN shows as a SCAN by design.
+    """
+    for table, specs in FILTER_SPECS.items():
+        sql, params, _ = page_query(None, table, cursor=1000)
+        REGISTERED_QUERIES[f"paging.{table}.next_page"] = (sql, tuple(params))
+        for name, (column, op) in specs.items():
+            value = "x" if op == "=" else "2024-01-01"
+            sql, params, _ = page_query(None, table, {name: value}, cursor=1000)
+            REGISTERED_QUERIES[f"paging.{table}.{name}.next_page"] = (sql, tuple(params))
+            if op == "=":
+                sql, params, _ = page_query(None, table, {name: value})
+                REGISTERED_QUERIES[f"paging.{table}.{name}"] = (sql, tuple(params))
+    for name in SEARCH_INDEXES:
+        REGISTERED_QUERIES[f"search.{name}"] = (
+            search_query_sql(name), ("**", "**", match_expression("phish"), 21, 0)
+        )
+
+
+_register_listing_queries()
+
+# "SCAN cyber_incidents" is a full table scan; "SCAN t USING COVERING INDEX i" is not flagged,
+# nor is "SCAN x_fts VIRTUAL TABLE INDEX ..." (FTS5 answers MATCH from its own index)
+_TABLE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?!.*(?:USING|VIRTUAL TABLE))")
+
+# Tables that are meant to be scanned: summary tables hold one row per group
+EXPECTED_SCANS = set(SUMMARIES)
+
+
+def register_query(name, sql, params=()):
+    """
+    Add a query to the advisor's registry.
+    """
+    REGISTERED_QUERIES[name] = (sql, tuple(params))
+
+
+def explain_query(conn, sql, params=()):
+    """
+    Return the EXPLAIN QUERY PLAN detail lines for a query.
+    """
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def advise(conn, queries=None):
+    """
+    Run EXPLAIN QUERY PLAN over every registered query and flag full table scans.
+
+    Returns:
+        list of dict: name, plan (list of str), scans (tables read without an index)
+    """
+    report = []
+    for name, (sql, params) in (queries or REGISTERED_QUERIES).items():
+        plan = explain_query(conn, sql, params)
+        scans = [m.group(1) for m in map(_TABLE_SCAN.match, plan)
+                 if m and m.group(1) not in EXPECTED_SCANS]
+        report.append({"name": name, "plan": plan, "scans": scans})
+    return report
+
+
+def print_advice(conn):
+    """
+    Print the advisor report; returns the number of queries that still scan.
+    """
+    flagged = 0
+    for entry in advise(conn):
+        if entry["scans"]:
+            flagged += 1
+            print(f"⚠ {entry['name']}: full scan of {', '.join(entry['scans'])}")
+        else:
+            print(f"✔ {entry['name']}")
+        for line in entry["plan"]:
+            print(f"    {line}")
+    print(f"\n{flagged} of {len(REGISTERED_QUERIES)} registered queries still scan a table.")
+    return flagged
+
+
+if __name__ == "__main__":
+    # python -m app.data.indexes
+    conn = connect_database()
+    print_advice(conn)
+    conn.close()
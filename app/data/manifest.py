@@ -0,0 +1,226 @@
+# app/data/manifest.py
+
+import csv
+import hashlib
+import os
+from pathlib import Path
+
+from app.data.cache import invalidate_table
+from app.data.db import stream_csv_to_table
+
+# NOTE: the manifest remembers, per source CSV, how far into the file we've loaded and a
+# hash of those bytes. On startup:
+#   - size and mtime unchanged          -> skipped without reading the file
+#   - loaded bytes unchanged, file grew -> only the new tail is loaded
+#   - loaded bytes changed (rewritten)  -> the file is reconciled against the table
+# so restarts cost a stat() per file and tables stop collecting duplicate rows.
+
+# Source CSVs live in the repo-root DATA/ folder (app/data/manifest.py -> parents[2])
+DATA_DIR = Path(__file__).resolve().parents[2] / "DATA"
+
+CSV_SOURCES = {
+    "cyber_incidents.csv": "cyber_incidents",
+    "it_tickets.csv": "it_tickets",
+    "datasets_metadata.csv": "datasets_metadata",
+}
+
+# Natural keys used to update (rather than duplicate) rows when a file is reconciled
+NATURAL_KEYS = {
+    "it_tickets": ["ticket_id"],
+}
+
+_HASH_BLOCK = 1024 * 1024
+
+
+# -------------------------------
+# MANIFEST TABLE
+# -------------------------------
+LOAD_MANIFEST_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS load_manifest (
+        source_path TEXT PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        byte_offset INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        rows_loaded INTEGER DEFAULT 0,
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def create_load_manifest_table(conn):
+    """
+    Make sure the load_manifest table exists (it's created by schema migration 3).
+    """
+    # imported here: migrations builds on this module
+    from app.data.migrations import ensure_schema
+    ensure_schema(conn)
+
+
+def _get_entry(conn, source_path):
+    row = conn.execute(
+        "SELECT file_size, mtime_ns, byte_offset, content_hash, rows_loaded "
+        "FROM load_manifest WHERE source_path = ?",
+        (source_path,)
+    ).fetchone()
+    if row is None:
+        return None
+    keys = ("file_size", "mtime_ns", "byte_offset", "content_hash", "rows_loaded")
+    return dict(zip(keys, row))
+
+
+def _save_entry(conn, source_path, table_name, st, byte_offset, content_hash, rows_loaded):
+    conn.execute("""
+        INSERT INTO load_manifest (
+            source_path, table_name, file_size, mtime_ns, byte_offset, content_hash, rows_loaded
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(source_path) DO UPDATE SET
+            table_name = excluded.table_name,
+            file_size = excluded.file_size,
+            mtime_ns = excluded.mtime_ns,
+            byte_offset = excluded.byte_offset,
+            content_hash = excluded.content_hash,
+            rows_loaded = excluded.rows_loaded,
+            loaded_at = CURRENT_TIMESTAMP
+    """, (source_path, table_name, st.st_size, st.st_mtime_ns, byte_offset, content_hash, rows_loaded))
+    conn.commit()
+
+
+# -------------------------------
+# HASHING
+# -------------------------------
+def _hash_range(path, start, end, hasher=None):
+    """Feed bytes [start, end) of a file into a sha256 hasher (new one if None)."""
+    hasher = hasher or hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(_HASH_BLOCK, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+# -------------------------------
+# RECONCILE
+# -------------------------------
+def reconcile_csv_to_table(conn, csv_path, table_name):
+    """
+    Merge a whole CSV into a table that may already hold some of its rows.
+    - The file is streamed into a temp staging table with the same column affinities.
+    - Tables with a natural key (see NATURAL_KEYS) are upserted on that key.
+    - Other tables only get rows that don't already exist with identical values.
+    Rows that disappeared from the file are left alone: they can't be told apart from
+    rows added through the app.
+    Returns dict with the stream stats plus `inserted` (rows added or updated in the table).
+    """
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        columns = next(csv.reader(f), [])
+    if not columns:
+        return {"rows_read": 0, "inserted": 0, "rejected": 0, "end_offset": 0}
+
+    col_list = ", ".join([f'"{c}"' for c in columns])
+    conn.execute("DROP TABLE IF EXISTS temp.csv_stage")
+    # CREATE TABLE AS keeps each column's affinity, so '15000' is stored as 15000
+    # and compares equal to the rows already in the table.
+    conn.execute(f"CREATE TEMP TABLE csv_stage AS SELECT {col_list} FROM {table_name} WHERE 0")
+    try:
+        stats = stream_csv_to_table(conn, csv_path, "temp.csv_stage", on_conflict="ignore")
+        keys = NATURAL_KEYS.get(table_name)
+        if keys and all(k in columns for k in keys):
+            values = [c for c in columns if c not in keys]
+            updates = ", ".join([f'"{c}" = excluded."{c}"' for c in values])
+            # Rows whose values haven't changed are left alone (no write, no triggers)
+            current = ", ".join([f'{table_name}."{c}"' for c in values])
+            incoming = ", ".join([f'excluded."{c}"' for c in values])
+            action = f"DO UPDATE SET {updates} WHERE ({current}) IS NOT ({incoming})" if values else "DO NOTHING"
+            cur = conn.execute(f"""
+                INSERT INTO {table_name} ({col_list})
+                SELECT {col_list} FROM temp.csv_stage WHERE true
+                ON CONFLICT({", ".join(keys)}) {action}
+            """)
+        else:
+            cur = conn.execute(f"""
+                INSERT INTO {table_name} ({col_list})
+                SELECT {col_list} FROM temp.csv_stage
+                EXCEPT
+                SELECT {col_list} FROM {table_name}
+            """)
+        conn.commit()
+        invalidate_table(conn, table_name)
+        # The statement's own rowcount: total_changes would also count trigger writes
+        # (summaries, search index, rollups, change log)
+        stats["inserted"] = cur.rowcount
+        return stats
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.csv_stage")
+
+
+# -------------------------------
+# INCREMENTAL SYNC
+# -------------------------------
+def sync_csv_source(conn, csv_path, table_name):
+    """
+    Bring a table up to date with its source CSV using the load manifest.
+
+    Returns:
+        dict: action ('missing', 'skipped', 'loaded', 'appended', 'reconciled'), inserted
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        print(f"❌ CSV file not found: {csv_path}")
+        return {"action": "missing", "inserted": 0}
+
+    create_load_manifest_table(conn)
+    source_path = str(csv_path.resolve())
+    st = os.stat(csv_path)
+    entry = _get_entry(conn, source_path)
+
+    if (entry and entry["file_size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["byte_offset"] == st.st_size):
+        return {"action": "skipped", "inserted": 0}
+
+    if entry and entry["byte_offset"] <= st.st_size:
+        prefix = _hash_range(csv_path, 0, entry["byte_offset"])
+        if prefix.hexdigest() == entry["content_hash"]:
+            if entry["byte_offset"] == st.st_size:
+                # Touched but not changed: just remember the new mtime
+                _save_entry(conn, source_path, table_name, st, entry["byte_offset"],
+                            entry["content_hash"], entry["rows_loaded"])
+                return {"action": "skipped", "inserted": 0}
+            stats = stream_csv_to_table(conn, csv_path, table_name, start_offset=entry["byte_offset"])
+            content_hash = _hash_range(csv_path, entry["byte_offset"], stats["end_offset"], prefix).hexdigest()
+            _save_entry(conn, source_path, table_name, st, stats["end_offset"], content_hash,
+                        entry["rows_loaded"] + stats["inserted"])
+            print(f"✔ Appended {stats['inserted']} new rows from '{csv_path.name}' into '{table_name}'")
+            return {"action": "appended", "inserted": stats["inserted"]}
+
+    table_empty = conn.execute(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone() is None
+    if entry is None and table_empty:
+        stats = stream_csv_to_table(conn, csv_path, table_name)
+        action = "loaded"
+    else:
+        # File rewritten, or the table was filled before the manifest existed
+        stats = reconcile_csv_to_table(conn, csv_path, table_name)
+        action = "reconciled"
+
+    content_hash = _hash_range(csv_path, 0, stats["end_offset"]).hexdigest()
+    _save_entry(conn, source_path, table_name, st, stats["end_offset"], content_hash, stats["inserted"])
+    print(f"✔ {action.capitalize()} '{csv_path.name}' into '{table_name}' ({stats['inserted']} rows)")
+    return {"action": action, "inserted": stats["inserted"]}
+
+
+def sync_csv_sources(conn, data_dir=DATA_DIR, sources=None):
+    """
+    Sync every known CSV in data_dir into its table (see CSV_SOURCES).
+    Returns total rows inserted across files.
+    """
+    data_dir = Path(data_dir)
+    total = 0
+    for csv_file, table in (sources or CSV_SOURCES).items():
+        total += sync_csv_source(conn, data_dir / csv_file, table)["inserted"]
+    return total
@@ -0,0 +1,172 @@
+# app/data/migrations.py
+
+import threading
+
+from app.data.aggregates import install_summaries
+from app.data.db import database_file
+from app.data.indexes import create_index_set
+from app.data.manifest import LOAD_MANIFEST_TABLE_SQL
+from app.data.rollups import install_rollups
+from app.data.schema import (
+    CYBER_INCIDENTS_TABLE_SQL,
+    DATASETS_METADATA_TABLE_SQL,
+    IT_TICKETS_TABLE_SQL,
+    LOGIN_ATTEMPTS_TABLE_SQL,
+    RATE_LIMIT_BUCKETS_TABLE_SQL,
+    SESSIONS_INDEXES_SQL,
+    SESSIONS_TABLE_SQL,
+    USERS_TABLE_SQL,
+)
+from app.data.search import install_search_indexes
+from app.data.versions import install_versioning, reinstall_version_triggers
+
+# NOTE: the schema version is stored in SQLite's own header via PRAGMA user_version.
+# Each step runs in its own BEGIN IMMEDIATE transaction together with the version bump,
+# so a crash never leaves a half-applied step, and two processes starting at the same
+# time can't both apply it. Steps must not commit themselves.
+#
+# To change the schema, append a step; never edit or reorder released ones.
+
+
+# -------------------------------
+# MIGRATION STEPS
+# -------------------------------
+def _create_base_tables(conn):
+    # IF NOT EXISTS: databases created before versioning already have these tables.
+    # (Older ones declare users.password_hash as TEXT; that's only an affinity, and
+    # TEXT affinity never converts the bcrypt bytes we store, so no rebuild is needed.)
+    for ddl in (USERS_TABLE_SQL, CYBER_INCIDENTS_TABLE_SQL,
+                DATASETS_METADATA_TABLE_SQL, IT_TICKETS_TABLE_SQL):
+        conn.execute(ddl)
+
+
+def _create_index_set_1(conn):
+    create_index_set(conn, 1)
+
+
+def _create_load_manifest(conn):
+    conn.execute(LOAD_MANIFEST_TABLE_SQL)
+
+
+def _install_summaries(conn):
+    install_summaries(conn)
+
+
+def _create_index_set_2(conn):
+    create_index_set(conn, 2)
+
+
+def _create_index_set_3(conn):
+    create_index_set(conn, 3)
+
+
+def _install_search_indexes(conn):
+    install_search_indexes(conn)
+
+
+def _install_rollups(conn):
+    install_rollups(conn)
+
+
+def _create_sessions(conn):
+    conn.execute(SESSIONS_TABLE_SQL)
+    for ddl in SESSIONS_INDEXES_SQL:
+        conn.execute(ddl)
+
+
+def _create_login_attempts(conn):
+    conn.execute(LOGIN_ATTEMPTS_TABLE_SQL)
+
+
+def _create_rate_limit_buckets(conn):
+    conn.execute(RATE_LIMIT_BUCKETS_TABLE_SQL)
+
+
+def _install_versioning(conn):
+    install_versioning(conn)
+
+
+def _reinstall_version_triggers(conn):
+    reinstall_version_triggers(conn)
+
+
+MIGRATIONS = [
+    (1, "base tables", _create_base_tables),
+    (2, "analytics indexes (index set v1)", _create_index_set_1),
+    (3, "CSV load manifest", _create_load_manifest),
+    (4, "analytics summary tables and triggers", _install_summaries),
+    (5, "listing filter indexes (index set v2)", _create_index_set_2),
+    (6, "full-text search indexes", _install_search_indexes),
+    (7, "daily rollup tables and triggers", _install_rollups),
+    (8, "sessions table", _create_sessions),
+    (9, "login attempts table", _create_login_attempts),
+    (10, "rate limit buckets table", _create_rate_limit_buckets),
+    (11, "table versions and row change log", _install_versioning),
+    (12, "version triggers that work under UPSERT", _reinstall_version_triggers),
+    (13, "severity listing index (index set v3)", _create_index_set_3),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# -------------------------------
+# ENGINE
+# -------------------------------
+def get_schema_version(conn):
+    """Return the database's current schema version (0 for a new database)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target=LATEST_VERSION):
+    """
+    Apply every pending migration step up to `target`.
+
+    Returns:
+        int: the schema version after migrating
+    """
+    version = get_schema_version(conn)
+    if version >= target:
+        return version
+
+    if conn.in_transaction:
+        conn.commit()
+    for step_version, description, step in MIGRATIONS:
+        if step_version > target:
+            break
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock: another process may have just migrated
+            if get_schema_version(conn) >= step_version:
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {int(step_version)}")
+            conn.commit()
+            print(f"✅ Applied migration {step_version}: {description}")
+        except Exception:
+            conn.rollback()
+            raise
+    return get_schema_version(conn)
+
+
+# -------------------------------
+# ONCE PER PROCESS
+# -------------------------------
+_checked_paths = set()
+_checked_lock = threading.Lock()
+
+
+def ensure_schema(conn):
+    """
+    Make sure the connection's database is at the latest schema version.
+    Each database file is only checked once per process; later calls are a set lookup.
+    """
+    path = database_file(conn)
+    if path and path in _checked_paths:
+        return
+    with _checked_lock:
+        if path and path in _checked_paths:
+            return
+        migrate(conn)
+        if path:
+            _checked_paths.add(path)
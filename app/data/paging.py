@@ -0,0 +1,134 @@
+# app/data/paging.py
+
+from app.data.cache import cached_query
+
+# NOTE: pages are fetched with keyset cursors on id rather than OFFSET:
+#     WHERE <filters> AND id < :cursor ORDER BY id DESC LIMIT :limit
+# so page N costs the same as page 1 however deep you go. What that holds for:
+# - no filter, or "=" on one column with its own index (or on exactly the columns of a
+#   composite index): id is the rowid and every index ends in rowid, so the page is an
+#   index range scan in id order - constant cost per page;
+# - IN lists: one range per value, merged with a temp B-tree sort of every matching row
+#   below the cursor, so cost grows with the number of matches;
+# - date ranges: the planner walks ids downwards and filters, so cost grows with the
+#   rows skipped before the page fills (cheap for recent dates, not for old ones).
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Filters each listing accepts: filter name -> (column, operator).
+# A list/tuple value for an "=" filter becomes IN (...); None means "no filter".
+FILTER_SPECS = {
+    "cyber_incidents": {
+        "status": ("status", "="),
+        "severity": ("severity", "="),
+        "incident_type": ("incident_type", "="),
+        "reported_by": ("reported_by", "="),
+        "date_from": ("date", ">="),
+        "date_to": ("date", "<="),
+    },
+    "it_tickets": {
+        "status": ("status", "="),
+        "priority": ("priority", "="),
+        "category": ("category", "="),
+        "assigned_to": ("assigned_to", "="),
+        "date_from": ("created_date", ">="),
+        "date_to": ("created_date", "<="),
+    },
+    "datasets_metadata": {
+        "category": ("category", "="),
+        "source": ("source", "="),
+        "date_from": ("last_updated", ">="),
+        "date_to": ("last_updated", "<="),
+    },
+}
+
+
+def table_columns(conn, table):
+    """Column names of a table, in definition order."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def build_where(table, filters):
+    """
+    Turn a filter dict into a WHERE clause (without the keyword) and its parameters.
+
+    Raises:
+        ValueError: for a filter the table doesn't support.
+    """
+    specs = FILTER_SPECS[table]
+    clauses, params = [], []
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name not in specs:
+            raise ValueError(f"Unknown filter '{name}' for {table}. Allowed: {sorted(specs)}")
+        column, op = specs[name]
+        if op == "=" and isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join(['?'] * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+def select_columns(conn, table, columns):
+    """
+    Validate a column projection and return the SELECT list ('*' if columns is None).
+    id is always included because the cursor is built from it.
+    """
+    if not columns:
+        return "*"
+    known = table_columns(conn, table)
+    unknown = [c for c in columns if c not in known]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table}: {unknown}")
+    ordered = ["id"] + [c for c in columns if c != "id"]
+    return ", ".join(ordered)
+
+
+def page_query(conn, table, filters=None, columns=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Build the keyset query for one page (shared by the DataFrame and record APIs).
+
+    Returns:
+        tuple: (sql, params, limit) - the query fetches limit + 1 rows
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    where, params = build_where(table, filters)
+    clauses = [where] if where else []
+    if cursor is not None:
+        clauses.append("id < ?")
+        params.append(int(cursor))
+    sql = f"SELECT {select_columns(conn, table, columns)} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # One extra row tells us whether there is a next page without a COUNT(*)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(limit + 1)
+    return sql, params, limit
+
+
+def fetch_page(conn, table, filters=None, columns=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page of a table, newest first.
+
+    Args:
+        conn: sqlite3.Connection
+        table (str): table name (must have an entry in FILTER_SPECS)
+        filters (dict, optional): see FILTER_SPECS
+        columns (list, optional): columns to return (id is always included)
+        cursor (int, optional): the next_cursor from the previous page
+        limit (int): page size (capped at MAX_PAGE_SIZE)
+
+    Returns:
+        tuple: (pd.DataFrame page, next_cursor or None when this is the last page)
+    """
+    sql, params, limit = page_query(conn, table, filters, columns, cursor, limit)
+    df = cached_query(conn, table, sql, params)
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        return df, int(df["id"].iloc[-1])
+    return df, None
@@ -0,0 +1,231 @@
+# app/data/pool.py
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.data.db import DB_PATH, connect_database
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_CHECKOUT_TIMEOUT = 30.0
+# Connections idle for longer than this get a "SELECT 1" before being handed out
+DEFAULT_HEALTH_CHECK_AFTER = 30.0
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of sqlite3 connections for one database file.
+
+    - Connections are opened lazily (up to `size`) and configured once, so the WAL and
+      busy_timeout PRAGMAs aren't re-issued on every request.
+    - Thread affinity: a thread gets back the connection it used last if it's free,
+      which keeps SQLite's per-connection page cache warm.
+    - Connections idle for a while are health-checked before reuse and replaced if broken.
+    - Any transaction left open by the borrower is rolled back on return.
+
+    Usage:
+        pool = ConnectionPool(size=4)
+        with pool.connection() as conn:
+            conn.execute("SELECT 1")
+    """
+
+    def __init__(self, db_path=DB_PATH, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 connect=None, health_check_after=DEFAULT_HEALTH_CHECK_AFTER):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_path = Path(db_path)
+        self.size = size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._connect = connect or (lambda: connect_database(self.db_path))
+        self._cond = threading.Condition()
+        self._idle = {}  # conn -> time it was returned
+        self._opened = 0
+        self._closed = False
+        self._local = threading.local()
+        self._stats = {
+            "checkouts": 0,
+            "opens": 0,
+            "waits": 0,
+            "wait_time_sec": 0.0,
+            "max_wait_sec": 0.0,
+            "health_check_failures": 0,
+            "affinity_hits": 0,
+        }
+
+    # -------------------------------
+    # CHECKOUT / CHECKIN
+    # -------------------------------
+    def _take_idle(self):
+        """Pick an idle connection, preferring this thread's last one. Caller holds the lock."""
+        preferred = getattr(self._local, "conn", None)
+        if preferred is not None and preferred in self._idle:
+            self._stats["affinity_hits"] += 1
+            return preferred, self._idle.pop(preferred)
+        conn = next(reversed(self._idle))  # most recently returned (warmest)
+        return conn, self._idle.pop(conn)
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    def _open(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["opens"] += 1
+        return conn
+
+    def acquire(self, timeout=None):
+        """
+        Check a connection out of the pool. Prefer `connection()`, which always returns it.
+
+        Raises:
+            TimeoutError: if no connection frees up within the timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                if self._idle:
+                    conn, returned_at = self._take_idle()
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    conn, returned_at = None, None
+                    break
+                waited = True
+                remaining = timeout - (time.perf_counter() - start)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._opened >= self.size:
+                        raise TimeoutError(f"No database connection available after {timeout}s.")
+
+            self._stats["checkouts"] += 1
+            if waited:
+                wait = time.perf_counter() - start
+                self._stats["waits"] += 1
+                self._stats["wait_time_sec"] += wait
+                self._stats["max_wait_sec"] = max(self._stats["max_wait_sec"], wait)
+
+        if conn is None:
+            conn = self._open()
+        elif time.monotonic() - returned_at > self.health_check_after and not self._is_healthy(conn):
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+            conn = self._open()
+
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            # Broken connection: drop it and free its slot
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if self._closed:
+                conn.close()
+                self._opened -= 1
+                return
+            self._idle[conn] = time.monotonic()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks out a connection and always returns it."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    # -------------------------------
+    # STATS / SHUTDOWN
+    # -------------------------------
+    def stats(self):
+        """
+        Return a snapshot of pool statistics.
+
+        Returns:
+            dict: checkouts, opens, waits, wait_time_sec, max_wait_sec, health_check_failures,
+                  affinity_hits, size, open, idle, in_use
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["wait_time_sec"] = round(stats["wait_time_sec"], 6)
+            stats["max_wait_sec"] = round(stats["max_wait_sec"], 6)
+            stats.update({
+                "size": self.size,
+                "open": self._opened,
+                "idle": len(self._idle),
+                "in_use": self._opened - len(self._idle),
+            })
+            return stats
+
+    def close(self):
+        """Close idle connections now; connections in use are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+
+# -------------------------------
+# SHARED POOLS
+# -------------------------------
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=DB_PATH, size=DEFAULT_POOL_SIZE):
+    """
+    Return the process-wide pool for a database file, creating it on first use.
+    `size` only applies when the pool is created.
+    """
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, size=size)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every shared pool (e.g. at process shutdown or between tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,180 @@
+# app/data/records.py
+
+from app.data.aggregates import SUMMARIES
+from app.data.paging import DEFAULT_PAGE_SIZE, FILTER_SPECS, build_where, page_query
+
+# NOTE: a pandas-free way to read rows, for hot paths (APIs, loops over every row,
+# single-row lookups) where building a DataFrame costs more than the query.
+# Rows come back as small __slots__ objects (attribute access, no per-row dict) or as
+# plain tuples, converted by the cursor's row_factory as SQLite hands them over:
+#
+#     incident = get_record(conn, Incident, 42)          # Incident or None
+#     for row in iter_records(conn, Incident, filters={"severity": "High"}):
+#         ...                                            # one batch in memory at a time
+#     rows, cursor = fetch_record_page(conn, Incident)   # same keyset pages as fetch_page
+#
+# Record fields are the full column list of each table, selected by name, so a row
+# always lines up with its class whatever the physical column order.
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+# -------------------------------
+# RECORD CLASSES
+# -------------------------------
+class Record:
+    """Base for the row classes: fixed fields, no __dict__."""
+    __slots__ = ()
+    table = None
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        """sqlite3 row_factory: build a record straight from the row tuple."""
+        return cls(*row)
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Incident(Record):
+    __slots__ = ("id", "date", "incident_type", "severity", "status", "description",
+                 "reported_by", "created_at")
+    table = "cyber_incidents"
+
+
+class Ticket(Record):
+    __slots__ = ("id", "ticket_id", "priority", "status", "category", "subject", "description",
+                 "created_date", "resolved_date", "assigned_to", "created_at")
+    table = "it_tickets"
+
+
+class Dataset(Record):
+    __slots__ = ("id", "dataset_name", "category", "source", "last_updated", "record_count",
+                 "file_size_mb", "created_at")
+    table = "datasets_metadata"
+
+
+def _cursor(conn, record_class, sql, params):
+    """Execute on a fresh cursor; record_class=None leaves rows as plain tuples."""
+    cur = conn.cursor()
+    if record_class is not None:
+        cur.row_factory = record_class.row_factory
+    return cur.execute(sql, params)
+
+
+def _select(record_class):
+    return ", ".join(record_class.__slots__)
+
+
+# -------------------------------
+# READS
+# -------------------------------
+def get_record(conn, record_class, record_id):
+    """
+    Fetch one row by id.
+
+    Returns:
+        Record or None: None if no such row
+    """
+    sql = f"SELECT {_select(record_class)} FROM {record_class.table} WHERE id = ?"
+    return _cursor(conn, record_class, sql, (record_id,)).fetchone()
+
+
+def iter_records(conn, record_class, filters=None, batch_size=DEFAULT_BATCH_SIZE, as_tuples=False):
+    """
+    Iterate over every matching row in id order, holding one batch in memory at a time.
+
+    Args:
+        conn: sqlite3.Connection
+        record_class: Incident, Ticket or Dataset
+        filters (dict, optional): see paging.FILTER_SPECS
+        batch_size (int): rows per fetchmany
+        as_tuples (bool): yield plain tuples (fields in record_class.__slots__ order)
+
+    Usage:
+        for incident in iter_records(conn, Incident, filters={"status": "Open"}):
+            print(incident.id, incident.severity)
+    """
+    where, params = build_where(record_class.table, filters)
+    sql = f"SELECT {_select(record_class)} FROM {record_class.table}"
+    if where:
+        sql += " WHERE " + where
+    sql += " ORDER BY id"
+    cur = _cursor(conn, None if as_tuples else record_class, sql, params)
+    try:
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        cur.close()
+
+
+def fetch_record_page(conn, record_class, filters=None, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                      as_tuples=False):
+    """
+    One keyset page, newest first - the record counterpart of paging.fetch_page.
+    Not cached: records are for callers that want the rows, not a DataFrame.
+
+    Returns:
+        tuple: (list of records or tuples, next_cursor or None)
+    """
+    sql, params, limit = page_query(conn, record_class.table, filters, record_class.__slots__,
+                                    cursor, limit)
+    rows = _cursor(conn, None if as_tuples else record_class, sql, params).fetchall()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, last[0] if as_tuples else last.id
+    return rows, None
+
+
+def count_records(conn, table, filters=None):
+    """
+    Count matching rows of a table.
+
+    Unfiltered counts, and counts filtered only by equality on a summary table's keys
+    (e.g. incident severity/status, ticket status), are answered from the summary
+    tables in O(number of groups); anything else is a COUNT(*) over the indexes.
+
+    Returns:
+        int
+    """
+    active = {name: value for name, value in (filters or {}).items() if value is not None}
+    specs = FILTER_SPECS[table]
+    where, params = build_where(table, active)
+    wanted = {specs[name][0] for name in active}
+    for name, spec in SUMMARIES.items():
+        keys = {key for key, _ in spec["keys"]}
+        if (spec["source"] == table and wanted <= keys
+                and all(specs[f][1] == "=" for f in active)):
+            sql = f"SELECT COALESCE(SUM(count), 0) FROM {name}"
+            break
+    else:
+        sql = f"SELECT COUNT(*) FROM {table}"
+    if where:
+        sql += " WHERE " + where
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def records_to_frame(rows, record_class):
+    """Turn records or tuples back into a DataFrame (pandas is imported only here)."""
+    # imported here: pandas is only loaded once a DataFrame is actually needed
+    import pandas as pd
+    tuples = [r.as_tuple() if isinstance(r, Record) else r for r in rows]
+    return pd.DataFrame.from_records(tuples, columns=list(record_class.__slots__))
@@ -0,0 +1,139 @@
+# app/data/rollups.py
+
+from app.data.aggregates import install_summaries, rebuild_summaries, verify_summaries
+from app.data.cache import cached_query
+from app.data.db import connect_database
+
+# NOTE: daily rollups are summary tables (see aggregates.py) keyed by calendar day plus
+# the dimensions trend charts slice by. The same triggers keep them current, so a
+# trend over years of data reads (days x groups) rows, never the source tables.
+# Week and month buckets are computed from the daily rows at query time.
+#
+# Days come from date(...) on the stored TEXT dates, so 'YYYY-MM-DD' and
+# 'YYYY-MM-DD HH:MM:SS' values land in the same bucket; unparseable dates count under NULL.
+
+
+def _col(name):
+    return (name, "{row}." + name)
+
+
+ROLLUPS = {
+    "incident_daily_counts": {
+        "source": "cyber_incidents",
+        "keys": [("day", "date({row}.date)"), _col("incident_type"), _col("severity"), _col("status")],
+    },
+    "ticket_daily_counts": {
+        "source": "it_tickets",
+        "keys": [("day", "date({row}.created_date)"), _col("priority"), _col("category"), _col("status")],
+    },
+    # Resolved tickets by resolution day, with the summed days-to-resolve for MTTR
+    "ticket_daily_resolutions": {
+        "source": "it_tickets",
+        "keys": [("day", "date({row}.resolved_date)"), _col("priority"), _col("category")],
+        "measures": [("resolution_days", "julianday({row}.resolved_date) - julianday({row}.created_date)")],
+        "when": "{row}.resolved_date IS NOT NULL AND {row}.created_date IS NOT NULL",
+    },
+}
+
+# Bucket -> SQL expression mapping a day to the bucket's label
+BUCKETS = {
+    "day": "day",
+    "week": "date(day, 'weekday 0', '-6 days')",  # Monday starting the ISO week
+    "month": "strftime('%Y-%m', day)",
+}
+
+
+def install_rollups(conn):
+    """
+    Create the rollup tables and triggers and fill them from the source tables.
+    Does not commit (runs inside a schema migration step).
+    """
+    install_summaries(conn, ROLLUPS)
+
+
+def rebuild_rollups(conn):
+    """Recompute the rollup tables from scratch."""
+    rebuild_summaries(conn, ROLLUPS)
+
+
+def verify_rollups(conn):
+    """Compare each rollup with a fresh GROUP BY over its source (see verify_summaries)."""
+    return verify_summaries(conn, ROLLUPS)
+
+
+# -------------------------------
+# QUERIES
+# -------------------------------
+def rollup_query(conn, rollup, bucket="day", start=None, end=None, group_by=None,
+                 filters=None, measures=None):
+    """
+    Aggregate a daily rollup into day, week or month buckets.
+
+    Args:
+        conn: sqlite3.Connection
+        rollup (str): rollup table (key of ROLLUPS)
+        bucket (str): 'day', 'week' (labelled by its Monday) or 'month' ('YYYY-MM')
+        start, end (str, optional): inclusive 'YYYY-MM-DD' range of days
+        group_by (str or list, optional): rollup key column(s) to split each bucket by
+        filters (dict, optional): key column -> value (or list of values) to keep
+        measures (list, optional): extra SELECT expressions over the rollup columns,
+                                   e.g. ["SUM(resolution_days) / SUM(count) AS mttr_days"]
+
+    Returns:
+        pd.DataFrame: period, [group_by columns], count, [measures], oldest period first
+    """
+    spec = ROLLUPS[rollup]
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'. Use one of {sorted(BUCKETS)}.")
+    key_columns = [col for col, _ in spec["keys"] if col != "day"]
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    group_by = list(group_by or [])
+    unknown = [c for c in group_by + list(filters or {}) if c not in key_columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {rollup}: {unknown}. Allowed: {key_columns}")
+
+    clauses, params = ["day IS NOT NULL"], []
+    if start:
+        clauses.append("day >= ?")
+        params.append(start)
+    if end:
+        clauses.append("day <= ?")
+        params.append(end)
+    for column, value in (filters or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join(['?'] * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    selects = [f"{BUCKETS[bucket]} AS period"] + group_by + ["SUM(count) AS count"] + list(measures or [])
+    groups = ", ".join(["period"] + group_by)
+    sql = (
+        f"SELECT {', '.join(selects)} FROM {rollup} "
+        f"WHERE {' AND '.join(clauses)} GROUP BY {groups} ORDER BY {groups}"
+    )
+    return cached_query(conn, spec["source"], sql, params)
+
+
+if __name__ == "__main__":
+    # python -m app.data.rollups [verify|rebuild]
+    import sys
+
+    conn = connect_database()
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild":
+        rebuild_rollups(conn)
+    else:
+        drifted = {name: rows for name, rows in verify_rollups(conn).items() if rows}
+        for name, rows in drifted.items():
+            print(f"⚠ {name} has drifted:")
+            for row in rows:
+                print(f"    {row}")
+        if not drifted:
+            print("✔ All rollup tables match their source tables.")
+        sys.exit(1 if drifted else 0)
+    conn.close()
@@ -0,0 +1,165 @@
+# app/data/router.py
+
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.data.db import DB_PATH, connect_database, connect_read_only
+from app.data.pool import ConnectionPool
+
+# NOTE: the data-layer functions all take `conn` as their first argument, so the router
+# simply decides which connection they run on:
+#
+#     router = get_router()
+#     df = router.read(get_incidents_by_type_count)          # any reader thread
+#     new_id = router.write(insert_incident, "2025-01-01", ...)  # the single writer
+#
+# Reads go to a pool of read-only connections and run in parallel (WAL lets readers
+# proceed while a write commits). Writes are queued to one writer connection owned by a
+# dedicated thread, so they never contend with each other for SQLite's write lock.
+
+DEFAULT_READERS = 4
+
+_STOP = object()
+
+
+class ReadWriteRouter:
+    """
+    Route data-layer calls to read-only reader connections or the single writer.
+    """
+
+    def __init__(self, db_path=DB_PATH, readers=DEFAULT_READERS):
+        self.db_path = Path(db_path)
+        # The file must exist before read-only connections can open it
+        connect_database(self.db_path).close()
+        self.readers = ConnectionPool(
+            self.db_path, size=readers, connect=lambda: connect_read_only(self.db_path)
+        )
+        self._jobs = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._reads = 0
+        self._writes = 0
+        self._write_errors = 0
+
+    # -------------------------------
+    # READS
+    # -------------------------------
+    @contextmanager
+    def reader(self):
+        """Check out a read-only connection."""
+        with self.readers.connection() as conn:
+            yield conn
+
+    def read(self, fn, *args, **kwargs):
+        """Run fn(conn, *args, **kwargs) on a read-only connection and return its result."""
+        with self._lock:
+            self._reads += 1
+        with self.readers.connection() as conn:
+            return fn(conn, *args, **kwargs)
+
+    # -------------------------------
+    # WRITES
+    # -------------------------------
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="sqlite-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _writer_loop(self):
+        conn = connect_database(self.db_path)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is _STOP:
+                    break
+                fn, args, kwargs, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = fn(conn, *args, **kwargs)
+                    if conn.in_transaction:
+                        conn.commit()
+                    future.set_result(result)
+                except BaseException as e:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    with self._lock:
+                        self._write_errors += 1
+                    future.set_exception(e)
+        finally:
+            conn.close()
+
+    def submit_write(self, fn, *args, **kwargs):
+        """
+        Queue fn(conn, *args, **kwargs) for the writer connection.
+
+        Returns:
+            concurrent.futures.Future with the function's result.
+        """
+        self._ensure_writer()
+        future = Future()
+        with self._lock:
+            self._writes += 1
+        self._jobs.put((fn, args, kwargs, future))
+        return future
+
+    def write(self, fn, *args, **kwargs):
+        """Queue a write and wait for its result."""
+        return self.submit_write(fn, *args, **kwargs).result()
+
+    # -------------------------------
+    # STATS / SHUTDOWN
+    # -------------------------------
+    def stats(self):
+        """
+        Return router statistics.
+
+        Returns:
+            dict: reads, writes, write_errors, write_queue_depth, readers (pool stats)
+        """
+        with self._lock:
+            return {
+                "reads": self._reads,
+                "writes": self._writes,
+                "write_errors": self._write_errors,
+                "write_queue_depth": self._jobs.qsize(),
+                "readers": self.readers.stats(),
+            }
+
+    def close(self):
+        """Drain queued writes, stop the writer thread and close reader connections."""
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None:
+            self._jobs.put(_STOP)
+            writer.join()
+        self.readers.close()
+
+
+# -------------------------------
+# SHARED ROUTERS
+# -------------------------------
+_routers = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(db_path=DB_PATH, readers=DEFAULT_READERS):
+    """
+    Return the process-wide router for a database file, creating it on first use.
+    `readers` only applies when the router is created.
+    """
+    key = str(Path(db_path).resolve())
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            router = ReadWriteRouter(db_path, readers=readers)
+            _routers[key] = router
+        return router
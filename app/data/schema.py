@@ -3,23 +3,31 @@
 from app.data.db import connect_database
 import sqlite3
 
+# NOTE: the DDL lives in constants so the migration engine (app/data/migrations.py)
+# can apply it inside its versioned steps. New tables/columns/indexes go in a new
+# migration step, not in these definitions.
+
 # -------------------------------
 # USERS TABLE
 # -------------------------------
+# password_hash holds bcrypt's bytes, hence BLOB (user_service always stored bytes).
+USERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        password_hash BLOB NOT NULL,
+        role TEXT DEFAULT 'user',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
 def create_users_table(conn):
     """
     Create the users table if it doesn't exist.
     """
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            role TEXT DEFAULT 'user',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cursor.execute(USERS_TABLE_SQL)
     conn.commit()
     print("✅ Users table created successfully.")
 
@@ -27,23 +35,26 @@ def create_users_table(conn):
 # -------------------------------
 # CYBER INCIDENTS TABLE
 # -------------------------------
+CYBER_INCIDENTS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS cyber_incidents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        incident_type TEXT,
+        severity TEXT,
+        status TEXT,
+        description TEXT,
+        reported_by TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
 def create_cyber_incidents_table(conn):
     """
     Create the cyber_incidents table if it doesn't exist.
     """
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS cyber_incidents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT,
-            incident_type TEXT,
-            severity TEXT,
-            status TEXT,
-            description TEXT,
-            reported_by TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cursor.execute(CYBER_INCIDENTS_TABLE_SQL)
     conn.commit()
     print("✅ Cyber incidents table created successfully.")
 
@@ -51,23 +62,26 @@ def create_cyber_incidents_table(conn):
 # -------------------------------
 # DATASETS METADATA TABLE
 # -------------------------------
+DATASETS_METADATA_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS datasets_metadata (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dataset_name TEXT NOT NULL,
+        category TEXT,
+        source TEXT,
+        last_updated TEXT,
+        record_count INTEGER,
+        file_size_mb REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
 def create_datasets_metadata_table(conn):
     """
     Create the datasets_metadata table if it doesn't exist.
     """
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS datasets_metadata (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            dataset_name TEXT NOT NULL,
-            category TEXT,
-            source TEXT,
-            last_updated TEXT,
-            record_count INTEGER,
-            file_size_mb REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cursor.execute(DATASETS_METADATA_TABLE_SQL)
     conn.commit()
     print("✅ Datasets metadata table created successfully.")
 
@@ -75,39 +89,125 @@ def create_datasets_metadata_table(conn):
 # -------------------------------
 # IT TICKETS TABLE
 # -------------------------------
+IT_TICKETS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS it_tickets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_id TEXT UNIQUE NOT NULL,
+        priority TEXT,
+        status TEXT,
+        category TEXT,
+        subject TEXT NOT NULL,
+        description TEXT,
+        created_date TEXT,
+        resolved_date TEXT,
+        assigned_to TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
 def create_it_tickets_table(conn):
     """
     Create the it_tickets table if it doesn't exist.
     """
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS it_tickets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ticket_id TEXT UNIQUE NOT NULL,
-            priority TEXT,
-            status TEXT,
-            category TEXT,
-            subject TEXT NOT NULL,
-            description TEXT,
-            created_date TEXT,
-            resolved_date TEXT,
-            assigned_to TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cursor.execute(IT_TICKETS_TABLE_SQL)
     conn.commit()
     print("✅ IT tickets table created successfully.")
 
 
+# -------------------------------
+# SESSIONS TABLE
+# -------------------------------
+# Only a SHA-256 of each session token is stored, so a leaked database (or backup)
+# can't be replayed as live sessions. Times are UNIX timestamps (REAL).
+SESSIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        username TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_seen REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+
+SESSIONS_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username)",
+]
+
+
+def create_sessions_table(conn):
+    """
+    Create the sessions table and its indexes if they don't exist.
+    """
+    cursor = conn.cursor()
+    cursor.execute(SESSIONS_TABLE_SQL)
+    for ddl in SESSIONS_INDEXES_SQL:
+        cursor.execute(ddl)
+    conn.commit()
+    print("✅ Sessions table created successfully.")
+
+
+# -------------------------------
+# LOGIN ATTEMPTS TABLE
+# -------------------------------
+# One row per username with recent failed logins (see app/services/lockout.py).
+# failures/prev_failures count the current and previous window; times are UNIX timestamps.
+LOGIN_ATTEMPTS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS login_attempts (
+        username TEXT PRIMARY KEY,
+        failures INTEGER NOT NULL DEFAULT 0,
+        prev_failures INTEGER NOT NULL DEFAULT 0,
+        window_start REAL NOT NULL,
+        locked_until REAL NOT NULL DEFAULT 0,
+        last_failure REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+
+
+def create_login_attempts_table(conn):
+    """
+    Create the login_attempts table if it doesn't exist.
+    """
+    cursor = conn.cursor()
+    cursor.execute(LOGIN_ATTEMPTS_TABLE_SQL)
+    conn.commit()
+    print("✅ Login attempts table created successfully.")
+
+
+# -------------------------------
+# RATE LIMIT BUCKETS TABLE
+# -------------------------------
+# Token buckets shared between processes (see app/services/rate_limiter.py).
+RATE_LIMIT_BUCKETS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+        bucket_key TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+
+
+def create_rate_limit_buckets_table(conn):
+    """
+    Create the rate_limit_buckets table if it doesn't exist.
+    """
+    cursor = conn.cursor()
+    cursor.execute(RATE_LIMIT_BUCKETS_TABLE_SQL)
+    conn.commit()
+    print("✅ Rate limit buckets table created successfully.")
+
+
 # -------------------------------
 # CREATE ALL TABLES
 # -------------------------------
 def create_all_tables(conn):
     """
-    Create all tables in the database.
+    Bring the database up to the latest schema version (tables, indexes, ...).
+    Only pending migration steps run; an up-to-date database costs one PRAGMA read.
     """
-    create_users_table(conn)
-    create_cyber_incidents_table(conn)
-    create_datasets_metadata_table(conn)
-    create_it_tickets_table(conn)
-    print("✅ All tables created successfully.")
+    # imported here: migrations builds on the DDL in this module
+    from app.data.migrations import migrate
+    version = migrate(conn)
+    print(f"✅ All tables created successfully (schema v{version}).")
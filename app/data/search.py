@@ -0,0 +1,215 @@
+# app/data/search.py
+
+import sqlite3
+
+from app.data.cache import cached_query
+from app.data.db import connect_database
+
+# NOTE: each search index is an FTS5 table using its source table as external content
+# (content=..., content_rowid=id), so the text isn't stored twice. AFTER INSERT/UPDATE/
+# DELETE triggers keep the index in step with the source, the same way the summary
+# tables in aggregates.py are kept.
+#
+# If this SQLite build has no FTS5 the indexes are skipped and searches fall back to
+# LIKE scans with the same result shape.
+#
+# An index is described by:
+#   source  - the table it indexes
+#   columns - indexed text columns
+#   weights - bm25 weight per column (a match in a heavier column ranks higher)
+
+SEARCH_INDEXES = {
+    "cyber_incidents_fts": {
+        "source": "cyber_incidents",
+        "columns": ["description"],
+        "weights": [1.0],
+    },
+    "it_tickets_fts": {
+        "source": "it_tickets",
+        "columns": ["subject", "description"],
+        "weights": [2.0, 1.0],
+    },
+}
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+
+# -------------------------------
+# SQL GENERATION
+# -------------------------------
+def search_table_sql(name, spec):
+    """CREATE VIRTUAL TABLE statement for a search index."""
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+        f"{', '.join(spec['columns'])}, content='{spec['source']}', content_rowid='id', "
+        f"tokenize='porter unicode61')"
+    )
+
+
+def search_trigger_sql(name, spec):
+    """CREATE TRIGGER statements that keep a search index in step with its source."""
+    source = spec["source"]
+    cols = ", ".join(spec["columns"])
+    new_vals = ", ".join(f"NEW.{c}" for c in spec["columns"])
+    old_vals = ", ".join(f"OLD.{c}" for c in spec["columns"])
+    insert_new = f"INSERT INTO {name} (rowid, {cols}) VALUES (NEW.id, {new_vals});"
+    delete_old = f"INSERT INTO {name} ({name}, rowid, {cols}) VALUES ('delete', OLD.id, {old_vals});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {cols} ON {source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def search_query_sql(name, spec=None):
+    """
+    Ranked search query over an index. Parameters: highlight start, highlight end,
+    MATCH expression, limit, offset.
+    """
+    spec = spec or SEARCH_INDEXES[name]
+    weights = ", ".join(str(w) for w in spec["weights"])
+    return f"""
+        SELECT src.*,
+               snippet({name}, -1, ?, ?, '…', 12) AS snippet,
+               bm25({name}, {weights}) AS rank
+        FROM {name}
+        JOIN {spec["source"]} AS src ON src.id = {name}.rowid
+        WHERE {name} MATCH ?
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    """
+
+
+# -------------------------------
+# INSTALL / REBUILD
+# -------------------------------
+def fts5_available(conn):
+    """True if this SQLite build has the FTS5 extension."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def install_search_indexes(conn, indexes=None):
+    """
+    Create search indexes and triggers, then fill them from the source tables.
+    Does not commit (runs inside a schema migration step).
+    """
+    if not fts5_available(conn):
+        print("⚠ SQLite was built without FTS5; text search will use LIKE scans.")
+        return
+    for name, spec in (indexes or SEARCH_INDEXES).items():
+        for sql in [search_table_sql(name, spec)] + search_trigger_sql(name, spec):
+            conn.execute(sql)
+        conn.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+
+def rebuild_search_indexes(conn, indexes=None):
+    """
+    Rebuild search indexes from their source tables (e.g. after a bulk load with triggers off).
+    """
+    for name in (indexes or SEARCH_INDEXES):
+        if _has_index(conn, name):
+            conn.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+    conn.commit()
+    print("✔ Search indexes rebuilt.")
+
+
+def optimize_search_indexes(conn, indexes=None):
+    """Merge each index's b-trees into one (worth doing after large loads)."""
+    for name in (indexes or SEARCH_INDEXES):
+        if _has_index(conn, name):
+            conn.execute(f"INSERT INTO {name} ({name}) VALUES ('optimize')")
+    conn.commit()
+    print("✔ Search indexes optimized.")
+
+
+def _has_index(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+# -------------------------------
+# SEARCH
+# -------------------------------
+def _terms(query):
+    return [t for t in query.split() if t]
+
+
+def match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression: every word must appear, and the
+    last word also matches as a prefix (so "phish" finds "phishing").
+    Quoting each word keeps FTS5 operators and punctuation in user input harmless.
+    """
+    terms = ['"' + t.replace('"', '""') + '"' for t in _terms(query)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_table(conn, name, query, limit=DEFAULT_SEARCH_LIMIT, offset=0,
+                 highlight=("**", "**"), spec=None):
+    """
+    Ranked full-text search over a source table.
+
+    Args:
+        conn: sqlite3.Connection
+        name (str): search index name (key of SEARCH_INDEXES)
+        query (str): free text; every word must match
+        limit (int): page size (capped at MAX_SEARCH_LIMIT)
+        offset (int): rows to skip (the next_offset of the previous page)
+        highlight (tuple): markers put around matched words in the snippet
+
+    Returns:
+        tuple: (pd.DataFrame of source rows plus `snippet` and `rank`, best first;
+                next_offset or None when this is the last page)
+    """
+    spec = spec or SEARCH_INDEXES[name]
+    source = spec["source"]
+    limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+    offset = max(0, int(offset))
+    terms = _terms(query or "")
+    if not terms:
+        return cached_query(conn, source, f"SELECT *, '' AS snippet, 0.0 AS rank FROM {source} LIMIT 0"), None
+
+    if _has_index(conn, name):
+        sql = search_query_sql(name, spec)
+        params = (highlight[0], highlight[1], match_expression(query), limit + 1, offset)
+    else:
+        # Fallback: every word must appear in one of the columns
+        like = " AND ".join(
+            "(" + " OR ".join(f"src.{c} LIKE ?" for c in spec["columns"]) + ")" for _ in terms
+        )
+        first_col = spec["columns"][0]
+        sql = f"""
+            SELECT src.*, substr(src.{first_col}, 1, 80) AS snippet, 0.0 AS rank
+            FROM {source} AS src
+            WHERE {like}
+            ORDER BY src.id DESC
+            LIMIT ? OFFSET ?
+        """
+        params = tuple(f"%{t}%" for t in terms for _ in spec["columns"]) + (limit + 1, offset)
+
+    df = cached_query(conn, source, sql, params)
+    if len(df) > limit:
+        return df.iloc[:limit], offset + limit
+    return df, None
+
+
+if __name__ == "__main__":
+    # python -m app.data.search [rebuild|optimize]
+    import sys
+
+    conn = connect_database()
+    if len(sys.argv) > 1 and sys.argv[1] == "optimize":
+        optimize_search_indexes(conn)
+    else:
+        rebuild_search_indexes(conn)
+    conn.close()
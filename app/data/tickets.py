@@ -1,5 +1,16 @@
-import pandas as pd
+from app.data.cache import cached_query
 from app.data.db import connect_database
+from app.data.paging import DEFAULT_PAGE_SIZE, fetch_page
+from app.data.records import (
+    DEFAULT_BATCH_SIZE, Ticket, count_records, fetch_record_page, get_record, iter_records
+)
+from app.data.rollups import rollup_query
+from app.data.search import DEFAULT_SEARCH_LIMIT, search_table
+from app.data.unit_of_work import as_id_rows, as_rows, commit_write, unit_of_work
+
+# Analytics query, module level so the index advisor (app/data/indexes.py) can EXPLAIN it.
+# Reads the trigger-maintained summary table (app/data/aggregates.py).
+TICKETS_BY_STATUS_SQL = "SELECT status, count FROM ticket_status_counts ORDER BY count DESC"
 
 # -------------------------------
 # INSERT A TICKET
@@ -21,7 +32,7 @@ def insert_ticket(conn, issue, status="Open"):
         INSERT INTO it_tickets (issue, status)
         VALUES (?, ?)
     """, (issue, status))
-    conn.commit()
+    commit_write(conn, "it_tickets")
     return cur.lastrowid
 
 # -------------------------------
@@ -35,12 +46,109 @@ def get_all_tickets(conn):
         pd.DataFrame
     """
     try:
-        df = pd.read_sql_query("SELECT * FROM it_tickets ORDER BY id DESC", conn)
+        df = cached_query(conn, "it_tickets", "SELECT * FROM it_tickets ORDER BY id DESC")
         return df
     except Exception as e:
         print(f"Error retrieving tickets: {e}")
+        import pandas as pd
         return pd.DataFrame()
 
+# -------------------------------
+# LIST TICKETS (PAGINATED)
+# -------------------------------
+def list_tickets(conn, cursor=None, limit=DEFAULT_PAGE_SIZE, status=None, priority=None,
+                 category=None, assigned_to=None, date_from=None, date_to=None, columns=None):
+    """
+    Retrieve one page of tickets, newest first.
+
+    Args:
+        cursor (int, optional): next_cursor returned by the previous page
+        status, priority, category, assigned_to (str or list, optional): filters
+        date_from, date_to (str, optional): inclusive 'YYYY-MM-DD' range on created_date
+        columns (list, optional): columns to return (id is always included)
+
+    Returns:
+        tuple: (pd.DataFrame, next_cursor or None)
+    """
+    filters = {"status": status, "priority": priority, "category": category,
+               "assigned_to": assigned_to, "date_from": date_from, "date_to": date_to}
+    return fetch_page(conn, "it_tickets", filters, columns, cursor, limit)
+
+# -------------------------------
+# LIGHTWEIGHT ROWS (NO PANDAS)
+# -------------------------------
+def get_ticket(conn, ticket_id):
+    """
+    Fetch one ticket by id as a Ticket record (attribute access, e.g. .status).
+
+    Returns:
+        Ticket or None
+    """
+    return get_record(conn, Ticket, ticket_id)
+
+
+def iter_tickets(conn, status=None, priority=None, category=None,
+                 assigned_to=None, date_from=None, date_to=None,
+                 batch_size=DEFAULT_BATCH_SIZE, as_tuples=False):
+    """
+    Iterate over matching tickets in id order without building a DataFrame.
+    Memory stays at one batch of rows however many match.
+
+    Args:
+        conn: sqlite3.Connection
+        status, priority, category, assigned_to, date_from, date_to: as list_tickets
+        batch_size (int): rows fetched per round trip
+        as_tuples (bool): yield plain tuples instead of Ticket records
+
+    Usage:
+        for ticket in iter_tickets(conn, status="Open"):
+            print(ticket.ticket_id, ticket.subject)
+    """
+    filters = {"status": status, "priority": priority, "category": category,
+               "assigned_to": assigned_to, "date_from": date_from, "date_to": date_to}
+    return iter_records(conn, Ticket, filters, batch_size, as_tuples)
+
+
+def list_ticket_records(conn, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                        status=None, priority=None, category=None, assigned_to=None,
+                        date_from=None, date_to=None, as_tuples=False):
+    """
+    Record version of list_tickets: one keyset page, newest first.
+
+    Returns:
+        tuple: (list of Ticket records or tuples, next_cursor or None)
+    """
+    filters = {"status": status, "priority": priority, "category": category,
+               "assigned_to": assigned_to, "date_from": date_from, "date_to": date_to}
+    return fetch_record_page(conn, Ticket, filters, cursor, limit, as_tuples)
+
+
+def count_tickets(conn, status=None, priority=None, category=None,
+                  assigned_to=None, date_from=None, date_to=None):
+    """
+    Count matching tickets (served from the summary tables where the filters allow).
+
+    Returns:
+        int
+    """
+    filters = {"status": status, "priority": priority, "category": category,
+               "assigned_to": assigned_to, "date_from": date_from, "date_to": date_to}
+    return count_records(conn, "it_tickets", filters)
+
+# -------------------------------
+# SEARCH TICKETS
+# -------------------------------
+def search_tickets(conn, query, limit=DEFAULT_SEARCH_LIMIT, offset=0):
+    """
+    Full-text search over ticket subjects and descriptions, best matches first.
+    A match in the subject ranks above one in the description.
+
+    Returns:
+        tuple: (pd.DataFrame with the ticket columns plus snippet and rank,
+                next_offset or None)
+    """
+    return search_table(conn, "it_tickets_fts", query, limit, offset)
+
 # -------------------------------
 # UPDATE TICKET STATUS
 # -------------------------------
@@ -50,7 +158,7 @@ def update_ticket_status(conn, ticket_id, new_status):
     """
     cur = conn.cursor()
     cur.execute("UPDATE it_tickets SET status = ? WHERE id = ?", (new_status, ticket_id))
-    conn.commit()
+    commit_write(conn, "it_tickets")
     return cur.rowcount
 
 # -------------------------------
@@ -62,7 +170,64 @@ def delete_ticket(conn, ticket_id):
     """
     cur = conn.cursor()
     cur.execute("DELETE FROM it_tickets WHERE id = ?", (ticket_id,))
-    conn.commit()
+    commit_write(conn, "it_tickets")
+    return cur.rowcount
+
+# -------------------------------
+# BATCH WRITES
+# -------------------------------
+# Each batch is one executemany inside a unit_of_work: one commit, and a failure part-way
+# rolls the whole batch back (inside an enclosing unit_of_work, it joins that one).
+TICKET_COLUMNS = ("ticket_id", "priority", "status", "category", "subject",
+                  "description", "created_date", "resolved_date", "assigned_to")
+
+def insert_tickets(conn, records):
+    """
+    Insert many tickets in one transaction.
+
+    Args:
+        conn: sqlite3 connection
+        records: iterable of dicts keyed by TICKET_COLUMNS, or tuples in that order
+
+    Returns:
+        int: number of rows inserted
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(f"""
+            INSERT INTO it_tickets ({", ".join(TICKET_COLUMNS)})
+            VALUES ({", ".join(["?"] * len(TICKET_COLUMNS))})
+        """, as_rows(records, TICKET_COLUMNS))
+        commit_write(conn, "it_tickets")
+    return cur.rowcount
+
+def update_tickets_status(conn, ticket_ids, new_status):
+    """
+    Set the same status on many tickets in one transaction (e.g. bulk close).
+
+    Returns:
+        int: number of rows updated
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany(
+            "UPDATE it_tickets SET status = ? WHERE id = ?",
+            ((new_status, ticket_id) for ticket_id in ticket_ids)
+        )
+        commit_write(conn, "it_tickets")
+    return cur.rowcount
+
+def delete_tickets(conn, ticket_ids):
+    """
+    Delete many tickets in one transaction.
+
+    Returns:
+        int: number of rows deleted
+    """
+    with unit_of_work(conn):
+        cur = conn.cursor()
+        cur.executemany("DELETE FROM it_tickets WHERE id = ?", as_id_rows(ticket_ids))
+        commit_write(conn, "it_tickets")
     return cur.rowcount
 
 # -------------------------------
@@ -72,6 +237,45 @@ def count_tickets_by_status(conn):
     """
     Count tickets grouped by status.
     """
-    query = "SELECT status, COUNT(*) as count FROM it_tickets GROUP BY status ORDER BY count DESC"
-    df = pd.read_sql_query(query, conn)
-    return df
\ No newline at end of file
+    df = cached_query(conn, "it_tickets", TICKETS_BY_STATUS_SQL)
+    return df
+
+# -------------------------------
+# TRENDS
+# -------------------------------
+def get_ticket_trend(conn, bucket="day", start=None, end=None, group_by=None,
+                     priority=None, category=None, status=None):
+    """
+    Tickets created over time, from the daily rollup.
+
+    Args:
+        bucket (str): 'day', 'week' or 'month'
+        start, end (str, optional): inclusive 'YYYY-MM-DD' range on created_date
+        group_by (str or list, optional): 'priority', 'category' and/or 'status'
+        priority, category, status (str or list, optional): filters
+
+    Returns:
+        pd.DataFrame: period, [group_by columns], count
+    """
+    filters = {"priority": priority, "category": category, "status": status}
+    return rollup_query(conn, "ticket_daily_counts", bucket, start, end, group_by, filters)
+
+def get_mean_time_to_resolution(conn, bucket="month", start=None, end=None, group_by=None,
+                                priority=None, category=None):
+    """
+    Mean time to resolution (in days) of tickets resolved in each period.
+
+    Args:
+        bucket (str): 'day', 'week' or 'month' (by resolved_date)
+        start, end (str, optional): inclusive 'YYYY-MM-DD' range on resolved_date
+        group_by (str or list, optional): 'priority' and/or 'category'
+        priority, category (str or list, optional): filters
+
+    Returns:
+        pd.DataFrame: period, [group_by columns], count (tickets resolved), mttr_days
+    """
+    filters = {"priority": priority, "category": category}
+    return rollup_query(
+        conn, "ticket_daily_resolutions", bucket, start, end, group_by, filters,
+        measures=["ROUND(SUM(resolution_days) / SUM(count), 2) AS mttr_days"]
+    )
@@ -0,0 +1,96 @@
+# app/data/unit_of_work.py
+
+import threading
+from contextlib import contextmanager
+
+from app.data.cache import invalidate_table
+
+# NOTE: the data-layer write functions commit through `commit_write`. Outside a unit of
+# work that commits straight away (one fsync per call, as before). Inside one, the commit
+# and the cache invalidation are deferred to the end of the block, so
+#
+#     with unit_of_work(conn):
+#         for ticket_id in ids:
+#             update_ticket_status(conn, ticket_id, "Closed")
+#
+# is a single transaction, and a failure part-way rolls all of it back.
+
+_active = {}  # id(conn) -> {"depth": int, "tables": set}
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def unit_of_work(conn):
+    """
+    Group data-layer writes on `conn` into one transaction.
+    Commits when the block exits normally, rolls back if it raises. Nested blocks join
+    the outermost one.
+    """
+    key = id(conn)
+    with _active_lock:
+        state = _active.setdefault(key, {"depth": 0, "tables": set()})
+        state["depth"] += 1
+        outermost = state["depth"] == 1
+    try:
+        yield conn
+    except BaseException:
+        if outermost:
+            conn.rollback()
+        raise
+    else:
+        if outermost:
+            conn.commit()
+    finally:
+        with _active_lock:
+            state["depth"] -= 1
+            if outermost:
+                del _active[key]
+        if outermost:
+            # After commit (or rollback): reads on this connection inside the block
+            # may have cached uncommitted rows.
+            for table in state["tables"]:
+                invalidate_table(conn, table)
+
+
+def in_unit_of_work(conn):
+    """True if `conn` is inside a unit_of_work block."""
+    with _active_lock:
+        return id(conn) in _active
+
+
+def commit_write(conn, table):
+    """
+    Commit a write to `table` and drop its cached results, or defer both to the end of
+    the enclosing unit_of_work.
+    """
+    with _active_lock:
+        state = _active.get(id(conn))
+        if state is not None:
+            state["tables"].add(table)
+            return
+    conn.commit()
+    invalidate_table(conn, table)
+
+
+# -------------------------------
+# BATCH HELPERS
+# -------------------------------
+def as_rows(records, columns):
+    """
+    Yield parameter tuples from records given as dicts or sequences.
+    Dict keys missing from a record, and trailing sequence items left out, become None.
+    """
+    for record in records:
+        if isinstance(record, dict):
+            yield tuple(record.get(c) for c in columns)
+        else:
+            values = tuple(record)
+            if len(values) > len(columns):
+                raise ValueError(f"Expected at most {len(columns)} values, got {len(values)}")
+            yield values + (None,) * (len(columns) - len(values))
+
+
+def as_id_rows(ids):
+    """Yield (id,) parameter tuples for executemany."""
+    for record_id in ids:
+        yield (record_id,)
@@ -1,8 +1,8 @@
 # app/services/users.py
 
 import sqlite3
-import bcrypt
 from app.data.db import connect_database
+from app.services.password_policy import get_password_policy
 
 # -------------------------------
 # REGISTER USER
@@ -23,7 +23,7 @@ def register_user(conn, username, password, role="user"):
     try:
         cursor = conn.cursor()
         # Hash password
-        password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+        password_hash = get_password_policy().hash(password)
         cursor.execute(
             """
             INSERT INTO users (username, password_hash, role)
@@ -60,10 +60,17 @@ def login_user(conn, username, password):
         return False, "Username not found."
     
     password_hash = row[0]
-    if bcrypt.checkpw(password.encode("utf-8"), password_hash):
-        return True, "Login successful."
-    else:
+    policy = get_password_policy()
+    if not policy.verify(password, password_hash):
         return False, "Incorrect password."
+    if policy.needs_rehash(password_hash):
+        # Upgrade the stored cost; compare-and-swap on the old hash
+        cursor.execute(
+            "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+            (policy.hash(password), username, password_hash)
+        )
+        conn.commit()
+    return True, "Login successful."
 
 # -------------------------------
 # MIGRATE USERS FROM FILE
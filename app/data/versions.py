@@ -0,0 +1,212 @@
+# app/data/versions.py
+
+from app.data.db import connect_database
+
+# NOTE: every write to a versioned table bumps its counter in `table_versions` and
+# records the row in `row_changes` (one row per source row: the version of its latest
+# change and whether that change was a delete). Both are maintained by triggers, so
+# writes from any code path or process are seen, not only the data-layer functions.
+#
+#     version = get_table_version(conn, "cyber_incidents")
+#     ...
+#     delta = changed_since(conn, "cyber_incidents", version)
+#     # delta["rows"]: inserted/updated rows, delta["deleted"]: ids, delta["version"]: new mark
+#
+# Tombstones of deleted rows are kept until `compact_changes` drops them; a caller whose
+# mark is older than the compaction point gets a full snapshot instead of a delta.
+
+VERSIONED_TABLES = ["cyber_incidents", "it_tickets", "datasets_metadata"]
+
+TABLE_VERSIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        compacted_version INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+"""
+
+ROW_CHANGES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS row_changes (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (table_name, row_id)
+    ) WITHOUT ROWID
+"""
+
+ROW_CHANGES_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_row_changes_version ON row_changes (table_name, version)"
+)
+
+
+# -------------------------------
+# SQL GENERATION
+# -------------------------------
+def version_trigger_sql(table):
+    """CREATE TRIGGER statements that version a table's writes."""
+    # An UPSERT rather than INSERT OR REPLACE: a conflict policy inside a trigger is
+    # overridden by the outer statement's, so OR REPLACE turned into ABORT whenever the
+    # write came from an INSERT ... ON CONFLICT DO UPDATE (e.g. the CSV reconcile).
+    def record(row, deleted):
+        return (
+            f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; "
+            f"INSERT INTO row_changes (table_name, row_id, version, deleted) "
+            f"SELECT '{table}', {row}.id, version, {deleted} FROM table_versions "
+            f"WHERE table_name = '{table}' "
+            f"ON CONFLICT (table_name, row_id) DO UPDATE SET "
+            f"version = excluded.version, deleted = excluded.deleted;"
+        )
+
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_ai AFTER INSERT ON {table} "
+        f"BEGIN {record('NEW', 0)} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_au AFTER UPDATE ON {table} "
+        f"BEGIN {record('NEW', 0)} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_ad AFTER DELETE ON {table} "
+        f"BEGIN {record('OLD', 1)} END",
+    ]
+
+
+def install_versioning(conn, tables=None):
+    """
+    Create the version tables and triggers.
+    Does not commit (runs inside a schema migration step).
+    """
+    conn.execute(TABLE_VERSIONS_TABLE_SQL)
+    conn.execute(ROW_CHANGES_TABLE_SQL)
+    conn.execute(ROW_CHANGES_INDEX_SQL)
+    for table in tables or VERSIONED_TABLES:
+        conn.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+        for sql in version_trigger_sql(table):
+            conn.execute(sql)
+
+
+def reinstall_version_triggers(conn, tables=None):
+    """
+    Drop and recreate the version triggers (after their SQL changes).
+    Does not commit (runs inside a schema migration step).
+    """
+    for table in tables or VERSIONED_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {table}_version_{suffix}")
+        for sql in version_trigger_sql(table):
+            conn.execute(sql)
+
+
+# -------------------------------
+# READS
+# -------------------------------
+def get_table_version(conn, table):
+    """
+    Current version of a table (bumped by every insert, update and delete).
+
+    Returns:
+        int or None: None if the table isn't versioned
+    """
+    row = conn.execute("SELECT version FROM table_versions WHERE table_name = ?", (table,)).fetchone()
+    return row[0] if row else None
+
+
+def get_table_versions(conn):
+    """Versions of every versioned table: {table: version}."""
+    return dict(conn.execute("SELECT table_name, version FROM table_versions"))
+
+
+def changed_since(conn, table, version, columns=None):
+    """
+    Rows of a table changed after `version`.
+
+    Args:
+        conn: sqlite3.Connection
+        table (str): a versioned table
+        version (int or None): the `version` of the previous call (None or 0 for everything)
+        columns (list, optional): columns to return (id is always included)
+
+    Returns:
+        dict:
+            version - pass this to the next call
+            rows    - pd.DataFrame of rows inserted or updated since `version`
+            deleted - list of ids deleted since `version`
+            full    - True if `rows` is a full snapshot (first call, or the caller's
+                      version predates the last compaction); replace, don't merge
+    """
+    if table not in VERSIONED_TABLES:
+        raise ValueError(f"{table} is not versioned. Versioned tables: {VERSIONED_TABLES}")
+    # imported here: pandas is only loaded once a DataFrame is actually needed
+    import pandas as pd
+    select = "src.*" if not columns else ", ".join(
+        "src." + c for c in ["id"] + [c for c in columns if c != "id"]
+    )
+
+    # One read transaction, so the version matches the rows returned
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        current, compacted = conn.execute(
+            "SELECT version, compacted_version FROM table_versions WHERE table_name = ?", (table,)
+        ).fetchone()
+        full = not version or version < compacted
+        if full:
+            rows = pd.read_sql_query(f"SELECT {select} FROM {table} AS src ORDER BY src.id", conn)
+            deleted = []
+        else:
+            rows = pd.read_sql_query(
+                f"SELECT {select} FROM row_changes AS rc JOIN {table} AS src ON src.id = rc.row_id "
+                f"WHERE rc.table_name = ? AND rc.version > ? AND rc.deleted = 0 ORDER BY src.id",
+                conn, params=(table, version)
+            )
+            deleted = [r[0] for r in conn.execute(
+                "SELECT row_id FROM row_changes WHERE table_name = ? AND version > ? AND deleted = 1 "
+                "ORDER BY row_id",
+                (table, version)
+            )]
+    finally:
+        if own_transaction:
+            conn.commit()
+    return {"version": current, "rows": rows, "deleted": deleted, "full": full}
+
+
+# -------------------------------
+# MAINTENANCE
+# -------------------------------
+def compact_changes(conn, table=None, keep_versions=0):
+    """
+    Drop tombstones of deleted rows, keeping the last `keep_versions` versions' worth.
+    Callers holding an older version get a full snapshot on their next changed_since.
+
+    Returns:
+        int: tombstones removed
+    """
+    removed = 0
+    for name in [table] if table else VERSIONED_TABLES:
+        current = get_table_version(conn, name)
+        if current is None:
+            continue
+        cutoff = max(0, current - keep_versions)
+        cur = conn.execute(
+            "DELETE FROM row_changes WHERE table_name = ? AND deleted = 1 AND version <= ?",
+            (name, cutoff)
+        )
+        conn.execute(
+            "UPDATE table_versions SET compacted_version = MAX(compacted_version, ?) WHERE table_name = ?",
+            (cutoff, name)
+        )
+        removed += cur.rowcount
+    conn.commit()
+    print(f"✔ Removed {removed} change tombstones.")
+    return removed
+
+
+if __name__ == "__main__":
+    # python -m app.data.versions [compact]
+    import sys
+
+    conn = connect_database()
+    if len(sys.argv) > 1 and sys.argv[1] == "compact":
+        compact_changes(conn)
+    else:
+        for name, current in get_table_versions(conn).items():
+            print(f"{name:<25} v{current}")
+    conn.close()
@@ -0,0 +1,153 @@
+# app/services/credential_store.py
+
+import os
+import threading
+
+# NOTE: users.txt stays the source of truth and keeps its "username,hash" format.
+# The store only keeps an in-memory index of it so lookups don't rescan the file.
+
+
+class CredentialStore:
+    """
+    In-memory hash index over a users.txt credential file.
+
+    - The file is parsed once and indexed by username (dict lookups are O(1)).
+    - Appends made through `add`/`update` write the line and update the index in place.
+    - If the file's mtime or size changes behind our back (another process, manual edit),
+      the index is rebuilt on the next lookup.
+    - When a username appears on several lines, the last line wins, so an update can be
+      recorded by appending without rewriting the file.
+    """
+
+    def __init__(self, file_path="users.txt"):
+        # Absolute, so a later chdir can't point the same store at another file
+        self.file_path = os.path.abspath(file_path)
+        self._index = {}
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def _stat_signature(self):
+        """Return (mtime_ns, size) for the file, or None if it doesn't exist."""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _reload(self, signature):
+        index = {}
+        if signature is not None:
+            with open(self.file_path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or "," not in line:
+                        continue
+                    stored_user, stored_hash = line.split(",", 1)
+                    index[stored_user] = stored_hash
+        self._index = index
+        self._signature = signature
+
+    def refresh(self):
+        """Rebuild the index if the file changed since it was last read."""
+        with self._lock:
+            signature = self._stat_signature()
+            if signature != self._signature:
+                self._reload(signature)
+
+    def exists(self, username):
+        """
+        Check whether a username is present.
+
+        Args:
+            username (str): The username to check.
+
+        Returns:
+            bool: True if the user exists, False otherwise.
+        """
+        with self._lock:
+            self.refresh()
+            return username in self._index
+
+    def get_hash(self, username):
+        """
+        Look up the stored hash for a username.
+
+        Returns:
+            str or None: The stored hash string, or None if the user is unknown.
+        """
+        with self._lock:
+            self.refresh()
+            return self._index.get(username)
+
+    def _append(self, username, hashed):
+        line = f"{username},{hashed}\n".encode("utf-8")
+        before = self._stat_signature()
+        with open(self.file_path, "ab") as f:
+            f.write(line)
+        after = self._stat_signature()
+        # Only our line was added if the file was as we last read it and grew by exactly
+        # our bytes; then record the new (mtime, size) as seen. Otherwise another process
+        # appended too, and its lines are picked up by reloading (ours included).
+        before_size = before[1] if before else 0
+        if before == self._signature and after is not None and after[1] == before_size + len(line):
+            self._index[username] = hashed
+            self._signature = after
+        else:
+            self._reload(after)
+
+    def add(self, username, hashed):
+        """
+        Append a new credential line and index it.
+
+        Args:
+            username (str): The username for the new account.
+            hashed (str): The password hash (already decoded to str).
+
+        Returns:
+            bool: True if added, False if the username already exists.
+        """
+        with self._lock:
+            self.refresh()
+            if username in self._index:
+                return False
+            self._append(username, hashed)
+            return True
+
+    def update(self, username, hashed):
+        """
+        Record a new hash for an existing user by appending a line (last line wins).
+
+        Returns:
+            bool: True if updated, False if the username is unknown.
+        """
+        with self._lock:
+            self.refresh()
+            if username not in self._index:
+                return False
+            self._append(username, hashed)
+            return True
+
+    def __len__(self):
+        with self._lock:
+            self.refresh()
+            return len(self._index)
+
+
+# -------------------------------
+# SHARED STORES
+# -------------------------------
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_credential_store(file_path="users.txt"):
+    """
+    Return the process-wide CredentialStore for a file path, creating it on first use.
+    """
+    key = os.path.abspath(file_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = CredentialStore(key)
+            _stores[key] = store
+        return store
@@ -0,0 +1,151 @@
+# app/services/hash_executor.py
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.password_policy import get_password_policy
+
+# NOTE: bcrypt releases the GIL while hashing, so a thread pool is enough to spread
+# hashing over several cores without the pickling overhead of a process pool.
+
+DEFAULT_MAX_CONCURRENT_HASHES = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_QUEUED = 256
+
+
+class HashExecutor:
+    """
+    Bounded executor for CPU-bound password hashing work.
+
+    - At most `max_concurrent` jobs run at once (one worker thread each).
+    - At most `max_queued` further jobs may wait; `submit` blocks (backpressure) once the
+      queue is full, or raises RuntimeError after `timeout` seconds if one is given.
+    - `metrics()` reports queue depth, in-flight jobs and totals.
+    """
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT_HASHES, max_queued=DEFAULT_MAX_QUEUED):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="hash")
+        self._slots = threading.BoundedSemaphore(max_concurrent + max_queued)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            self._slots.release()
+        return result
+
+    def submit(self, fn, *args, timeout=None, **kwargs):
+        """
+        Schedule fn(*args, **kwargs) on the hashing pool.
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise RuntimeError("Hashing queue is full.")
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        try:
+            return self._pool.submit(self._run, fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on the hashing pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        # Acquiring a slot may block, so do it off the event loop too
+        future = await loop.run_in_executor(None, lambda: self.submit(fn, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    def metrics(self):
+        """
+        Return a snapshot of executor metrics.
+
+        Returns:
+            dict: queue_depth, running, submitted, completed, failed, max_queue_depth,
+                  max_concurrent, max_queued
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "max_queue_depth": self._max_queue_depth,
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+            }
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+# -------------------------------
+# SHARED EXECUTOR
+# -------------------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hash_executor():
+    """Return the process-wide HashExecutor, creating it with defaults on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = HashExecutor()
+        return _executor
+
+
+def configure_hash_executor(max_concurrent=DEFAULT_MAX_CONCURRENT_HASHES, max_queued=DEFAULT_MAX_QUEUED):
+    """
+    Replace the process-wide HashExecutor with one using the given limits.
+    The previous executor finishes its queued work in the background.
+    """
+    global _executor
+    with _executor_lock:
+        old = _executor
+        _executor = HashExecutor(max_concurrent=max_concurrent, max_queued=max_queued)
+    if old is not None:
+        old.shutdown(wait=False)
+    return _executor
+
+
+# -------------------------------
+# HASH / VERIFY HELPERS
+# -------------------------------
+def hash_password_future(password):
+    """Hash a plaintext password on the hashing pool. Returns a Future of bytes."""
+    return get_hash_executor().submit(get_password_policy().hash, password)
+
+
+def verify_password_future(password, password_hash):
+    """Check a password against a stored hash on the hashing pool. Returns a Future of bool."""
+    return get_hash_executor().submit(get_password_policy().verify, password, password_hash)
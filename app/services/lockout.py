@@ -0,0 +1,172 @@
+# app/services/lockout.py
+
+import math
+import threading
+import time
+
+from app.data.migrations import ensure_schema
+from app.data.unit_of_work import commit_write
+
+# NOTE: failed logins are counted per username in the `login_attempts` table (schema
+# migration 9) with a single UPSERT, so concurrent attempts from several threads or
+# processes can't lose an increment, and nothing is read or rewritten beyond one row.
+#
+# The count is a sliding window estimate: failures in the current window plus the
+# previous window's failures weighted by how much of it still overlaps the last
+# `window` seconds. That avoids the burst a fixed window allows at its boundary.
+#
+# Locks are lifted lazily: nothing runs when a lock expires, `locked_for` just stops
+# reporting it.
+
+DEFAULT_MAX_FAILURES = 5
+DEFAULT_WINDOW = 15 * 60  # seconds
+DEFAULT_LOCKOUT = 5 * 60  # seconds
+
+# Rolls the row into the current window and counts one more failure.
+# (In DO UPDATE, bare column names are the row's values before the update.)
+_RECORD_FAILURE_SQL = """
+    INSERT INTO login_attempts (username, failures, prev_failures, window_start, locked_until, last_failure)
+    VALUES (:username, 1, 0, :now, 0, :now)
+    ON CONFLICT (username) DO UPDATE SET
+        prev_failures = CASE
+            WHEN :now >= window_start + 2 * :window THEN 0
+            WHEN :now >= window_start + :window THEN failures
+            ELSE prev_failures END,
+        failures = CASE
+            WHEN :now >= window_start + :window THEN 1
+            ELSE failures + 1 END,
+        window_start = CASE
+            WHEN :now >= window_start + 2 * :window THEN :now
+            WHEN :now >= window_start + :window THEN window_start + :window
+            ELSE window_start END,
+        last_failure = :now
+    RETURNING failures, prev_failures, window_start
+"""
+
+
+class LockoutPolicy:
+    """
+    Account lockout after repeated failed logins.
+
+    - An account is locked for `lockout` seconds once it has `max_failures` failures
+      within a sliding `window` seconds.
+    - A successful login clears the count.
+
+    Methods take the connection to use, like the user_service functions.
+    """
+
+    def __init__(self, max_failures=DEFAULT_MAX_FAILURES, window=DEFAULT_WINDOW, lockout=DEFAULT_LOCKOUT):
+        if max_failures < 1:
+            raise ValueError("max_failures must be at least 1")
+        self.max_failures = max_failures
+        self.window = window
+        self.lockout = lockout
+
+    def locked_for(self, conn, username, now=None):
+        """
+        Seconds until `username` may try again (0 if it isn't locked).
+        """
+        ensure_schema(conn)
+        now = time.time() if now is None else now
+        row = conn.execute(
+            "SELECT locked_until FROM login_attempts WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None or row[0] <= now:
+            return 0
+        return row[0] - now
+
+    def record_failure(self, conn, username, now=None):
+        """
+        Count a failed login and lock the account if it crossed the threshold.
+        Commits.
+
+        Returns:
+            float: seconds the account is now locked for (0 if not locked)
+        """
+        ensure_schema(conn)
+        now = time.time() if now is None else now
+        try:
+            failures, prev_failures, window_start = conn.execute(
+                _RECORD_FAILURE_SQL, {"username": username, "now": now, "window": self.window}
+            ).fetchone()
+            overlap = max(0.0, 1.0 - (now - window_start) / self.window)
+            if failures + prev_failures * overlap >= self.max_failures:
+                # Start the lock with a clean count, so unlocking gives a fresh set of attempts
+                conn.execute(
+                    "UPDATE login_attempts SET locked_until = ?, failures = 0, prev_failures = 0, "
+                    "window_start = ? WHERE username = ?",
+                    (now + self.lockout, now, username)
+                )
+                locked = self.lockout
+            else:
+                locked = 0
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return locked
+
+    def record_success(self, conn, username):
+        """
+        Clear the failure count after a successful login. Commits if there was one
+        (or leaves the commit to the enclosing unit_of_work).
+        """
+        ensure_schema(conn)
+        # Check first: the usual success has no row, and a DELETE would open a write
+        # transaction (holding the database lock) even when it matches nothing
+        if conn.execute("SELECT 1 FROM login_attempts WHERE username = ?", (username,)).fetchone():
+            conn.execute("DELETE FROM login_attempts WHERE username = ?", (username,))
+            commit_write(conn, "login_attempts")
+
+    def unlock(self, conn, username):
+        """Lift a lock early (admin action). Commits."""
+        self.record_success(conn, username)
+
+    def purge(self, conn, now=None):
+        """
+        Delete rows that no longer affect anything (no lock, both windows over).
+        Commits.
+
+        Returns:
+            int: rows deleted
+        """
+        ensure_schema(conn)
+        now = time.time() if now is None else now
+        cur = conn.execute(
+            "DELETE FROM login_attempts WHERE locked_until <= ? AND window_start + 2 * ? <= ?",
+            (now, self.window, now)
+        )
+        conn.commit()
+        return cur.rowcount
+
+
+def format_lockout(seconds):
+    """Human-readable message for a locked account."""
+    return f"Account locked. Try again in {math.ceil(seconds)} seconds."
+
+
+# -------------------------------
+# SHARED POLICY
+# -------------------------------
+_policy = LockoutPolicy()
+_policy_lock = threading.Lock()
+
+
+def get_lockout_policy():
+    """Return the process-wide LockoutPolicy."""
+    return _policy
+
+
+def set_lockout_policy(policy=None, **settings):
+    """
+    Replace the process-wide lockout policy.
+
+    Usage:
+        set_lockout_policy(max_failures=3, lockout=600)
+    """
+    global _policy
+    if policy is None:
+        policy = LockoutPolicy(**settings)
+    with _policy_lock:
+        _policy = policy
+    return _policy
@@ -0,0 +1,240 @@
+# app/services/page_data.py
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from app.data.datasets import count_datasets_by_category
+from app.data.db import DB_PATH
+from app.data.incidents import (
+    get_high_severity_by_status,
+    get_incident_trend,
+    get_incidents_by_type_count,
+    list_incidents,
+    search_incidents,
+)
+from app.data.migrations import ensure_schema
+from app.data.router import get_router
+from app.data.tickets import (
+    count_tickets_by_status,
+    get_mean_time_to_resolution,
+    get_ticket_trend,
+    list_tickets,
+    search_tickets,
+)
+from app.data.versions import changed_since, get_table_version
+from app.services.session_store import get_session_store
+
+try:
+    import streamlit as st
+except ImportError:  # the provider also works outside Streamlit (scripts, tests)
+    st = None
+
+# NOTE: the Streamlit pages (Home.py, pages/*.py) get all their data from here, so a
+# rerun never opens a connection or runs a query it doesn't need:
+#
+#   - the read/write router (app/data/router.py) is created once per server process
+#     (st.cache_resource), and the schema is checked once with it;
+#   - query results are cached with st.cache_data under (query, arguments, table
+#     version). Any write bumps the table's version (from this process or another),
+#     so the next rerun misses and reloads; otherwise a rerun costs one primary-key
+#     lookup per table it shows;
+#   - pages only call a loader when its panel is shown (see lazy_panel).
+#
+# Without Streamlit installed, both caches fall back to in-process equivalents.
+
+DATA_CACHE_ENTRIES = 512
+
+
+# -------------------------------
+# CACHE DECORATORS
+# -------------------------------
+def _resource_fallback(fn):
+    lock = threading.Lock()
+    created = {}
+
+    @wraps(fn)
+    def wrapper(*args):
+        with lock:
+            if args not in created:
+                created[args] = fn(*args)
+            return created[args]
+
+    wrapper.clear = created.clear
+    return wrapper
+
+
+def _copy(value):
+    # Callers get their own copy, as with st.cache_data
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value.copy() if hasattr(value, "copy") else value
+
+
+def _data_fallback(max_entries):
+    def decorator(fn):
+        lock = threading.Lock()
+        entries = OrderedDict()
+
+        @wraps(fn)
+        def wrapper(*args):
+            with lock:
+                if args in entries:
+                    entries.move_to_end(args)
+                    return _copy(entries[args])
+            value = fn(*args)
+            with lock:
+                entries[args] = value
+                while len(entries) > max_entries:
+                    entries.popitem(last=False)
+            return _copy(value)
+
+        wrapper.clear = entries.clear
+        return wrapper
+    return decorator
+
+
+if st is not None:
+    cache_resource = st.cache_resource
+    cache_data = st.cache_data(max_entries=DATA_CACHE_ENTRIES, show_spinner=False)
+else:
+    cache_resource = _resource_fallback
+    cache_data = _data_fallback(DATA_CACHE_ENTRIES)
+
+
+# -------------------------------
+# SHARED RESOURCES
+# -------------------------------
+@cache_resource
+def data_router(db_path=str(DB_PATH)):
+    """
+    The process-wide ReadWriteRouter for the pages, with the schema brought up to date.
+    """
+    router = get_router(db_path)
+    router.write(ensure_schema)
+    return router
+
+
+def table_version(table, db_path=str(DB_PATH)):
+    """
+    Current version of a table; cached page data is keyed by it.
+    """
+    return data_router(db_path).read(get_table_version, table)
+
+
+# -------------------------------
+# LOADERS
+# -------------------------------
+# name -> (table whose version keys the result, data-layer function)
+LOADERS = {
+    "incident_types": ("cyber_incidents", get_incidents_by_type_count),
+    "high_severity_by_status": ("cyber_incidents", get_high_severity_by_status),
+    "incident_trend": ("cyber_incidents", get_incident_trend),
+    "incidents_page": ("cyber_incidents", list_incidents),
+    "incident_search": ("cyber_incidents", search_incidents),
+    "ticket_status": ("it_tickets", count_tickets_by_status),
+    "ticket_trend": ("it_tickets", get_ticket_trend),
+    "ticket_mttr": ("it_tickets", get_mean_time_to_resolution),
+    "tickets_page": ("it_tickets", list_tickets),
+    "ticket_search": ("it_tickets", search_tickets),
+    "dataset_categories": ("datasets_metadata", count_datasets_by_category),
+}
+
+
+@cache_data
+def _load(name, version, db_path, args, kwargs):
+    # `version` is only part of the cache key
+    _, fn = LOADERS[name]
+    return data_router(db_path).read(fn, *args, **dict(kwargs))
+
+
+def load(name, *args, db_path=str(DB_PATH), **kwargs):
+    """
+    Run a LOADERS entry through the page cache.
+
+    Usage:
+        df = load("incident_trend", "month", group_by="severity")
+        page, next_cursor = load("incidents_page", cursor, 50, severity="High")
+    """
+    table, _ = LOADERS[name]
+    # Lists become tuples so the arguments can be part of the cache key
+    args = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+    kwargs = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items()))
+    return _load(name, table_version(table, db_path), db_path, args, kwargs)
+
+
+def write(fn, *args, db_path=str(DB_PATH), **kwargs):
+    """
+    Run a data-layer write on the router's writer connection.
+    The write bumps the table version, so pages reload what it changed.
+    """
+    return data_router(db_path).write(fn, *args, **kwargs)
+
+
+def poll_changes(table, version, db_path=str(DB_PATH)):
+    """
+    Rows of `table` changed since `version` (see versions.changed_since), for panels
+    that keep their own copy and only want deltas.
+    """
+    return data_router(db_path).read(changed_since, table, version)
+
+
+def clear_page_caches():
+    """Drop cached page data (the router is kept)."""
+    _load.clear()
+
+
+# -------------------------------
+# LAZY PANELS
+# -------------------------------
+def lazy_panel(title, render, key=None, default=False):
+    """
+    Show a titled panel whose contents only load when the user switches it on.
+
+    Args:
+        title (str): panel title
+        render (callable): draws the panel (and calls the loaders it needs)
+        key (str, optional): widget key (defaults to the title)
+        default (bool): whether the panel starts switched on
+
+    Returns:
+        bool: whether the panel was rendered on this run
+    """
+    with st.container(border=True):
+        shown = st.toggle(title, value=default, key=key or f"panel:{title}")
+        if shown:
+            render()
+    return shown
+
+
+# -------------------------------
+# SESSION CHECK
+# -------------------------------
+def current_user():
+    """Username of the logged-in session, or None (validates the stored token)."""
+    token = st.session_state.get("session_token")
+    return get_session_store().validate(token) if token else None
+
+
+def client_id():
+    """
+    Identifier of the browser client, used as the login rate limiter's `source`:
+    its IP address, or the Streamlit session id where no address is available
+    (st.context.ip_address is None for localhost).
+    """
+    ip_address = getattr(getattr(st, "context", None), "ip_address", None)
+    if ip_address:
+        return f"ip:{ip_address}"
+    # imported here: internal Streamlit module, only needed for the fallback
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return f"session:{ctx.session_id}" if ctx else None
+
+
+def require_login():
+    """Stop the page with a notice unless a user is logged in; returns the username."""
+    username = current_user()
+    if username is None:
+        st.warning("⚠ Please log in on the Home page first.")
+        st.stop()
+    return username
@@ -0,0 +1,120 @@
+# app/services/password_policy.py
+
+import threading
+import time
+
+import bcrypt
+
+# bcrypt's own default cost; each extra round doubles the hashing time.
+DEFAULT_ROUNDS = 12
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+class PasswordPolicy:
+    """
+    Central bcrypt settings for every place that hashes or checks a password.
+
+    - `rounds` is the cost factor used for new hashes.
+    - `needs_rehash` tells login code when a stored hash was made with a different cost,
+      so it can be transparently upgraded (or lowered) once the password is known.
+    """
+
+    def __init__(self, rounds=DEFAULT_ROUNDS):
+        if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"bcrypt rounds must be between {MIN_ROUNDS} and {MAX_ROUNDS}")
+        self.rounds = rounds
+
+    def hash(self, password):
+        """Hash a plaintext password with the policy's cost. Returns bytes."""
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds))
+
+    def verify(self, password, password_hash):
+        """Check a plaintext password against a stored hash (bytes or str)."""
+        if isinstance(password_hash, str):
+            password_hash = password_hash.encode("utf-8")
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash)
+
+    @staticmethod
+    def rounds_of(password_hash):
+        """
+        Read the cost factor from a stored hash ("$2b$12$..." -> 12).
+
+        Returns:
+            int or None: None if the hash isn't in modular crypt format.
+        """
+        if isinstance(password_hash, bytes):
+            password_hash = password_hash.decode("utf-8", errors="ignore")
+        parts = password_hash.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def needs_rehash(self, password_hash):
+        """True if the stored hash was made with a cost other than the policy's."""
+        return self.rounds_of(password_hash) != self.rounds
+
+
+# -------------------------------
+# CALIBRATION
+# -------------------------------
+def measure_verify_time(rounds, samples=3):
+    """Return the median seconds taken by one bcrypt check at the given cost."""
+    password = b"calibration-password"
+    password_hash = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.checkpw(password, password_hash)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate_rounds(target_ms=250, min_rounds=10, max_rounds=16, samples=3):
+    """
+    Pick the highest cost whose verification time stays within target_ms on this machine.
+
+    Each extra round doubles the cost, so we stop as soon as one exceeds the target.
+    Never returns less than min_rounds, even on a slow machine.
+
+    Returns:
+        tuple: (rounds: int, timings: dict of rounds -> milliseconds)
+    """
+    chosen = min_rounds
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = measure_verify_time(rounds, samples) * 1000
+        timings[rounds] = round(elapsed_ms, 2)
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+# -------------------------------
+# SHARED POLICY
+# -------------------------------
+_policy = PasswordPolicy()
+_policy_lock = threading.Lock()
+
+
+def get_password_policy():
+    """Return the process-wide PasswordPolicy."""
+    return _policy
+
+
+def set_password_policy(policy=None, rounds=None):
+    """
+    Replace the process-wide policy, either with a PasswordPolicy or a cost factor.
+
+    Usage:
+        set_password_policy(rounds=13)
+        set_password_policy(PasswordPolicy(rounds=calibrate_rounds(200)[0]))
+    """
+    global _policy
+    if policy is None:
+        policy = PasswordPolicy(rounds=rounds if rounds is not None else DEFAULT_ROUNDS)
+    with _policy_lock:
+        _policy = policy
+    return _policy
@@ -0,0 +1,278 @@
+# app/services/rate_limiter.py
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from app.data.db import DB_PATH
+from app.data.migrations import ensure_schema
+from app.data.pool import get_pool
+
+# NOTE: login attempts are rate limited with token buckets, one per username and one
+# per source (client address), checked before the lockout lookup and before any bcrypt
+# work. A credential-stuffing burst is turned away with a dict lookup instead of
+# costing a password hash per attempt.
+#
+# By default buckets live in memory (per process). With shared=True they live in the
+# `rate_limit_buckets` table (schema migration 10) and are updated with one UPSERT
+# per attempt, so several processes share the same limits.
+
+DEFAULT_MAX_KEYS = 100000
+
+# Refill the bucket for the time since its last update, then take `cost` tokens if
+# enough are there. No row comes back when the attempt is rejected.
+_CONSUME_SQL = """
+    INSERT INTO rate_limit_buckets (bucket_key, tokens, updated)
+    VALUES (:key, :capacity - :cost, :now)
+    ON CONFLICT (bucket_key) DO UPDATE SET
+        tokens = MIN(:capacity, tokens + (:now - updated) * :rate) - :cost,
+        updated = :now
+    WHERE MIN(:capacity, tokens + (:now - updated) * :rate) >= :cost
+    RETURNING tokens
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string.
+
+    - Each bucket holds up to `capacity` tokens and refills at `rate` tokens per second.
+    - `consume(key)` takes one token, or rejects the attempt if the bucket is empty.
+    - In memory, at most `max_keys` buckets are kept (least recently used go first;
+      a dropped bucket simply starts full again).
+    """
+
+    def __init__(self, capacity, rate, name="default", shared=False, db_path=DB_PATH,
+                 max_keys=DEFAULT_MAX_KEYS):
+        if capacity < 1 or rate <= 0:
+            raise ValueError("capacity must be at least 1 and rate must be positive")
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.name = name
+        self.shared = shared
+        self.db_path = db_path
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+        self._stats = {"allowed": 0, "rejected": 0}
+
+    def _retry_after(self, tokens, cost):
+        return max(0.0, (cost - tokens) / self.rate)
+
+    def _consume_memory(self, key, cost, now):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return self._retry_after(bucket[0], cost)
+
+    def _consume_shared(self, key, cost, now, conn):
+        ensure_schema(conn)
+        params = {"key": f"{self.name}:{key}", "capacity": self.capacity, "cost": cost,
+                  "now": now, "rate": self.rate}
+        try:
+            row = conn.execute(_CONSUME_SQL, params).fetchone()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if row is not None:
+            return 0.0
+        return self._retry_after(self._level_shared(params["key"], now, conn), cost)
+
+    def _level_shared(self, bucket_key, now, conn):
+        row = conn.execute(
+            "SELECT tokens, updated FROM rate_limit_buckets WHERE bucket_key = ?", (bucket_key,)
+        ).fetchone()
+        if row is None:
+            return self.capacity
+        return min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+    def consume(self, key, cost=1, conn=None):
+        """
+        Take `cost` tokens from the bucket for `key`.
+
+        Args:
+            key (str): what is being limited (a username, an IP address, ...)
+            cost (float): tokens this attempt costs
+            conn: sqlite3.Connection to use in shared mode (a pooled one otherwise)
+
+        Returns:
+            float: 0 if the attempt is allowed, otherwise seconds until it would be
+        """
+        now = time.time()
+        if not self.shared:
+            retry_after = self._consume_memory(key, cost, now)
+        elif conn is None:
+            with get_pool(self.db_path).connection() as pooled:
+                retry_after = self._consume_shared(key, cost, now, pooled)
+        else:
+            retry_after = self._consume_shared(key, cost, now, conn)
+        with self._lock:
+            self._stats["rejected" if retry_after else "allowed"] += 1
+        return retry_after
+
+    def credit(self, key, amount=1, conn=None):
+        """Give `amount` tokens back to the bucket for `key` (never above capacity)."""
+        if not self.shared:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket[0] = min(self.capacity, bucket[0] + amount)
+            return
+        if conn is None:
+            with get_pool(self.db_path).connection() as pooled:
+                self._credit_shared(key, amount, pooled)
+        else:
+            self._credit_shared(key, amount, conn)
+
+    def _credit_shared(self, key, amount, conn):
+        ensure_schema(conn)
+        conn.execute(
+            "UPDATE rate_limit_buckets SET tokens = MIN(?, tokens + ?) WHERE bucket_key = ?",
+            (self.capacity, amount, f"{self.name}:{key}")
+        )
+        conn.commit()
+
+    def level(self, key, conn=None):
+        """Tokens currently available for `key` (after refill)."""
+        now = time.time()
+        if self.shared:
+            if conn is None:
+                with get_pool(self.db_path).connection() as pooled:
+                    ensure_schema(pooled)
+                    return self._level_shared(f"{self.name}:{key}", now, pooled)
+            ensure_schema(conn)
+            return self._level_shared(f"{self.name}:{key}", now, conn)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return self.capacity
+            return min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+
+    def reset(self, key=None, conn=None):
+        """Refill one bucket (or all of them) immediately."""
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+        if self.shared:
+            if conn is None:
+                with get_pool(self.db_path).connection() as pooled:
+                    self._reset_shared(key, pooled)
+            else:
+                self._reset_shared(key, conn)
+
+    def _reset_shared(self, key, conn):
+        ensure_schema(conn)
+        if key is None:
+            conn.execute("DELETE FROM rate_limit_buckets WHERE bucket_key LIKE ?", (f"{self.name}:%",))
+        else:
+            conn.execute("DELETE FROM rate_limit_buckets WHERE bucket_key = ?", (f"{self.name}:{key}",))
+        conn.commit()
+
+    def stats(self):
+        """
+        Return limiter counters (this process only).
+
+        Returns:
+            dict: allowed, rejected, keys (buckets held in memory), levels
+                  (current tokens of in-memory buckets below capacity)
+        """
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["keys"] = len(self._buckets)
+            levels = {}
+            for key, (tokens, updated) in self._buckets.items():
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                if tokens < self.capacity:
+                    levels[key] = round(tokens, 3)
+            stats["levels"] = levels
+            return stats
+
+
+# -------------------------------
+# LOGIN LIMITS
+# -------------------------------
+class LoginRateLimiter:
+    """
+    The pair of limiters applied to login attempts.
+
+    Defaults: a username gets a burst of 5 failed attempts, then 1 every 12 seconds
+    (successful logins are refunded); a source gets a burst of 30 attempts, then 1 per
+    second.
+    """
+
+    def __init__(self, per_user=(5, 1 / 12), per_source=(30, 1.0), shared=False, db_path=DB_PATH):
+        self.by_user = TokenBucketLimiter(*per_user, name="user", shared=shared, db_path=db_path)
+        self.by_source = TokenBucketLimiter(*per_source, name="source", shared=shared, db_path=db_path)
+
+    def check(self, username, source=None, conn=None):
+        """
+        Count one login attempt.
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until the caller may retry
+        """
+        if source is not None:
+            retry_after = self.by_source.consume(source, conn=conn)
+            if retry_after:
+                return retry_after
+        return self.by_user.consume(username, conn=conn)
+
+    def record_success(self, username, conn=None):
+        """
+        Refund the username's token after a successful login, so only failed attempts
+        use up the per-user budget (the source bucket still counts every attempt).
+        """
+        self.by_user.credit(username, conn=conn)
+
+    def stats(self):
+        """Counters of both limiters: {'user': {...}, 'source': {...}}."""
+        return {"user": self.by_user.stats(), "source": self.by_source.stats()}
+
+
+def format_retry_after(seconds):
+    """Message for a rejected attempt."""
+    return f"Too many login attempts. Try again in {math.ceil(seconds)} seconds."
+
+
+# -------------------------------
+# SHARED LIMITER
+# -------------------------------
+_limiter = LoginRateLimiter()
+_limiter_lock = threading.Lock()
+
+
+def get_login_rate_limiter():
+    """Return the process-wide LoginRateLimiter."""
+    return _limiter
+
+
+def set_login_rate_limiter(limiter=None, **settings):
+    """
+    Replace the process-wide login limiter.
+
+    Usage:
+        set_login_rate_limiter(per_user=(3, 1 / 30))
+        set_login_rate_limiter(shared=True)  # share buckets between processes
+    """
+    global _limiter
+    if limiter is None:
+        limiter = LoginRateLimiter(**settings)
+    with _limiter_lock:
+        _limiter = limiter
+    return _limiter
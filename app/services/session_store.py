@@ -0,0 +1,287 @@
+# app/services/session_store.py
+
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from app.data.db import DB_PATH
+from app.data.migrations import ensure_schema
+from app.data.pool import get_pool
+
+# NOTE: sessions live in the `sessions` table (schema migration 8), keyed by the
+# SHA-256 of the token. Hot tokens are also kept in an in-process LRU, so validating
+# a session on each request is normally a dict lookup with no SQL at all.
+#
+# A cached entry is trusted for `recheck_after` seconds; after that the next
+# validation re-reads the row, so a session revoked by another process stops working
+# within that delay. Revocations made through this store take effect immediately.
+
+DEFAULT_SESSION_TTL = 8 * 60 * 60  # seconds
+DEFAULT_LRU_SIZE = 10000
+DEFAULT_RECHECK_AFTER = 30.0
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+
+def hash_token(token):
+    """SHA-256 hex digest of a session token (what the database stores)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """
+    Session tokens backed by SQLite with an LRU of recently used tokens.
+
+    - `create` issues a random token; only its hash is persisted.
+    - `validate` returns the username for a live token, or None.
+    - With `sliding=True` a session used in the second half of its lifetime is
+      extended by another `ttl`, so active users stay logged in (at most one write
+      per half-TTL per session).
+    - `sweep` deletes expired rows; `start_sweeper` runs it on a background thread.
+    """
+
+    def __init__(self, db_path=DB_PATH, ttl=DEFAULT_SESSION_TTL, sliding=True,
+                 lru_size=DEFAULT_LRU_SIZE, recheck_after=DEFAULT_RECHECK_AFTER):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.sliding = sliding
+        self.lru_size = lru_size
+        self.recheck_after = recheck_after
+        self._lru = OrderedDict()  # token_hash -> [username, expires_at, cached_at]
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+        self._stats = {"created": 0, "lru_hits": 0, "lru_misses": 0, "rejected": 0,
+                       "refreshed": 0, "revoked": 0, "swept": 0}
+
+    # -------------------------------
+    # LRU
+    # -------------------------------
+    def _remember(self, token_hash, username, expires_at):
+        with self._lock:
+            self._lru[token_hash] = [username, expires_at, time.monotonic()]
+            self._lru.move_to_end(token_hash)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _forget(self, token_hash):
+        with self._lock:
+            self._lru.pop(token_hash, None)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _connection(self):
+        return get_pool(self.db_path).connection()
+
+    # -------------------------------
+    # OPERATIONS
+    # -------------------------------
+    def create(self, username):
+        """
+        Start a session for `username`.
+
+        Returns:
+            str: the session token (give it to the client; it can't be recovered later)
+        """
+        token = secrets.token_urlsafe(32)
+        token_hash = hash_token(token)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._connection() as conn:
+            ensure_schema(conn)
+            conn.execute(
+                "INSERT INTO sessions (token_hash, username, created_at, expires_at, last_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (token_hash, username, now, expires_at, now)
+            )
+            conn.commit()
+        self._remember(token_hash, username, expires_at)
+        self._count("created")
+        return token
+
+    def validate(self, token):
+        """
+        Check a session token.
+
+        Returns:
+            str or None: the session's username, or None if unknown, expired or revoked
+        """
+        if not token:
+            return None
+        token_hash = hash_token(token)
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(token_hash)
+            if entry is not None and time.monotonic() - entry[2] <= self.recheck_after:
+                self._lru.move_to_end(token_hash)
+                self._stats["lru_hits"] += 1
+                username, expires_at = entry[0], entry[1]
+            else:
+                entry = None
+                self._stats["lru_misses"] += 1
+
+        if entry is None:
+            with self._connection() as conn:
+                ensure_schema(conn)
+                row = conn.execute(
+                    "SELECT username, expires_at FROM sessions WHERE token_hash = ?", (token_hash,)
+                ).fetchone()
+            if row is None:
+                self._forget(token_hash)
+                self._count("rejected")
+                return None
+            username, expires_at = row
+            self._remember(token_hash, username, expires_at)
+
+        if expires_at <= now:
+            self._forget(token_hash)
+            self._count("rejected")
+            return None
+        if self.sliding and expires_at - now < self.ttl / 2:
+            self.refresh(token)
+        return username
+
+    def refresh(self, token):
+        """
+        Extend a live session by `ttl` from now.
+
+        Returns:
+            float or None: the new expiry time, or None if the session isn't live
+        """
+        token_hash = hash_token(token)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._connection() as conn:
+            ensure_schema(conn)
+            # One statement, so a revoke or sweep can't land between the update and the lookup
+            row = conn.execute(
+                "UPDATE sessions SET expires_at = ?, last_seen = ? "
+                "WHERE token_hash = ? AND expires_at > ? RETURNING username",
+                (expires_at, now, token_hash, now)
+            ).fetchone()
+            conn.commit()
+        if row is None:
+            self._forget(token_hash)
+            return None
+        username = row[0]
+        self._remember(token_hash, username, expires_at)
+        self._count("refreshed")
+        return expires_at
+
+    def revoke(self, token):
+        """
+        End a session (logout).
+
+        Returns:
+            bool: True if a session was removed
+        """
+        token_hash = hash_token(token)
+        self._forget(token_hash)
+        with self._connection() as conn:
+            ensure_schema(conn)
+            cur = conn.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+            conn.commit()
+        self._count("revoked", cur.rowcount)
+        return cur.rowcount > 0
+
+    def revoke_user(self, username):
+        """
+        End every session of a user (e.g. after a password change).
+
+        Returns:
+            int: number of sessions removed
+        """
+        with self._lock:
+            for token_hash in [h for h, e in self._lru.items() if e[0] == username]:
+                del self._lru[token_hash]
+        with self._connection() as conn:
+            ensure_schema(conn)
+            cur = conn.execute("DELETE FROM sessions WHERE username = ?", (username,))
+            conn.commit()
+        self._count("revoked", cur.rowcount)
+        return cur.rowcount
+
+    def sweep(self):
+        """
+        Delete expired sessions (an index range scan on expires_at).
+
+        Returns:
+            int: number of sessions deleted
+        """
+        now = time.time()
+        with self._lock:
+            for token_hash in [h for h, e in self._lru.items() if e[1] <= now]:
+                del self._lru[token_hash]
+        with self._connection() as conn:
+            ensure_schema(conn)
+            cur = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            conn.commit()
+        self._count("swept", cur.rowcount)
+        return cur.rowcount
+
+    # -------------------------------
+    # BACKGROUND SWEEPER
+    # -------------------------------
+    def start_sweeper(self, interval=DEFAULT_SWEEP_INTERVAL):
+        """Run `sweep` every `interval` seconds on a daemon thread (no-op if running)."""
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(interval,), name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"⚠ Session sweep failed: {e}")
+
+    def stop_sweeper(self):
+        """Stop the background sweeper and wait for it to exit."""
+        self._stop.set()
+        sweeper = self._sweeper
+        if sweeper is not None:
+            sweeper.join()
+        self._sweeper = None
+
+    def stats(self):
+        """
+        Return session store counters.
+
+        Returns:
+            dict: created, lru_hits, lru_misses, rejected, refreshed, revoked, swept, cached
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._lru)
+            return stats
+
+
+# -------------------------------
+# SHARED STORE
+# -------------------------------
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store(db_path=DB_PATH, start_sweeper=True):
+    """
+    Return the process-wide SessionStore for a database, creating it on first use
+    (and starting its background sweeper unless start_sweeper=False).
+    """
+    key = str(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SessionStore(db_path)
+            if start_sweeper:
+                store.start_sweeper()
+            _stores[key] = store
+        return store
@@ -2,44 +2,53 @@
 
 import os
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import bcrypt
 from app.data.db import connect_database
+from app.data.migrations import ensure_schema
+from app.data.pool import get_pool
+from app.data.unit_of_work import commit_write, unit_of_work
+from app.services.hash_executor import get_hash_executor
+from app.services.lockout import format_lockout, get_lockout_policy
+from app.services.password_policy import get_password_policy
+from app.services.rate_limiter import format_retry_after, get_login_rate_limiter
 
 # NOTE: these functions accept an optional `conn` parameter.
 # If you pass a connection (recommended for bulk ops / tests), they will reuse it
 # and will NOT open a new connection, avoiding concurrent locks.
+# Without one, register_user/login_user borrow a connection from the shared pool
+# (app/data/pool.py) instead of opening and closing their own.
 
 def create_users_table(conn):
-    """Ensure users table exists (uses the provided conn)."""
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password_hash BLOB NOT NULL,
-            role TEXT DEFAULT 'user',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
+    """
+    Ensure users table exists (uses the provided conn).
+    The table comes from the schema migrations, which run once per database per
+    process, so calling this on every request costs a set lookup, not DDL.
+    """
+    ensure_schema(conn)
 
 
 def register_user(username, password, role='user', conn=None):
     """
-    Register a new user. If conn is None, will open its own connection.
+    Register a new user. If conn is None, borrows one from the shared pool.
     Returns: (success: bool, message: str)
     """
-    own_conn = False
-    try:
-        if conn is None:
-            conn = connect_database()
-            own_conn = True
+    if conn is None:
+        try:
+            with get_pool().connection() as pooled:
+                return register_user(username, password, role, conn=pooled)
+        except Exception as e:  # pool timeout, or sqlite3 errors opening a connection
+            return False, f"Error registering user: {e}"
 
+    try:
         create_users_table(conn)
         cur = conn.cursor()
 
-        # hash password (bcrypt returns bytes)
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        # hash password (bcrypt returns bytes) at the configured cost
+        password_hash = get_password_policy().hash(password)
 
         try:
             cur.execute(
@@ -52,26 +61,41 @@ def register_user(username, password, role='user', conn=None):
             return False, f"Username '{username}' already exists."
     except Exception as e:
         return False, f"Error registering user: {e}"
-    finally:
-        if own_conn and conn:
-            conn.close()
 
 
-def login_user(username, password, conn=None):
+def login_user(username, password, conn=None, source=None):
     """
-    Verify login. Returns (success: bool, message: str)
+    Verify login. If conn is None, borrows one from the shared pool.
+    `source` (e.g. the client's IP address) is rate limited alongside the username.
+    Returns (success: bool, message: str)
     """
-    own_conn = False
+    if conn is None:
+        try:
+            with get_pool().connection() as pooled:
+                return login_user(username, password, conn=pooled, source=source)
+        except Exception as e:  # pool timeout, or sqlite3 errors opening a connection
+            return False, f"Error logging in: {e}"
+
     try:
-        if conn is None:
-            conn = connect_database()
-            own_conn = True
+        # Over-limit attempts are rejected first: no lookup, no hashing
+        limiter = get_login_rate_limiter()
+        retry_after = limiter.check(username, source, conn=conn)
+        if retry_after:
+            return False, format_retry_after(retry_after)
+
+        # Locked accounts are turned away before any bcrypt work
+        lockout = get_lockout_policy()
+        remaining = lockout.locked_for(conn, username)
+        if remaining:
+            return False, format_lockout(remaining)
 
         cur = conn.cursor()
         cur.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
         row = cur.fetchone()
 
         if row is None:
+            # Counted too, so guessing usernames is throttled like guessing passwords
+            lockout.record_failure(conn, username)
             return False, "User not found."
 
         password_hash = row[0]
@@ -79,23 +103,42 @@ def login_user(username, password, conn=None):
         if isinstance(password_hash, str):
             password_hash = password_hash.encode('utf-8')
 
-        if bcrypt.checkpw(password.encode('utf-8'), password_hash):
-            return True, "Login successful."
-        else:
+        policy = get_password_policy()
+        if not policy.verify(password, password_hash):
+            if lockout.record_failure(conn, username):
+                return False, "Incorrect password. " + format_lockout(lockout.lockout)
             return False, "Incorrect password."
+
+        # Stored cost out of date: rehash now that we know the password. Hashed before
+        # the transaction so bcrypt never runs while the write lock is held.
+        new_hash = policy.hash(password) if policy.needs_rehash(password_hash) else None
+        with unit_of_work(conn):
+            # Clearing the failure count and the rehash commit together
+            lockout.record_success(conn, username)
+            if new_hash is not None:
+                # The WHERE on the old hash makes this a compare-and-swap, so a
+                # concurrent password change is never overwritten.
+                cur.execute(
+                    "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                    (new_hash, username, row[0])
+                )
+                commit_write(conn, "users")
+        limiter.record_success(username, conn=conn)
+        return True, "Login successful."
     except Exception as e:
         return False, f"Error logging in: {e}"
-    finally:
-        if own_conn and conn:
-            conn.close()
 
 
-def migrate_users_from_file(conn=None, file_path="DATA/users.txt"):
+def migrate_users_from_file(conn=None, file_path="DATA/users.txt", bulk=False):
     """
     Migrate users from a file into the users table.
     File format: username,password,role (role optional)
+    Pass bulk=True for large files (see bulk_migrate_users_from_file).
     Returns number of users migrated.
     """
+    if bulk:
+        return bulk_migrate_users_from_file(conn, file_path)["migrated"]
+
     own_conn = False
     migrated = 0
     try:
@@ -110,6 +153,8 @@ def migrate_users_from_file(conn=None, file_path="DATA/users.txt"):
             print(f"❌ Users file not found: {file_path}")
             return 0
 
+        existing = {row[0] for row in conn.execute("SELECT username FROM users")}
+
         with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
             for line in f:
                 line = line.strip()
@@ -123,6 +168,10 @@ def migrate_users_from_file(conn=None, file_path="DATA/users.txt"):
                 password = parts[1]
                 role = parts[2] if len(parts) > 2 else "user"
 
+                # Existing users are skipped before hashing, so re-running the
+                # migration at every startup doesn't pay a bcrypt hash per user
+                if username in existing:
+                    continue
                 success, msg = register_user(username, password, role, conn=conn)
                 if success:
                     migrated += 1
@@ -137,3 +186,143 @@ def migrate_users_from_file(conn=None, file_path="DATA/users.txt"):
     finally:
         if own_conn and conn:
             conn.close()
+
+
+# -------------------------------
+# BULK MIGRATION
+# -------------------------------
+def _hash_for_import(password, rounds):
+    """Process-pool worker: hash one password at the given bcrypt cost."""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds))
+
+
+def _iter_user_chunks(file_path, chunk_size):
+    """Stream (username, password, role) tuples from the file in lists of chunk_size."""
+    chunk = []
+    invalid = 0
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = [p.strip() for p in line.split(",")]
+            if len(parts) < 2:
+                invalid += 1
+                continue
+            role = parts[2] if len(parts) > 2 else "user"
+            chunk.append((parts[0], parts[1], role))
+            if len(chunk) >= chunk_size:
+                yield chunk, invalid
+                chunk, invalid = [], 0
+    if chunk or invalid:
+        yield chunk, invalid
+
+
+def bulk_migrate_users_from_file(conn=None, file_path="DATA/users.txt", chunk_size=1000,
+                                 workers=None, progress_every=10000):
+    """
+    Bulk-import users from a file (username,password,role per line).
+
+    - The file is streamed in chunks, never loaded whole.
+    - Existing usernames are fetched once up front into a set; duplicates in the file
+      are skipped too.
+    - Passwords are hashed in a process pool (workers defaults to the CPU count).
+    - Each chunk is written with one executemany and one commit.
+
+    Returns:
+        dict: read, migrated, skipped, invalid, elapsed_sec, users_per_sec
+    """
+    stats = {"read": 0, "migrated": 0, "skipped": 0, "invalid": 0,
+             "elapsed_sec": 0.0, "users_per_sec": 0.0}
+    if not os.path.exists(file_path):
+        print(f"❌ Users file not found: {file_path}")
+        return stats
+
+    own_conn = False
+    start = time.perf_counter()
+    next_report = progress_every
+    try:
+        if conn is None:
+            conn = connect_database()
+            own_conn = True
+
+        create_users_table(conn)
+        cur = conn.cursor()
+        seen = {row[0] for row in cur.execute("SELECT username FROM users")}
+        rounds = get_password_policy().rounds
+        workers = workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk, invalid in _iter_user_chunks(file_path, chunk_size):
+                stats["read"] += len(chunk)
+                stats["invalid"] += invalid
+
+                new_users = []
+                for username, password, role in chunk:
+                    if username in seen:
+                        stats["skipped"] += 1
+                        continue
+                    seen.add(username)
+                    new_users.append((username, password, role))
+                if not new_users:
+                    continue
+
+                hashes = pool.map(
+                    _hash_for_import,
+                    [u[1] for u in new_users],
+                    repeat(rounds),
+                    chunksize=max(1, len(new_users) // (workers * 4)),
+                )
+                rows = [(u[0], h, u[2]) for u, h in zip(new_users, hashes)]
+                cur.executemany(
+                    "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+                stats["migrated"] += cur.rowcount
+                stats["skipped"] += len(rows) - cur.rowcount
+
+                if progress_every and stats["read"] >= next_report:
+                    elapsed = time.perf_counter() - start
+                    print(f"… {stats['read']} read, {stats['migrated']} migrated "
+                          f"({stats['migrated'] / elapsed:.1f} users/s)")
+                    next_report += progress_every
+
+        elapsed = time.perf_counter() - start
+        stats["elapsed_sec"] = round(elapsed, 3)
+        stats["users_per_sec"] = round(stats["migrated"] / elapsed, 1) if elapsed else 0.0
+        print(f"✔ Bulk-migrated {stats['migrated']} users from '{file_path}' "
+              f"in {stats['elapsed_sec']}s ({stats['users_per_sec']} users/s)")
+        return stats
+    except Exception as e:
+        print(f"❌ Error bulk-migrating users: {e}")
+        return stats
+    finally:
+        if own_conn and conn:
+            conn.close()
+
+# -------------------------------
+# OFF-THREAD VARIANTS
+# -------------------------------
+# bcrypt work runs on the bounded hashing pool (see app/services/hash_executor.py) so a
+# burst of logins can't tie up every request worker. Leave `conn` as None so each job
+# uses its own connection; a single sqlite3 connection must not be shared across jobs.
+
+def register_user_future(username, password, role='user', conn=None):
+    """Run register_user on the hashing pool. Returns a Future of (success, message)."""
+    return get_hash_executor().submit(register_user, username, password, role, conn=conn)
+
+
+def login_user_future(username, password, conn=None, source=None):
+    """Run login_user on the hashing pool. Returns a Future of (success, message)."""
+    return get_hash_executor().submit(login_user, username, password, conn=conn, source=source)
+
+
+async def register_user_async(username, password, role='user', conn=None):
+    """Awaitable register_user; the event loop is never blocked by hashing."""
+    return await get_hash_executor().run(register_user, username, password, role, conn=conn)
+
+
+async def login_user_async(username, password, conn=None, source=None):
+    """Awaitable login_user; the event loop is never blocked by hashing."""
+    return await get_hash_executor().run(login_user, username, password, conn=conn, source=source)
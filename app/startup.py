@@ -0,0 +1,71 @@
+# app/startup.py
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# NOTE: startup profiling is off unless APP_PROFILE_STARTUP=1 is set or main.py is run
+# with --profile-startup. When off, `phase` costs one boolean check.
+#
+#     with phase("import data layer"):
+#         from app.data.incidents import ...
+#     ...
+#     print_startup_report()
+
+_enabled = os.environ.get("APP_PROFILE_STARTUP") == "1"
+_process_start = time.perf_counter()
+_phases = []  # (name, seconds, modules imported during the phase)
+
+
+def enable_startup_profiling(enabled=True):
+    """Turn phase timing on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def startup_profiling_enabled():
+    return _enabled
+
+
+@contextmanager
+def phase(name):
+    """Time a startup phase (an import block, schema setup, CSV sync, ...)."""
+    if not _enabled:
+        yield
+        return
+    modules_before = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - start, len(sys.modules) - modules_before))
+
+
+def startup_report():
+    """
+    Return the recorded phases.
+
+    Returns:
+        dict: phases (list of {name, ms, modules}), total_ms (since this module was
+              imported), pandas_loaded
+    """
+    return {
+        "phases": [{"name": n, "ms": round(s * 1000, 2), "modules": m} for n, s, m in _phases],
+        "total_ms": round((time.perf_counter() - _process_start) * 1000, 2),
+        "pandas_loaded": "pandas" in sys.modules,
+    }
+
+
+def print_startup_report():
+    """Print the recorded phase timings (no-op when profiling is off)."""
+    if not _enabled:
+        return
+    report = startup_report()
+    print("\n" + "=" * 60)
+    print("STARTUP PROFILE")
+    print("=" * 60)
+    for p in report["phases"]:
+        print(f"{p['name']:<35} {p['ms']:>10.2f} ms  (+{p['modules']} modules)")
+    print(f"{'total since start':<35} {report['total_ms']:>10.2f} ms")
+    print(f"pandas loaded: {'yes' if report['pandas_loaded'] else 'no'}")
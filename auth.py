@@ -1,16 +1,16 @@
 # Activity 3:
 import bcrypt
 import os
+from app.services.credential_store import get_credential_store
+from app.services.password_policy import get_password_policy
 USER_DATA_FILE = "users.txt"
 
 
 # Activity 4:
 def hash_password(plain_text_password):
     """Hash a password for storing."""
-    # Generate a salt and hash the password
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(plain_text_password.encode('utf-8'), salt)
-    return hashed_password
+    # Generate a salt (at the configured cost) and hash the password
+    return get_password_policy().hash(plain_text_password)
 
 # Activity 5:
 def verify_password(plain_text_password, hashed_password):
@@ -55,10 +55,8 @@ def register_user(username, password):
 
     hashed_password = hash_password(password)
 
-    with open("users.txt", "a") as f:
-        f.write(f"{username},{hashed_password.decode()}\n")
-
-    return True
+    # The store appends the line to users.txt and indexes it in one step
+    return get_credential_store(USER_DATA_FILE).add(username, hashed_password.decode())
 
 
 
@@ -74,15 +72,18 @@ def user_exists(username):
     Returns:
         bool: True if the user exists, False otherwise.
     """
-    try:
-        with open("users.txt", "r") as f:
-            for line in f:
-                stored_user, _ = line.strip().split(',', 1)
-                if stored_user == username:
-                    return True
-        return False
-    except FileNotFoundError:
-        return False
+    # O(1) lookup in the in-memory index (rebuilt only when users.txt changes)
+    return get_credential_store(USER_DATA_FILE).exists(username)
+
+def rehash_if_outdated(username, password, stored_hash):
+    """
+    Upgrade a stored hash whose bcrypt cost differs from the current policy.
+    The new hash is appended to users.txt (the last line for a user wins).
+    """
+    policy = get_password_policy()
+    if policy.needs_rehash(stored_hash):
+        get_credential_store(USER_DATA_FILE).update(username, policy.hash(password).decode())
+
 
 # Activity 9:
 def login_user(username, password):
@@ -97,18 +98,15 @@ def login_user(username, password):
     Returns:
         bool: True if authentication is successful, False otherwise.
     """
-    try:
-        with open("users.txt", "r") as f:
-            for line in f:
-                stored_user, stored_hash = line.strip().split(',', 1)
-                if stored_user == username:
-                    # Convert stored hash back to bytes
-                    stored_hash = stored_hash.encode('utf-8')
-                    return verify_password(password, stored_hash)
+    stored_hash = get_credential_store(USER_DATA_FILE).get_hash(username)
+    if stored_hash is None:
+        # Unknown user (or no users registered yet)
         return False
-    except FileNotFoundError:
-        # Handle the case where no users are registered yet
+    # Convert stored hash back to bytes
+    if not verify_password(password, stored_hash.encode('utf-8')):
         return False
+    rehash_if_outdated(username, password, stored_hash)
+    return True
 
 
 # Activity 10:
@@ -239,45 +237,29 @@ import bcrypt
 
 
 def hash_password(plain_text_password):
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(plain_text_password.encode('utf-8'), salt)
+    return get_password_policy().hash(plain_text_password)
 
 def verify_password(plain_text_password, hashed_password):
     return bcrypt.checkpw(plain_text_password.encode('utf-8'), hashed_password)
 
 def user_exists(username):
-    try:
-        with open("users.txt", "r") as f:
-            for line in f:
-                stored_user, _ = line.strip().split(',', 1)
-                if stored_user == username:
-                    return True
-        return False
-    except FileNotFoundError:
-        return False
+    return get_credential_store(USER_DATA_FILE).exists(username)
 
 def register_user(username, password):
     if user_exists(username):
         return False
     hashed_password = hash_password(password)
-    with open("users.txt", "a") as f:
-        f.write(f"{username},{hashed_password.decode()}\n")
-    return True
+    return get_credential_store(USER_DATA_FILE).add(username, hashed_password.decode())
 
 def login_user(username, password):
-    try:
-        with open("users.txt", "r") as f:
-            for line in f:
-                stored_user, stored_hash = line.strip().split(',', 1)
-                if stored_user == username:
-                    stored_hash = stored_hash.encode('utf-8')
-                    if verify_password(password, stored_hash):
-                        return True
-                    else:
-                        return "invalid_password"
-        return "user_not_found"
-    except FileNotFoundError:
+    stored_hash = get_credential_store(USER_DATA_FILE).get_hash(username)
+    if stored_hash is None:
         return "user_not_found"
+    if verify_password(password, stored_hash.encode('utf-8')):
+        rehash_if_outdated(username, password, stored_hash)
+        return True
+    else:
+        return "invalid_password"
 
 def validate_username(username):
     if not username:
@@ -424,75 +406,57 @@ def register_user(username, password, role="user"):
 # Challange 3:
 
 import time
+from app.data.pool import get_pool
+from app.services.lockout import LockoutPolicy, format_lockout
+
+# The challenge's own rule: 3 failed attempts lock the account for 5 minutes
+CHALLENGE_LOCKOUT = LockoutPolicy(max_failures=3, lockout=300)
 
 def login(username, password):
-    # Read users
-    users = {}
-    with open("users.txt", "r") as f:
-        for line in f:
-            u, p, role = line.strip().split(",")
-            users[u] = p  # store only password for simplicity
-
-    # Read locked accounts
-    locked_accounts = {}
-    try:
-        with open("locked.txt", "r") as f:
-            for line in f:
-                u, unlock_time = line.strip().split(",")
-                locked_accounts[u] = float(unlock_time)
-    except FileNotFoundError:
-        pass
-
-    # Check if account is locked
-    if username in locked_accounts:
-        if time.time() < locked_accounts[username]:
-            print("Account is locked. Try again later.")
+    # Failed attempts and locks are kept in the database (login_attempts table), so
+    # they persist across calls and processes instead of living in locked.txt
+    lockout = CHALLENGE_LOCKOUT
+
+    with get_pool().connection() as conn:
+        # Check if account is locked (an expired lock simply stops counting)
+        remaining = lockout.locked_for(conn, username)
+        if remaining:
+            print(format_lockout(remaining))
             return
-        else:
-            # Unlock account
-            del locked_accounts[username]
 
-    # Track failed attempts (in memory for simplicity)
-    failed_attempts = {}
+        # Look the user up in the indexed store instead of re-reading users.txt.
+        # Challenge lines are "username,password,role", so the stored value is "password,role".
+        stored = get_credential_store(USER_DATA_FILE).get_hash(username)
+        stored_password = stored.split(",", 1)[0] if stored is not None else None
 
-    # Initialize attempt count if first try
-    if username not in failed_attempts:
-        failed_attempts[username] = 0
-
-    # Check login
-    if username in users and users[username] == password:
-        print("Login successful!")
-        failed_attempts[username] = 0  # reset attempts after success
-    else:
-        print("Login failed!")
-        failed_attempts[username] += 1
-
-        # Lock account after 3 failed attempts
-        if failed_attempts[username] >= 3:
-            unlock_time = time.time() + 5*60  # 5 minutes lock
-            locked_accounts[username] = unlock_time
-            print("Account locked for 5 minutes!")
-
-    # Save locked accounts
-    with open("locked.txt", "w") as f:
-        for u, t in locked_accounts.items():
-            f.write(u + "," + str(t) + "\n")
+        # Check login
+        if stored_password is not None and stored_password == password:
+            print("Login successful!")
+            lockout.record_success(conn, username)  # reset attempts after success
+        else:
+            print("Login failed!")
+            # Lock account after too many failed attempts
+            if lockout.record_failure(conn, username):
+                print(f"Account locked for {lockout.lockout // 60} minutes!")
 
 
 
-import secrets
-import time
+from app.services.session_store import get_session_store
 
 def create_session(username):
-    # Generate a random token
-    token = secrets.token_hex(16)
-    
-    # Store the token with username and timestamp
-    timestamp = time.time()  # current time in seconds
-    
-    with open("sessions.txt", "a") as f:
-        f.write(username + "," + token + "," + str(timestamp) + "\n")
+    # Sessions live in the database (hashed tokens, with expiry) instead of sessions.txt
+    token = get_session_store().create(username)
     
     print(f"Session created for {username}!")
     return token
 
+
+def validate_session(token):
+    # Returns the username for a live session, None otherwise
+    return get_session_store().validate(token)
+
+
+def end_session(token):
+    # Logout: the token stops working immediately
+    return get_session_store().revoke(token)
+
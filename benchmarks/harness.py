@@ -0,0 +1,182 @@
+# benchmarks/harness.py
+
+import json
+import math
+import platform
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# NOTE: timing and reporting for the benchmark suites (benchmarks/run.py).
+# `measure` runs a callable N times and keeps every sample, so percentiles are exact
+# rather than estimated. A results file looks like:
+#
+#     {"meta": {...scale, python, sqlite, commit...},
+#      "benchmarks": {"crud.get_incident": {"p50_ms": ..., "p95_ms": ..., "ops_per_sec": ...}}}
+#
+# and `compare` flags any benchmark whose p95 got slower than the baseline by more than
+# the threshold (ignoring differences under NOISE_FLOOR_MS, which are timer jitter).
+
+DEFAULT_THRESHOLD = 0.20
+NOISE_FLOOR_MS = 0.05
+
+
+# -------------------------------
+# TIMING
+# -------------------------------
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples, rows=None):
+    """
+    Latency and throughput statistics for a list of per-call durations (seconds).
+
+    Args:
+        samples (list): seconds per call
+        rows (int, optional): rows processed per call, adds rows_per_sec
+
+    Returns:
+        dict: iterations, p50_ms, p95_ms, p99_ms, mean_ms, min_ms, max_ms, ops_per_sec
+              (and rows_per_sec)
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    stats = {
+        "iterations": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+        "mean_ms": round(total / len(ordered) * 1000, 4) if ordered else 0.0,
+        "min_ms": round(ordered[0] * 1000, 4) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+        "ops_per_sec": round(len(ordered) / total, 2) if total else 0.0,
+    }
+    if rows is not None:
+        stats["rows_per_sec"] = round(rows * len(ordered) / total, 1) if total else 0.0
+    return stats
+
+
+def measure(fn, iterations=100, warmup=5, rows=None, before_each=None):
+    """
+    Time fn(i) for i in range(iterations) after `warmup` untimed calls.
+
+    Args:
+        fn: callable taking the iteration number (so calls can vary their ids)
+        iterations (int): timed calls
+        warmup (int): untimed calls first (imports, cache fills, page faults)
+        rows (int, optional): rows each call processes, for rows_per_sec
+        before_each: optional untimed callable run before every call (e.g. clear a cache)
+
+    Returns:
+        dict: see summarize
+    """
+    for i in range(warmup):
+        if before_each:
+            before_each()
+        fn(i)
+    samples = []
+    clock = time.perf_counter
+    for i in range(iterations):
+        if before_each:
+            before_each()
+        start = clock()
+        fn(warmup + i)
+        samples.append(clock() - start)
+    return summarize(samples, rows)
+
+
+# -------------------------------
+# RESULTS
+# -------------------------------
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment(**extra):
+    """Run metadata stored next to the results (what was measured, where, on what)."""
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+    meta.update(extra)
+    return meta
+
+
+def save_results(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, metric="p95_ms"):
+    """
+    Compare a run against a baseline.
+
+    Returns:
+        list of dict: one per benchmark present in both runs, with name, baseline, current,
+        change (fraction; positive = slower) and regression (bool)
+    """
+    rows = []
+    base = baseline.get("benchmarks", {})
+    for name, stats in sorted(results.get("benchmarks", {}).items()):
+        if name not in base or metric not in base[name]:
+            continue
+        old, new = base[name][metric], stats[metric]
+        change = (new - old) / old if old else 0.0
+        rows.append({
+            "name": name,
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4),
+            "regression": change > threshold and new - old > NOISE_FLOOR_MS,
+        })
+    return rows
+
+
+def print_results(results):
+    print("\n" + "=" * 102)
+    print(f"{'benchmark':<50} {'iters':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>11}")
+    print("=" * 102)
+    for name, s in sorted(results["benchmarks"].items()):
+        line = (f"{name:<50} {s['iterations']:>6} {s['p50_ms']:>10.3f} {s['p95_ms']:>10.3f} "
+                f"{s['p99_ms']:>10.3f} {s['ops_per_sec']:>11.1f}")
+        if "rows_per_sec" in s:
+            line += f"  ({s['rows_per_sec']:,.0f} rows/s)"
+        print(line)
+
+
+def print_comparison(rows, threshold=DEFAULT_THRESHOLD):
+    if not rows:
+        print("⚠ No benchmarks in common with the baseline.")
+        return
+    print(f"\nCompared with baseline (p95, regression threshold {threshold:.0%}):")
+    for r in rows:
+        mark = "❌" if r["regression"] else "✔"
+        print(f"{mark} {r['name']:<50} {r['baseline']:>10.3f} -> {r['current']:>10.3f} ms "
+              f"({r['change']:+.1%})")
+    regressions = sum(r["regression"] for r in rows)
+    if regressions:
+        print(f"❌ {regressions} regression(s).")
+    else:
+        print("✅ No regressions.")
@@ -0,0 +1,362 @@
+# benchmarks/run.py
+# Run with: python -m benchmarks.run --scale 100000 [--baseline benchmarks/baseline.json]
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.data.cache import get_query_cache
+from app.data.datasets import (
+    count_datasets_by_category, get_all_datasets, get_dataset, list_datasets, update_dataset
+)
+from app.data.db import connect_database
+from app.data.incidents import (
+    count_incidents, delete_incidents, get_all_incidents, get_high_severity_by_status, get_incident,
+    get_incident_trend, get_incident_types_with_many_cases, get_incidents_by_type_count,
+    insert_incident, insert_incidents, iter_incidents, list_incident_records, list_incidents,
+    search_incidents, update_incident_status
+)
+from app.data.manifest import sync_csv_source
+from app.data.migrations import ensure_schema
+from app.data.pool import close_all_pools
+from app.data.tickets import (
+    count_tickets, count_tickets_by_status, delete_tickets, get_mean_time_to_resolution,
+    get_ticket_trend, insert_tickets, list_tickets, search_tickets, update_ticket_status
+)
+from app.services.lockout import get_lockout_policy, set_lockout_policy
+from app.services.password_policy import get_password_policy, set_password_policy
+from app.services.rate_limiter import get_login_rate_limiter, set_login_rate_limiter
+from app.services.session_store import SessionStore
+from app.services.user_service import login_user, register_user
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD, compare, environment, load_results, measure, print_comparison, print_results,
+    save_results
+)
+from benchmarks.synthetic import (
+    batches, generate_incidents, generate_tickets, generate_users, write_csv
+)
+
+# NOTE: every run builds a fresh database in a temporary directory from seeded synthetic
+# CSVs, so results only depend on (scale, seed, code, machine). Suites:
+#   ingest    - CSV load through the load manifest, and the no-op re-sync
+#   auth      - register, login (good / bad password / unknown user), sessions
+#   crud      - single-row and batch writes, lookups, pages, full scans
+#   analytics - every analytics function, with the query cache cold and warm
+# Benchmarks that materialise a whole table as a DataFrame are skipped above
+# FULL_TABLE_LIMIT rows.
+
+SUITES = ("ingest", "auth", "crud", "analytics")
+FULL_TABLE_LIMIT = 100_000
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+CSV_TABLES = {
+    "cyber_incidents.csv": "cyber_incidents",
+    "it_tickets.csv": "it_tickets",
+    "datasets_metadata.csv": "datasets_metadata",
+}
+
+
+class BenchContext:
+    """Shared state of one run: the database, its size, and the collected results."""
+
+    def __init__(self, workdir, scale, iterations, users, seed):
+        self.workdir = Path(workdir)
+        self.db_path = self.workdir / "bench.db"
+        self.scale = scale
+        self.iterations = iterations
+        self.users = users
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.conn = connect_database(self.db_path)
+        ensure_schema(self.conn)
+        self.benchmarks = {}
+
+    @property
+    def sizes(self):
+        return {
+            "cyber_incidents": self.scale,
+            "it_tickets": self.scale,
+            "datasets_metadata": max(1, self.scale // 10),
+        }
+
+    def record(self, name, stats):
+        self.benchmarks[name] = stats
+        print(f"✔ {name:<50} p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms")
+
+    def random_id(self, table):
+        return self.rng.randint(1, self.sizes[table])
+
+
+def _clear_cache():
+    get_query_cache().clear()
+
+
+# -------------------------------
+# INGEST
+# -------------------------------
+def write_sources(ctx):
+    """Write the synthetic CSVs (untimed)."""
+    start = time.perf_counter()
+    paths = {}
+    for csv_file, table in CSV_TABLES.items():
+        paths[table] = write_csv(ctx.workdir / csv_file, table, ctx.sizes[table], ctx.seed)
+    print(f"✔ Generated synthetic CSVs in {time.perf_counter() - start:.1f}s: {ctx.sizes}")
+    return paths
+
+
+def bench_ingest(ctx, sources, timed=True):
+    for table, path in sources.items():
+        stats = measure(lambda i: sync_csv_source(ctx.conn, path, table), iterations=1, warmup=0,
+                        rows=ctx.sizes[table])
+        if timed:
+            ctx.record(f"ingest.csv_load.{table}", stats)
+    if not timed:
+        return
+    # The common case at startup: nothing changed, the manifest short-circuits
+    path = sources["cyber_incidents"]
+    ctx.record("ingest.csv_resync_unchanged",
+               measure(lambda i: sync_csv_source(ctx.conn, path, "cyber_incidents"),
+                       iterations=min(ctx.iterations, 50)))
+
+
+# -------------------------------
+# AUTH
+# -------------------------------
+def bench_auth(ctx, bcrypt_rounds=None):
+    saved = get_password_policy(), get_login_rate_limiter(), get_lockout_policy()
+    if bcrypt_rounds is not None:
+        set_password_policy(rounds=bcrypt_rounds)
+    # Successful logins run under the default limits: they aren't charged to the user
+    set_login_rate_limiter()
+    try:
+        warmup = 2
+        users = list(generate_users(ctx.users + warmup, ctx.seed))
+        ctx.record("auth.register_user", measure(
+            lambda i: register_user(*users[i], conn=ctx.conn), iterations=ctx.users, warmup=warmup))
+        ctx.record("auth.login_user", measure(
+            lambda i: login_user(*users[i % len(users)], conn=ctx.conn), iterations=ctx.users))
+
+        # Repeated failures would otherwise hit the limiter and the lockout
+        unlimited = (10 ** 9, 10 ** 9)
+        set_login_rate_limiter(per_user=unlimited, per_source=unlimited)
+        set_lockout_policy(max_failures=10 ** 9)
+        ctx.record("auth.login_wrong_password", measure(
+            lambda i: login_user(users[i % len(users)][0], "wrong-password", conn=ctx.conn),
+            iterations=ctx.users))
+        ctx.record("auth.login_unknown_user", measure(
+            lambda i: login_user(f"nobody_{i}", "whatever", conn=ctx.conn), iterations=ctx.iterations))
+
+        store = SessionStore(ctx.db_path)
+        tokens = []
+        ctx.record("auth.session_create", measure(
+            lambda i: tokens.append(store.create(users[i % len(users)][0])), iterations=ctx.iterations))
+        ctx.record("auth.session_validate", measure(
+            lambda i: store.validate(tokens[i % len(tokens)]), iterations=ctx.iterations))
+        store.stop_sweeper()
+    finally:
+        set_password_policy(saved[0])
+        set_login_rate_limiter(saved[1])
+        set_lockout_policy(saved[2])
+
+
+# -------------------------------
+# CRUD
+# -------------------------------
+def bench_crud(ctx):
+    conn, n = ctx.conn, ctx.iterations
+    last_incident = conn.execute("SELECT MAX(id) FROM cyber_incidents").fetchone()[0] or 0
+    last_ticket = conn.execute("SELECT MAX(id) FROM it_tickets").fetchone()[0] or 0
+
+    ctx.record("crud.insert_incident", measure(
+        lambda i: insert_incident(conn, "2024-06-01", "Phishing", "Low", "Open", "Benchmark incident",
+                                  "alice"),
+        iterations=n))
+    batch_rows = 1000
+    new_incidents = batches(generate_incidents(batch_rows * (n + 5), ctx.seed + 10), batch_rows)
+    ctx.record("crud.insert_incidents_batch_1000", measure(
+        lambda i: insert_incidents(conn, next(new_incidents)),
+        iterations=min(n, 20), rows=batch_rows))
+    # The single-row insert_ticket isn't benchmarked: it writes an `issue` column that
+    # it_tickets doesn't have, so every call fails. This times the batch API with one row.
+    # Numbered after the loaded tickets, since ticket_id is unique
+    new_tickets = generate_tickets(n + 5, ctx.seed + 10, first=ctx.sizes["it_tickets"] + 1)
+    ctx.record("crud.insert_tickets_batch_1", measure(
+        lambda i: insert_tickets(conn, [next(new_tickets)]), iterations=n))
+
+    ctx.record("crud.get_incident", measure(
+        lambda i: get_incident(conn, ctx.random_id("cyber_incidents")), iterations=n))
+    ctx.record("crud.get_dataset", measure(
+        lambda i: get_dataset(conn, ctx.random_id("datasets_metadata")), iterations=n))
+    ctx.record("crud.update_incident_status", measure(
+        lambda i: update_incident_status(conn, ctx.random_id("cyber_incidents"), "Investigating"),
+        iterations=n))
+    ctx.record("crud.update_ticket_status", measure(
+        lambda i: update_ticket_status(conn, ctx.random_id("it_tickets"), "In Progress"), iterations=n))
+    ctx.record("crud.update_dataset", measure(
+        lambda i: update_dataset(conn, ctx.random_id("datasets_metadata"), record_count=i), iterations=n))
+
+    # Pages: cold (cache cleared before each call) and warm
+    ctx.record("crud.list_incidents.first_page_cold", measure(
+        lambda i: list_incidents(conn), iterations=n, before_each=_clear_cache))
+    ctx.record("crud.list_incidents.first_page_warm", measure(lambda i: list_incidents(conn), iterations=n))
+    ctx.record("crud.list_incidents.filtered_cold", measure(
+        lambda i: list_incidents(conn, severity="High", status="Open"), iterations=n,
+        before_each=_clear_cache))
+    deep_cursor = max(2, ctx.scale // 2)
+    ctx.record("crud.list_incidents.deep_page_cold", measure(
+        lambda i: list_incidents(conn, cursor=deep_cursor), iterations=n, before_each=_clear_cache))
+    ctx.record("crud.list_incident_records", measure(
+        lambda i: list_incident_records(conn, cursor=deep_cursor), iterations=n))
+    ctx.record("crud.list_tickets.filtered_cold", measure(
+        lambda i: list_tickets(conn, status="Open", priority="High"), iterations=n,
+        before_each=_clear_cache))
+    ctx.record("crud.list_datasets.first_page_cold", measure(
+        lambda i: list_datasets(conn), iterations=n, before_each=_clear_cache))
+
+    scans = 3 if ctx.scale >= 1_000_000 else 10
+    ctx.record("crud.iter_incidents.full_scan", measure(
+        lambda i: sum(1 for _ in iter_incidents(conn, as_tuples=True)), iterations=scans, warmup=1,
+        rows=ctx.scale))
+    if ctx.scale <= FULL_TABLE_LIMIT:
+        ctx.record("crud.get_all_incidents_cold", measure(
+            lambda i: get_all_incidents(conn), iterations=scans, warmup=1, before_each=_clear_cache,
+            rows=ctx.scale))
+        ctx.record("crud.get_all_datasets_cold", measure(
+            lambda i: get_all_datasets(conn), iterations=scans, warmup=1, before_each=_clear_cache))
+
+    # Remove what the write benchmarks added so later suites see the generated data only
+    added = [row[0] for row in conn.execute("SELECT id FROM cyber_incidents WHERE id > ?", (last_incident,))]
+    ctx.record("crud.delete_incidents_batch", measure(
+        lambda i: delete_incidents(conn, added), iterations=1, warmup=0, rows=len(added)))
+    delete_tickets(conn, [row[0] for row in conn.execute("SELECT id FROM it_tickets WHERE id > ?",
+                                                         (last_ticket,))])
+
+
+# -------------------------------
+# ANALYTICS
+# -------------------------------
+def analytics_functions(ctx):
+    """(name, callable) for every analytics function, in dashboard order."""
+    conn = ctx.conn
+    functions = [
+        ("get_incidents_by_type_count", lambda: get_incidents_by_type_count(conn)),
+        ("get_high_severity_by_status", lambda: get_high_severity_by_status(conn)),
+        ("get_incident_types_with_many_cases", lambda: get_incident_types_with_many_cases(conn)),
+        ("count_incidents", lambda: count_incidents(conn)),
+        ("count_incidents.severity", lambda: count_incidents(conn, severity="High")),
+        ("count_incidents.date_range", lambda: count_incidents(conn, date_from="2024-01-01")),
+        ("search_incidents", lambda: search_incidents(conn, "password")),
+        ("count_tickets_by_status", lambda: count_tickets_by_status(conn)),
+        ("count_tickets.status", lambda: count_tickets(conn, status="Open")),
+        ("get_ticket_trend.month", lambda: get_ticket_trend(conn, "month", group_by="priority")),
+        ("get_mean_time_to_resolution.month",
+         lambda: get_mean_time_to_resolution(conn, "month", group_by="priority")),
+        ("search_tickets", lambda: search_tickets(conn, "printer")),
+        ("count_datasets_by_category", lambda: count_datasets_by_category(conn)),
+    ]
+    for bucket in ("day", "week", "month"):
+        functions.append((f"get_incident_trend.{bucket}",
+                          lambda bucket=bucket: get_incident_trend(conn, bucket, group_by="severity")))
+    functions.append(("get_incident_trend.filtered",
+                      lambda: get_incident_trend(conn, "month", severity="High",
+                                                 start="2024-01-01", end="2024-06-30")))
+    return functions
+
+
+def bench_analytics(ctx):
+    for name, fn in analytics_functions(ctx):
+        ctx.record(f"analytics.{name}.cold",
+                   measure(lambda i: fn(), iterations=ctx.iterations, before_each=_clear_cache))
+        ctx.record(f"analytics.{name}.warm", measure(lambda i: fn(), iterations=ctx.iterations))
+
+
+# -------------------------------
+# RUN
+# -------------------------------
+def run(scale=10_000, suites=SUITES, iterations=100, users=20, seed=0, bcrypt_rounds=None,
+        workdir=None, keep_db=False):
+    """
+    Run the selected suites against a fresh synthetic database.
+
+    Returns:
+        dict: {"meta": ..., "benchmarks": {name: stats}}
+    """
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        raise ValueError(f"Unknown suite(s) {unknown}. Choose from {SUITES}")
+    own_dir = workdir is None
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="bench_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    ctx = BenchContext(workdir, scale, iterations, users, seed)
+    try:
+        sources = write_sources(ctx)
+        # The other suites need the data loaded whether or not ingest is being measured
+        bench_ingest(ctx, sources, timed="ingest" in suites)
+        if "auth" in suites:
+            bench_auth(ctx, bcrypt_rounds)
+        if "crud" in suites:
+            bench_crud(ctx)
+        if "analytics" in suites:
+            bench_analytics(ctx)
+    finally:
+        ctx.conn.close()
+        close_all_pools()
+        if own_dir and not keep_db:
+            shutil.rmtree(workdir, ignore_errors=True)
+        elif keep_db:
+            print(f"✔ Benchmark database kept at {ctx.db_path}")
+
+    meta = environment(scale=scale, sizes=ctx.sizes, suites=list(suites), iterations=iterations,
+                       users=users, seed=seed, bcrypt_rounds=get_password_policy().rounds
+                       if bcrypt_rounds is None else bcrypt_rounds)
+    return {"meta": meta, "benchmarks": ctx.benchmarks}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark auth, CRUD, ingestion and analytics.")
+    parser.add_argument("--scale", type=int, default=10_000,
+                        help="incidents and tickets to generate (datasets: scale / 10)")
+    parser.add_argument("--suites", default=",".join(SUITES),
+                        help=f"comma-separated subset of {','.join(SUITES)}")
+    parser.add_argument("--iterations", type=int, default=100, help="timed calls per benchmark")
+    parser.add_argument("--users", type=int, default=20, help="users to register and log in")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None,
+                        help="password hashing cost for the auth suite (default: configured policy)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="results JSON (default: results/<scale>.json)")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--save-baseline", default=None, help="also write this run as a baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="p95 slowdown that counts as a regression (0.2 = 20%%)")
+    parser.add_argument("--workdir", default=None, help="where to build the database (default: temp)")
+    parser.add_argument("--keep-db", action="store_true", help="keep the benchmark database")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s) {', '.join(unknown)}; choose from {', '.join(SUITES)}")
+    results = run(args.scale, suites, args.iterations, args.users, args.seed, args.bcrypt_rounds,
+                  args.workdir, args.keep_db)
+    print_results(results)
+
+    output = save_results(args.output or DEFAULT_RESULTS_DIR / f"{args.scale}.json", results)
+    print(f"\n✅ Results written to {output}")
+    if args.save_baseline:
+        print(f"✅ Baseline written to {save_results(args.save_baseline, results)}")
+
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline), args.threshold)
+        print_comparison(rows, args.threshold)
+        if any(r["regression"] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# benchmarks/synthetic.py
+
+import csv
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from app.data.datasets import DATASET_COLUMNS
+from app.data.incidents import INCIDENT_COLUMNS
+from app.data.tickets import TICKET_COLUMNS
+
+# NOTE: deterministic synthetic data for the benchmarks. Every generator is lazy and
+# seeded, so the same (scale, seed) gives byte-identical CSVs on every run and 10M rows
+# never sit in memory at once. Value distributions are skewed the way real data is
+# (most incidents Low/Medium, most tickets eventually resolved) so summary tables,
+# rollups and indexes see realistic group counts.
+
+START_DATE = date(2023, 1, 1)
+DAYS = 730
+
+INCIDENT_TYPES = ["Phishing", "Malware", "Unauthorized Access", "DDoS", "Data Leak", "Insider Threat",
+                  "Ransomware", "Misconfiguration"]
+SEVERITIES = (["Low"] * 4) + (["Medium"] * 3) + (["High"] * 2) + ["Critical"]
+INCIDENT_STATUSES = ["Open", "Investigating", "Resolved", "Resolved", "Closed", "Closed"]
+TICKET_PRIORITIES = ["Low", "Medium", "Medium", "High", "Critical"]
+TICKET_STATUSES = ["Open", "In Progress", "Resolved", "Resolved", "Closed", "Closed"]
+TICKET_CATEGORIES = ["Network", "Software", "Hardware", "Access", "Email", "Printing"]
+DATASET_CATEGORIES = ["Threat Intelligence", "Network Logs", "Endpoint", "Identity", "Cloud Audit"]
+DATASET_SOURCES = ["SIEM System", "Firewall", "EDR", "Active Directory", "CloudTrail"]
+STAFF = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi", "ivan", "judy"]
+WORDS = ["suspicious", "email", "credentials", "workstation", "server", "login", "password", "vpn",
+         "firewall", "ransomware", "outbound", "traffic", "blocked", "user", "reported", "printer",
+         "laptop", "access", "denied", "database", "backup", "failed", "certificate", "expired",
+         "network", "latency", "account", "locked", "update", "patch"]
+
+
+def _day(rng):
+    return START_DATE + timedelta(days=rng.randrange(DAYS))
+
+
+def _sentence(rng, words=8):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+# -------------------------------
+# ROW GENERATORS
+# -------------------------------
+def generate_incidents(n, seed=0):
+    """Yield n incident tuples in INCIDENT_COLUMNS order."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield (_day(rng).isoformat(), rng.choice(INCIDENT_TYPES), rng.choice(SEVERITIES),
+               rng.choice(INCIDENT_STATUSES), _sentence(rng), rng.choice(STAFF))
+
+
+def generate_tickets(n, seed=0, first=1):
+    """Yield n ticket tuples in TICKET_COLUMNS order, ticket ids numbered from `first`."""
+    rng = random.Random(seed + 1)
+    for i in range(first - 1, first - 1 + n):
+        created = _day(rng)
+        status = rng.choice(TICKET_STATUSES)
+        resolved = ""
+        if status in ("Resolved", "Closed"):
+            resolved = (created + timedelta(days=rng.randrange(15))).isoformat()
+        yield (f"BENCH-{i + 1:08d}", rng.choice(TICKET_PRIORITIES), status, rng.choice(TICKET_CATEGORIES),
+               _sentence(rng, 4), _sentence(rng), created.isoformat(), resolved, rng.choice(STAFF))
+
+
+def generate_datasets(n, seed=0):
+    """Yield n dataset tuples in DATASET_COLUMNS order."""
+    rng = random.Random(seed + 2)
+    for i in range(n):
+        yield (f"dataset_{i + 1:08d}", rng.choice(DATASET_CATEGORIES), rng.choice(DATASET_SOURCES),
+               _day(rng).isoformat(), rng.randrange(100, 5_000_000), round(rng.uniform(0.1, 900.0), 1))
+
+
+def generate_users(n, seed=0):
+    """Yield n (username, password) pairs."""
+    rng = random.Random(seed + 3)
+    for i in range(n):
+        yield f"bench_user_{i + 1:07d}", f"Bench{rng.randrange(10**6):06d}pw"
+
+
+GENERATORS = {
+    "cyber_incidents": (generate_incidents, INCIDENT_COLUMNS),
+    "it_tickets": (generate_tickets, TICKET_COLUMNS),
+    "datasets_metadata": (generate_datasets, DATASET_COLUMNS),
+}
+
+
+# -------------------------------
+# OUTPUT
+# -------------------------------
+def write_csv(path, table, n, seed=0):
+    """
+    Write n synthetic rows for a table to a CSV with the table's column header
+    (the same layout as the files in DATA/).
+
+    Returns:
+        Path: the written file
+    """
+    generate, columns = GENERATORS[table]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(generate(n, seed))
+    return path
+
+
+def batches(rows, size):
+    """Split an iterator into lists of at most `size` items."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
@@ -1,59 +1,77 @@
 # main.py
 
-import os
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Startup profiling: python main.py --profile-startup (or APP_PROFILE_STARTUP=1)
+from app.startup import enable_startup_profiling, phase, print_startup_report
+
+if "--profile-startup" in sys.argv:
+    enable_startup_profiling()
+
 # ----------------------------------------
 # DATABASE AND SCHEMA IMPORTS
 # ----------------------------------------
-from app.data.db import connect_database, load_csv_to_table, load_all_csv_data
-from app.data.schema import create_all_tables
+with phase("import data layer"):
+    from app.data.db import DB_PATH, connect_database
+    from app.data.manifest import DATA_DIR, sync_csv_sources
+    from app.data.schema import create_all_tables
 
 # ----------------------------------------
 # INCIDENTS IMPORTS
 # ----------------------------------------
-from app.data.incidents import (
-    insert_incident,
-    get_all_incidents,
-    update_incident_status,
-    delete_incident,
-    get_incidents_by_type_count,
-    get_high_severity_by_status
-)
+with phase("import incidents"):
+    from app.data.incidents import (
+        insert_incident,
+        get_all_incidents,
+        update_incident_status,
+        delete_incident,
+        get_incidents_by_type_count,
+        get_high_severity_by_status
+    )
 
 # ----------------------------------------
 # USER SERVICES
 # (FIXED — correct module name)
 # ----------------------------------------
-from app.services.user_service import (
-    register_user,
-    login_user,
-    migrate_users_from_file
-)
+with phase("import user services"):
+    from app.services.user_service import (
+        register_user,
+        login_user,
+        migrate_users_from_file
+    )
 
 # ----------------------------------------
 # INITIAL SETUP
 # ----------------------------------------
-def initialize_database():
-    conn = connect_database()
+# Databases already set up by this process; later calls only open a connection.
+_initialized = set()
+
+
+def initialize_database(db_path=DB_PATH):
+    conn = connect_database(db_path)
     print("Connected to database.")
 
+    key = str(Path(db_path).resolve())
+    if key in _initialized:
+        return conn
+
     # Create tables if they don't exist
-    create_all_tables(conn)
+    with phase("schema migrations"):
+        create_all_tables(conn)
     print("Tables created.")
 
-    # Load CSV files into tables
-    data_dir = Path("DATA")
-    load_csv_to_table(conn, data_dir / "cyber_incidents.csv", "cyber_incidents")
-    load_csv_to_table(conn, data_dir / "it_tickets.csv", "it_tickets")
-    load_csv_to_table(conn, data_dir / "datasets_metadata.csv", "datasets_metadata")
+    # Load CSV files into tables (unchanged files are skipped, appended ones load their tail)
+    with phase("CSV sync"):
+        sync_csv_sources(conn, DATA_DIR)
     print("CSV data loaded.")
 
     # Migrate users from file
-    user_count = migrate_users_from_file(conn)
+    with phase("user migration"):
+        user_count = migrate_users_from_file(conn)
     print(f"Migrated {user_count} users from file.")
 
+    _initialized.add(key)
     return conn
 
 
@@ -135,11 +153,10 @@ def run_comprehensive_tests():
     )
     print(f"Created Incident #{test_id}")
 
-    df = pd.read_sql_query(
+    row = conn.execute(
         "SELECT * FROM cyber_incidents WHERE id = ?",
-        conn,
-        params=(test_id,)
-    )
+        (test_id,)
+    ).fetchone()
     print("Read OK")
 
     update_incident_status(conn, test_id, "Resolved")
@@ -166,3 +183,4 @@ if __name__ == "__main__":
     main()
     setup_database_complete()
     run_comprehensive_tests()
+    print_startup_report()
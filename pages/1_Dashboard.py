@@ -0,0 +1,94 @@
+# pages/1_Dashboard.py
+
+import streamlit as st
+
+from app.data.incidents import update_incident_status
+from app.data.tickets import update_ticket_status
+from app.services.page_data import lazy_panel, load, require_login, write
+
+st.set_page_config(page_title="Dashboard", page_icon="📋", layout="wide")
+require_login()
+st.title("📋 Dashboard")
+
+PAGE_SIZE = 25
+
+
+def _pager(state_key, loader, *args, **filters):
+    """Keyset-paged table: remembers the cursor stack in session_state."""
+    stack = st.session_state.setdefault(state_key, [None])
+    page, next_cursor = load(loader, stack[-1], PAGE_SIZE, *args, **filters)
+    st.dataframe(page, hide_index=True)
+    prev_col, next_col, _ = st.columns([1, 1, 6])
+    if prev_col.button("◀ Previous", key=f"{state_key}:prev", disabled=len(stack) == 1):
+        stack.pop()
+        st.rerun()
+    if next_col.button("Next ▶", key=f"{state_key}:next", disabled=next_cursor is None):
+        stack.append(next_cursor)
+        st.rerun()
+    return page
+
+
+# -------------------------------
+# INCIDENTS
+# -------------------------------
+def _incidents():
+    col1, col2 = st.columns(2)
+    severity = col1.multiselect("Severity", ["Critical", "High", "Medium", "Low"])
+    status = col2.multiselect("Status", ["Open", "Investigating", "Resolved", "Closed"])
+    filters = {"severity": severity or None, "status": status or None}
+    # New filters start again from the first page
+    if st.session_state.get("incident_filters") != filters:
+        st.session_state["incident_filters"] = filters
+        st.session_state["incident_pages"] = [None]
+    page = _pager("incident_pages", "incidents_page", **filters)
+
+    if not page.empty:
+        with st.form("incident_status"):
+            incident_id = st.selectbox("Incident", page["id"].tolist())
+            new_status = st.selectbox("New status", ["Open", "Investigating", "Resolved", "Closed"])
+            if st.form_submit_button("Update status"):
+                write(update_incident_status, int(incident_id), new_status)
+                st.success(f"✅ Incident #{incident_id} set to {new_status}.")
+                st.rerun()
+
+
+def _incident_search():
+    query = st.text_input("Search incident descriptions")
+    if query:
+        results, _ = load("incident_search", query, 20)
+        st.dataframe(results[["id", "date", "incident_type", "severity", "snippet"]], hide_index=True)
+
+
+# -------------------------------
+# TICKETS
+# -------------------------------
+def _tickets():
+    status = st.multiselect("Ticket status", ["Open", "In Progress", "Resolved", "Closed"])
+    filters = {"status": status or None}
+    if st.session_state.get("ticket_filters") != filters:
+        st.session_state["ticket_filters"] = filters
+        st.session_state["ticket_pages"] = [None]
+    page = _pager("ticket_pages", "tickets_page", **filters)
+
+    if not page.empty:
+        with st.form("ticket_status"):
+            ticket_id = st.selectbox("Ticket", page["id"].tolist(),
+                                     format_func=lambda i: page.set_index("id").at[i, "ticket_id"])
+            new_status = st.selectbox("New status", ["Open", "In Progress", "Resolved", "Closed"])
+            if st.form_submit_button("Update status"):
+                write(update_ticket_status, int(ticket_id), new_status)
+                st.success(f"✅ Ticket set to {new_status}.")
+                st.rerun()
+
+
+def _ticket_search():
+    query = st.text_input("Search ticket subjects and descriptions")
+    if query:
+        results, _ = load("ticket_search", query, 20)
+        st.dataframe(results[["ticket_id", "priority", "status", "subject", "snippet"]], hide_index=True)
+
+
+lazy_panel("Incidents", _incidents, default=True)
+lazy_panel("Search incidents", _incident_search)
+lazy_panel("Tickets", _tickets)
+lazy_panel("Search tickets", _ticket_search)
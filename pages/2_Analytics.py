@@ -0,0 +1,69 @@
+# pages/2_Analytics.py
+
+import streamlit as st
+
+from app.services.page_data import lazy_panel, load, require_login
+
+st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
+require_login()
+st.title("📈 Analytics")
+
+bucket = st.radio("Group by", ["day", "week", "month"], index=2, horizontal=True)
+
+
+# -------------------------------
+# INCIDENTS
+# -------------------------------
+def _incident_breakdown():
+    col1, col2 = st.columns(2)
+    by_type = load("incident_types")
+    col1.subheader("Incidents by type")
+    col1.bar_chart(by_type, x="incident_type", y="count")
+    high = load("high_severity_by_status")
+    col2.subheader("High severity by status")
+    col2.bar_chart(high, x="status", y="count")
+
+
+def _incident_trend():
+    group_by = st.selectbox("Split by", ["severity", "incident_type", "status"])
+    trend = load("incident_trend", bucket, group_by=group_by)
+    if trend.empty:
+        st.info("No incidents yet.")
+        return
+    st.line_chart(trend.pivot(index="period", columns=group_by, values="count").fillna(0))
+
+
+# -------------------------------
+# TICKETS
+# -------------------------------
+def _ticket_trend():
+    trend = load("ticket_trend", bucket, group_by="priority")
+    if trend.empty:
+        st.info("No tickets yet.")
+        return
+    st.line_chart(trend.pivot(index="period", columns="priority", values="count").fillna(0))
+    st.subheader("Tickets by status")
+    st.bar_chart(load("ticket_status"), x="status", y="count")
+
+
+def _mttr():
+    mttr = load("ticket_mttr", bucket, group_by="priority")
+    if mttr.empty:
+        st.info("No resolved tickets yet.")
+        return
+    st.line_chart(mttr.pivot(index="period", columns="priority", values="mttr_days").fillna(0))
+    st.dataframe(mttr, hide_index=True)
+
+
+# -------------------------------
+# DATASETS
+# -------------------------------
+def _datasets():
+    st.bar_chart(load("dataset_categories"), x="category", y="count")
+
+
+lazy_panel("Incident breakdown", _incident_breakdown, default=True)
+lazy_panel("Incident trend", _incident_trend)
+lazy_panel("Ticket trend", _ticket_trend)
+lazy_panel("Mean time to resolution (days)", _mttr)
+lazy_panel("Datasets by category", _datasets)
@@ -0,0 +1,72 @@
+# pages/3_Settings.py
+
+import streamlit as st
+
+from app.data.aggregates import rebuild_summaries
+from app.data.cache import get_query_cache
+from app.data.rollups import rebuild_rollups
+from app.data.search import rebuild_search_indexes
+from app.services.page_data import clear_page_caches, data_router, lazy_panel, require_login, write
+from app.services.rate_limiter import get_login_rate_limiter
+from app.services.session_store import get_session_store
+
+st.set_page_config(page_title="Settings", page_icon="⚙", layout="wide")
+username = require_login()
+st.title("⚙ Settings")
+
+# -------------------------------
+# ACCOUNT
+# -------------------------------
+st.write(f"Logged in as **{username}**.")
+col1, col2 = st.columns(2)
+if col1.button("Log out"):
+    get_session_store().revoke(st.session_state.pop("session_token"))
+    st.rerun()
+if col2.button("Log out everywhere"):
+    get_session_store().revoke_user(username)
+    st.session_state.pop("session_token", None)
+    st.rerun()
+
+
+# -------------------------------
+# DIAGNOSTICS
+# -------------------------------
+def _stats():
+    col1, col2 = st.columns(2)
+    col1.subheader("Query cache")
+    col1.json(get_query_cache().stats())
+    col2.subheader("Database router")
+    col2.json(data_router().stats())
+    col1.subheader("Sessions")
+    col1.json(get_session_store().stats())
+    col2.subheader("Login rate limits")
+    col2.json(get_login_rate_limiter().stats())
+
+
+def _clear_caches():
+    clear_page_caches()
+    get_query_cache().clear()
+
+
+def _maintenance():
+    st.caption("Rebuild derived tables after loading data with triggers off or editing it by hand.")
+    col1, col2, col3, col4 = st.columns(4)
+    if col1.button("Rebuild summaries"):
+        write(rebuild_summaries)
+        _clear_caches()
+        st.success("✔ Summary tables rebuilt.")
+    if col2.button("Rebuild rollups"):
+        write(rebuild_rollups)
+        _clear_caches()
+        st.success("✔ Rollup tables rebuilt.")
+    if col3.button("Rebuild search"):
+        write(rebuild_search_indexes)
+        _clear_caches()
+        st.success("✔ Search indexes rebuilt.")
+    if col4.button("Clear page cache"):
+        _clear_caches()
+        st.success("✔ Caches cleared.")
+
+
+lazy_panel("Performance statistics", _stats)
+lazy_panel("Maintenance", _maintenance)
@@ -0,0 +1,200 @@
+# test_data_consistency.py
+# Run with: python test_data_consistency.py   (or: python -m pytest test_data_consistency.py)
+#
+# The summary tables, search indexes, daily rollups and change log are all kept up to
+# date by triggers. These checks run every kind of write (single and batch insert,
+# update, delete, CSV load with replace, CSV reconcile) against a temp database and then
+# compare the trigger-maintained state with the live rows.
+
+import csv
+import os
+import re
+import tempfile
+
+from app.data.aggregates import verify_summaries
+from app.data.db import connect_database, stream_csv_to_table
+from app.data.incidents import (
+    delete_incident, delete_incidents, insert_incident, insert_incidents, update_incident_status,
+    update_incidents_status
+)
+from app.data.manifest import reconcile_csv_to_table
+from app.data.migrations import ensure_schema
+from app.data.rollups import verify_rollups
+from app.data.tickets import delete_tickets, insert_tickets, update_tickets_status
+from app.data.versions import changed_since, get_table_version
+
+INCIDENT_HEADER = ["date", "incident_type", "severity", "status", "description", "reported_by"]
+TICKET_HEADER = ["ticket_id", "priority", "status", "category", "subject", "description",
+                 "created_date", "resolved_date"]
+
+INCIDENTS = [
+    ("2024-01-01", "Phishing", "High", "Open", "Suspicious email asking for a password", "alice"),
+    ("2024-01-02", "Malware", "Critical", "Investigating", "Ransomware on a laptop", "bob"),
+    ("2024-01-09", "Phishing", "Low", "Resolved", "Fake invoice email", "carol"),
+    ("2024-02-03", "DDoS", "Medium", "Open", "Traffic spike on the vpn gateway", "alice"),
+]
+TICKETS = [
+    ("T1", "High", "Open", "Hardware", "Printer jam", "The printer on floor two is jammed",
+     "2024-01-01", None),
+    ("T2", "Low", "Resolved", "Network", "Vpn drops", "Vpn drops every hour", "2024-01-02", "2024-01-04"),
+    ("T3", "Medium", "Open", "Email", "Mailbox full", "Cannot receive email", "2024-01-05", None),
+]
+
+
+# -------------------------------
+# HELPERS
+# -------------------------------
+def _fresh_db():
+    workdir = tempfile.mkdtemp(prefix="consistency_")
+    conn = connect_database(os.path.join(workdir, "test.db"))
+    ensure_schema(conn)
+    return conn, workdir
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(["" if v is None else v for v in row] for row in rows)
+    return path
+
+
+def _words(text):
+    return set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+
+def assert_summaries_in_sync(conn):
+    for name, rows in {**verify_summaries(conn), **verify_rollups(conn)}.items():
+        assert rows == [], f"{name} drifted from its source: {rows}"
+
+
+def assert_search_in_sync(conn, table, fts, columns):
+    """FTS finds each live word in exactly the rows that contain it, and indexes nothing else."""
+    live = {}
+    for row in conn.execute(f"SELECT id, {', '.join(columns)} FROM {table}"):
+        for word in set().union(*(_words(v) for v in row[1:])):
+            live.setdefault(word, set()).add(row[0])
+    for word, rows in live.items():
+        hits = {r[0] for r in conn.execute(f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?", (f'"{word}"',))}
+        assert hits == rows, f"{fts} '{word}': index {hits}, live {rows}"
+
+    # Stale entries (words no live row has any more) only show up in the index itself, so
+    # compare its term instances with those of an index rebuilt from the live rows.
+    create_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (fts,)).fetchone()[0]
+    tokenize = re.search(r"tokenize='([^']*)'", create_sql).group(1)
+    conn.execute(f"DROP TABLE IF EXISTS temp.{fts}_ref")
+    conn.execute(f"CREATE VIRTUAL TABLE temp.{fts}_ref USING fts5({', '.join(columns)}, tokenize='{tokenize}')")
+    conn.execute(f"INSERT INTO temp.{fts}_ref (rowid, {', '.join(columns)}) "
+                 f"SELECT id, {', '.join(columns)} FROM {table}")
+    instances = {}
+    for schema, name in (("main", fts), ("temp", f"{fts}_ref")):
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS temp.{name}_vocab "
+                     f"USING fts5vocab({schema}, {name}, instance)")
+        instances[name] = set(conn.execute(f"SELECT term, doc, col, offset FROM temp.{name}_vocab"))
+    stale = instances[fts] - instances[f"{fts}_ref"]
+    missing = instances[f"{fts}_ref"] - instances[fts]
+    assert not stale and not missing, f"{fts} out of sync: stale {sorted(stale)}, missing {sorted(missing)}"
+
+
+def assert_all_in_sync(conn):
+    assert_summaries_in_sync(conn)
+    assert_search_in_sync(conn, "cyber_incidents", "cyber_incidents_fts", ["description"])
+    assert_search_in_sync(conn, "it_tickets", "it_tickets_fts", ["subject", "description"])
+
+
+# -------------------------------
+# TESTS
+# -------------------------------
+def test_single_and_batch_writes():
+    conn, _ = _fresh_db()
+    insert_incidents(conn, INCIDENTS)
+    insert_tickets(conn, TICKETS)
+    version = get_table_version(conn, "cyber_incidents")
+
+    new_id = insert_incident(conn, "2024-03-01", "Malware", "High", "Open", "Trojan on a server")
+    update_incident_status(conn, 1, "Closed")
+    update_incidents_status(conn, [2, 3], "Closed")
+    delete_incident(conn, 4)
+    delete_incidents(conn, [new_id])
+    update_tickets_status(conn, [1, 3], "Resolved")
+    delete_tickets(conn, [2])
+    assert_all_in_sync(conn)
+
+    delta = changed_since(conn, "cyber_incidents", version)
+    assert sorted(delta["rows"]["id"]) == [1, 2, 3]
+    assert delta["deleted"] == [4, new_id]
+    conn.close()
+
+
+def test_failed_batch_rolls_back():
+    conn, _ = _fresh_db()
+    try:
+        insert_tickets(conn, [TICKETS[0], TICKETS[0]])  # duplicate ticket_id
+    except Exception:
+        pass
+    assert not conn.in_transaction
+    insert_tickets(conn, [TICKETS[1]])
+    assert [r[0] for r in conn.execute("SELECT ticket_id FROM it_tickets")] == ["T2"]
+    assert_all_in_sync(conn)
+    conn.close()
+
+
+def test_csv_replace():
+    conn, workdir = _fresh_db()
+    path = os.path.join(workdir, "tickets.csv")
+    stream_csv_to_table(conn, _write_csv(path, TICKET_HEADER, TICKETS), "it_tickets")
+    version = get_table_version(conn, "it_tickets")
+
+    changed = [("T1", "High", "Closed", "Hardware", "Monitor flicker", "Screen flickers", "2024-01-01",
+                "2024-01-03")]
+    stats = stream_csv_to_table(conn, _write_csv(path, TICKET_HEADER, changed), "it_tickets",
+                                on_conflict="replace")
+    assert stats["inserted"] == 1 and stats["rejected"] == 0
+    assert conn.execute("SELECT COUNT(*) FROM it_tickets").fetchone()[0] == 3
+    assert_all_in_sync(conn)
+
+    delta = changed_since(conn, "it_tickets", version)
+    assert list(delta["rows"]["ticket_id"]) == ["T1"] and delta["deleted"] == []
+    conn.close()
+
+
+def test_csv_ignore_records_skipped_rows():
+    conn, workdir = _fresh_db()
+    path = _write_csv(os.path.join(workdir, "tickets.csv"), TICKET_HEADER, TICKETS + [TICKETS[0]])
+    stats = stream_csv_to_table(conn, path, "it_tickets")
+    assert (stats["inserted"], stats["rejected"]) == (3, 1)
+    with open(stats["reject_path"], encoding="utf-8") as f:
+        assert len(f.readlines()) == 2  # header + the duplicate T1
+    assert_all_in_sync(conn)
+    conn.close()
+
+
+def test_reconcile():
+    conn, workdir = _fresh_db()
+    insert_incidents(conn, INCIDENTS[:2])
+    insert_tickets(conn, TICKETS[:2])
+
+    incidents_csv = _write_csv(os.path.join(workdir, "incidents.csv"), INCIDENT_HEADER, INCIDENTS)
+    assert reconcile_csv_to_table(conn, incidents_csv, "cyber_incidents")["inserted"] == 2
+
+    # T1 changed, T2 unchanged, T3 new: one update and one insert
+    tickets = [("T1", "High", "Closed") + TICKETS[0][3:]] + TICKETS[1:]
+    tickets_csv = _write_csv(os.path.join(workdir, "tickets.csv"), TICKET_HEADER, tickets)
+    assert reconcile_csv_to_table(conn, tickets_csv, "it_tickets")["inserted"] == 2
+    assert reconcile_csv_to_table(conn, tickets_csv, "it_tickets")["inserted"] == 0
+    assert_all_in_sync(conn)
+    conn.close()
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failures}/{len(tests)} checks passed.")
+    raise SystemExit(1 if failures else 0)